@@ -7,7 +7,7 @@ from datetime import date, datetime, timedelta
 
 import markdown
 from flask import Flask, abort, flash, jsonify, redirect, render_template, request, url_for
-from markupsafe import Markup
+from markupsafe import Markup, escape
 from sqlmodel import select
 
 from meridiano import config_base as config  # Use base config for app settings
@@ -28,11 +28,21 @@ def process_artciles_content(articles_data):
             "processed_content_html": Markup(
                 markdown.markdown(article["processed_content"] or "", extensions=["fenced_code"])
             ),
+            "search_snippet_html": _snippet_html(article.get("search_snippet")),
         }
         for article in articles_data
     ]
 
 
+def _snippet_html(snippet):
+    """Escapes a search snippet and highlights its matched terms with <mark>."""
+    if not snippet:
+        return None
+    html = str(escape(snippet))
+    html = html.replace(database.SNIPPET_MATCH_START, "<mark>").replace(database.SNIPPET_MATCH_END, "</mark>")
+    return Markup(html)
+
+
 @app.route("/")
 def index():
     """Displays a list of briefings, filterable by feed profile."""
@@ -82,7 +92,9 @@ def list_articles():
     per_page = getattr(config, "ARTICLES_PER_PAGE", 25)
 
     # --- Sorting ---
-    sort_by = request.args.get("sort_by", "published_date")
+    # Searches are ranked by relevance unless another order is requested
+    default_sort = "relevance" if request.args.get("search", "").strip() else "published_date"
+    sort_by = request.args.get("sort_by", default_sort)
     direction = request.args.get("direction", "desc")
     if direction not in ["asc", "desc"]:
         direction = "desc"
@@ -140,25 +152,28 @@ def list_articles():
     # Search Term Filter
     current_search_term = request.args.get("search", "").strip()  # Get search term, trim whitespace
 
-    # Fetch total count with ALL filters
-    total_articles = database.get_total_article_count(
-        start_date=start_date,
-        end_date=end_date,
-        feed_profile=current_feed_profile if current_feed_profile else None,
-        search_term=current_search_term if current_search_term else None,
-    )
-
-    # Fetch articles with ALL filters and sorting
-    articles_data = database.get_all_articles(
-        page=page,
-        per_page=per_page,
-        sort_by=sort_by,
-        direction=direction,
-        start_date=start_date,
-        end_date=end_date,
-        feed_profile=current_feed_profile if current_feed_profile else None,
-        search_term=current_search_term if current_search_term else None,
-    )
+    filters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "feed_profile": current_feed_profile if current_feed_profile else None,
+        "search_term": current_search_term if current_search_term else None,
+    }
+    # The filtered total is only displayed, so a recently counted value is good enough
+    total_articles = database.get_total_article_count_cached(**filters)
+
+    next_cursor = prev_cursor = None
+    if sort_by == "relevance" or "page" in request.args:
+        # Offset pagination: relevance ranks can't be sought to, and ?page= links keep working
+        articles_data = database.get_all_articles(
+            page=page, per_page=per_page, sort_by=sort_by, direction=direction, **filters
+        )
+    else:
+        # Cursor pagination: each page seeks past the previous one, so deep pages stay fast
+        result = database.get_articles_page(
+            per_page=per_page, sort_by=sort_by, direction=direction, cursor=request.args.get("cursor"), **filters
+        )
+        articles_data = result["articles"]
+        page, next_cursor, prev_cursor = result["page"], result["next_cursor"], result["prev_cursor"]
 
     articles_data = process_artciles_content(articles_data)
 
@@ -167,7 +182,7 @@ def list_articles():
         total_pages = math.ceil(total_articles / per_page)
     else:
         total_pages = 0
-    if page > total_pages and total_pages > 0:
+    if page > total_pages and total_pages > 0 and "cursor" not in request.args:
         # Optional: redirect to last valid page if request goes beyond
         args = request.args.copy()
         args["page"] = total_pages
@@ -183,7 +198,9 @@ def list_articles():
         page=page,
         total_pages=total_pages,
         per_page=per_page,
-        total_articles=total_articles,  # Filtered total
+        total_articles=total_articles,  # Filtered total (may lag by ARTICLE_COUNT_CACHE_SECONDS)
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
         current_sort_by=sort_by,
         current_direction=direction,
         current_start_date=start_date_str,
@@ -211,9 +228,11 @@ def view_article(article_id):
 
     # Basic check if embedding data exists (without showing the vector)
     embedding_status = "Not Generated"
-    if article_data["embedding"]:
+    if article_data["embedding_vector"]:
+        embedding_status = "Present"
+    elif article_data["embedding"]:
         try:
-            # Try loading to see if it's valid JSON and not empty
+            # Legacy JSON embedding: check it's valid JSON and not empty
             embed_data = json.loads(article_data["embedding"])
             if embed_data:
                 # You could potentially calculate dimension here if needed: len(embed_data)
@@ -289,7 +308,7 @@ def add_manual_article():
             article_id = database.add_article(
                 url=article_url,
                 title=final_title,
-                published_date=datetime.now(),  # Or try to get from OG tags if scrape_single enhanced
+                published_date=scraped_details["published_date"] or datetime.now(),
                 feed_source="Manual Addition",
                 raw_content=final_raw_content,
                 feed_profile=feed_profile_to_assign,
@@ -0,0 +1,204 @@
+"""
+Clustering backends used to group article embeddings into stories.
+
+Each backend takes the embedding matrix and a target number of clusters and returns one
+integer label per row; -1 marks noise (articles that belong to no story). Backends are
+selected by name with `CLUSTERING_ALGORITHM` (per feed profile) and receive
+`CLUSTERING_OPTIONS` as keyword arguments. New backends can be added with
+`@register_clustering_backend("name")`.
+
+Run `python -m meridiano.clustering` to compare the backends' wall time and cluster quality.
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from sklearn.cluster import HDBSCAN, AgglomerativeClustering, KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import normalize
+
+NOISE_LABEL = -1
+
+CLUSTERING_BACKENDS: Dict[str, Callable[..., np.ndarray]] = {}
+
+
+def register_clustering_backend(name: str):
+    """Registers a function `(matrix, n_clusters, **options) -> labels` under `name`."""
+
+    def decorator(func):
+        CLUSTERING_BACKENDS[name] = func
+        return func
+
+    return decorator
+
+
+@register_clustering_backend("kmeans")
+def _kmeans(matrix, n_clusters, n_init="auto", random_state=42, **options):
+    """Lloyd k-means. n_init='auto' runs a single k-means++ initialization."""
+    return KMeans(n_clusters=n_clusters, n_init=n_init, random_state=random_state, **options).fit_predict(matrix)
+
+
+@register_clustering_backend("minibatch_kmeans")
+def _minibatch_kmeans(matrix, n_clusters, batch_size=1024, n_init="auto", random_state=42, **options):
+    """k-means on mini-batches; much faster on large matrices at a small cost in quality."""
+    return MiniBatchKMeans(
+        n_clusters=n_clusters, batch_size=batch_size, n_init=n_init, random_state=random_state, **options
+    ).fit_predict(matrix)
+
+
+@register_clustering_backend("spherical_kmeans")
+def _spherical_kmeans(matrix, n_clusters, n_init="auto", random_state=42, **options):
+    """k-means on L2-normalized vectors, i.e. clustering by cosine similarity."""
+    return _kmeans(normalize(matrix), n_clusters, n_init=n_init, random_state=random_state, **options)
+
+
+@register_clustering_backend("hdbscan")
+def _hdbscan(matrix, n_clusters, min_cluster_size=3, copy=False, **options):
+    """Density-based clustering: finds the number of stories itself and labels outliers as noise."""
+    # normalize() returns a new array, so HDBSCAN may work on it in place
+    return HDBSCAN(min_cluster_size=min_cluster_size, copy=copy, **options).fit_predict(normalize(matrix))
+
+
+@register_clustering_backend("agglomerative")
+def _agglomerative(matrix, n_clusters, distance_threshold=None, linkage="average", **options):
+    """
+    Average-linkage clustering on cosine distance. With `distance_threshold` set, the number of
+    clusters is chosen by cutting the tree at that distance instead of using `n_clusters`.
+    """
+    if distance_threshold is not None:
+        n_clusters = None
+    return AgglomerativeClustering(
+        n_clusters=n_clusters, distance_threshold=distance_threshold, metric="cosine", linkage=linkage, **options
+    ).fit_predict(matrix)
+
+
+def cluster_embeddings(matrix: np.ndarray, n_clusters: int, algorithm: str = "kmeans", **options) -> np.ndarray:
+    """
+    Clusters the rows of `matrix` with the named backend.
+
+    Returns:
+        np.ndarray: One label per row; NOISE_LABEL (-1) for rows left unclustered.
+    """
+    try:
+        backend = CLUSTERING_BACKENDS[algorithm]
+    except KeyError:
+        raise ValueError(
+            f"Unknown clustering algorithm '{algorithm}'. Available: {', '.join(sorted(CLUSTERING_BACKENDS))}"
+        ) from None
+    return np.asarray(backend(matrix, n_clusters, **options))
+
+
+def assign_story_clusters(matrix: np.ndarray, centroids: List[np.ndarray], sizes: List[int], threshold: float):
+    """
+    Assigns each row of `matrix` to the most similar story centroid, or opens a new story
+    when no centroid reaches cosine similarity `threshold`. Centroids are running means of
+    their articles' normalized embeddings and are updated as rows are assigned, so work is
+    proportional to the new articles times the active stories.
+
+    Returns:
+        tuple: (labels, centroids, sizes) where labels index into the returned centroid list;
+        indexes past the input lists are new stories.
+    """
+    centroids = [np.asarray(c, dtype=np.float64) for c in centroids]
+    sizes = list(sizes)
+    unit_centroids = normalize(np.array(centroids)) if centroids else np.empty((0, matrix.shape[1]))
+    labels = np.empty(len(matrix), dtype=int)
+
+    for row, vector in enumerate(normalize(matrix)):
+        best = None
+        if len(centroids):
+            similarities = unit_centroids @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < threshold:
+                best = None
+
+        if best is None:
+            centroids.append(vector.astype(np.float64))
+            sizes.append(1)
+            unit_centroids = np.vstack([unit_centroids, vector])
+            labels[row] = len(centroids) - 1
+            continue
+
+        centroids[best] = (centroids[best] * sizes[best] + vector) / (sizes[best] + 1)
+        sizes[best] += 1
+        unit_centroids[best] = centroids[best] / (np.linalg.norm(centroids[best]) or 1.0)
+        labels[row] = best
+
+    return labels, centroids, sizes
+
+
+def benchmark_clustering(
+    matrix: np.ndarray,
+    n_clusters: int,
+    algorithms: Optional[Iterable[str]] = None,
+    options: Optional[Dict[str, dict]] = None,
+) -> List[dict]:
+    """
+    Runs each backend on `matrix` and reports wall time and cluster quality.
+
+    Quality is the cosine silhouette score over clustered (non-noise) rows, in [-1, 1]; higher
+    means tighter, better separated stories. It is None when fewer than two clusters were found.
+    """
+    results = []
+    for algorithm in algorithms or sorted(CLUSTERING_BACKENDS):
+        started = time.perf_counter()
+        labels = cluster_embeddings(matrix, n_clusters, algorithm, **(options or {}).get(algorithm, {}))
+        seconds = time.perf_counter() - started
+
+        clustered = labels != NOISE_LABEL
+        found = len(set(labels[clustered].tolist()))
+        silhouette = None
+        if 2 <= found < clustered.sum():
+            silhouette = float(silhouette_score(matrix[clustered], labels[clustered], metric="cosine"))
+        results.append(
+            {
+                "algorithm": algorithm,
+                "seconds": seconds,
+                "clusters": found,
+                "noise": int((~clustered).sum()),
+                "silhouette": silhouette,
+            }
+        )
+    return results
+
+
+def _synthetic_embeddings(n_samples, dimensions, n_stories, seed=42):
+    """Noisy copies of random story directions, similar in shape to summary embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_stories, dimensions))
+    assignments = rng.integers(0, n_stories, size=n_samples)
+    return (centers[assignments] + rng.normal(scale=0.6, size=(n_samples, dimensions))).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the clustering backends on article embeddings.")
+    parser.add_argument("--feed", type=str, help="Benchmark on this feed profile's recent embeddings.")
+    parser.add_argument("--hours", type=int, default=24 * 7, help="Lookback window for --feed (default: 168).")
+    parser.add_argument("--samples", type=int, default=5000, help="Synthetic sample count (default: 5000).")
+    parser.add_argument("--dimensions", type=int, default=1024, help="Synthetic vector size (default: 1024).")
+    parser.add_argument("--clusters", type=int, default=10, help="Target clusters (default: 10).")
+    args = parser.parse_args()
+
+    if args.feed:
+        from meridiano import database
+
+        _, _, matrix = database.get_embedding_matrix_for_briefing(args.hours, args.feed)
+        source = f"profile '{args.feed}', last {args.hours}h"
+    else:
+        matrix = _synthetic_embeddings(args.samples, args.dimensions, args.clusters * 3)
+        source = "synthetic"
+    if len(matrix) < 2 * args.clusters:
+        print(f"Not enough embeddings to benchmark ({len(matrix)}).")
+        return
+
+    print(f"Clustering {matrix.shape[0]} x {matrix.shape[1]} embeddings ({source}) into {args.clusters} clusters\n")
+    print(f"{'algorithm':<18} {'seconds':>8} {'clusters':>9} {'noise':>6} {'silhouette':>11}")
+    for row in benchmark_clustering(matrix, args.clusters):
+        silhouette = f"{row['silhouette']:.3f}" if row["silhouette"] is not None else "-"
+        print(f"{row['algorithm']:<18} {row['seconds']:>8.2f} {row['clusters']:>9} {row['noise']:>6} {silhouette:>11}")
+
+
+if __name__ == "__main__":
+    main()
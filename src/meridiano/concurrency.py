@@ -0,0 +1,172 @@
+"""
+Concurrency helpers shared by the pipeline stages.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+class HostThrottle:
+    """
+    Per-host politeness limiter for outgoing HTTP requests.
+
+    Caps the number of in-flight requests to each host and spaces request starts
+    to the same host by at least `min_interval` seconds. Requests to different
+    hosts never wait on each other.
+    """
+
+    def __init__(self, max_per_host: int = 2, min_interval: float = 0.5):
+        self.max_per_host = max(1, max_per_host)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = defaultdict(float)
+
+    def _semaphore_for(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+    def _reserve_start(self, host: str) -> float:
+        """Reserves the next start time for `host` and returns how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start[host])
+            self._next_start[host] = start + self.min_interval
+            return start - now
+
+    @contextmanager
+    def slot(self, url: str):
+        """Blocks until a request to the host of `url` is allowed, holding the slot for the block's duration."""
+        host = (urlsplit(url).hostname or "").lower()
+        with self._semaphore_for(host):
+            wait = self._reserve_start(host)
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+
+_host_throttle = None
+_host_throttle_lock = threading.Lock()
+
+
+def get_host_throttle(max_per_host: int = 2, min_interval: float = 0.5) -> HostThrottle:
+    """
+    Returns the process-wide HostThrottle, creating it on first use, so feed profiles
+    scraped concurrently share each host's limits instead of multiplying them.
+    """
+    global _host_throttle
+    with _host_throttle_lock:
+        if _host_throttle is None:
+            _host_throttle = HostThrottle(max_per_host, min_interval)
+        return _host_throttle
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for an LLM provider/model, with adaptive backoff.
+
+    Two buckets refill continuously: one for requests per minute (`rpm`) and one for
+    tokens per minute (`tpm`); either can be None for "unlimited". `acquire` blocks until
+    both buckets can cover a request. When the provider answers with HTTP 429,
+    `on_rate_limited` halves the effective rates (down to `min_scale` of the configured
+    ones) and pauses all callers; every success then recovers the rates additively, so
+    throughput settles at what the provider actually allows.
+    """
+
+    def __init__(self, rpm=None, tpm=None, min_scale=0.1, recovery_step=0.05):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.min_scale = min_scale
+        self.recovery_step = recovery_step
+        self.scale = 1.0
+        self._lock = threading.Lock()
+        self._requests = float(rpm) if rpm else 0.0
+        self._tokens = float(tpm) if tpm else 0.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._consecutive_limits = 0
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm * self.scale / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm * self.scale / 60)
+
+    def _wait_time(self, now, tokens):
+        """Seconds until the request can proceed; 0 means both buckets were debited."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        wait = 0.0
+        if self.rpm and self._requests < 1:
+            wait = max(wait, (1 - self._requests) * 60 / (self.rpm * self.scale))
+        if self.tpm and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60 / (self.tpm * self.scale))
+        if wait == 0.0:
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens
+        return wait
+
+    def acquire(self, tokens=0):
+        """Blocks until a request estimated at `tokens` tokens is allowed."""
+        if self.tpm:
+            tokens = min(tokens, self.tpm)  # A single oversized request must still be able to run
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._wait_time(now, tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def settle(self, estimated_tokens, actual_tokens):
+        """Corrects the token bucket once the real usage of a request is known."""
+        if not self.tpm or actual_tokens is None:
+            return
+        with self._lock:
+            self._tokens = min(self.tpm, self._tokens + estimated_tokens - actual_tokens)
+
+    def on_success(self):
+        """Records a successful request, recovering the rates after earlier 429s."""
+        with self._lock:
+            self._consecutive_limits = 0
+            self.scale = min(1.0, self.scale + self.recovery_step)
+
+    def on_rate_limited(self, retry_after=None):
+        """
+        Records a 429 response: halves the effective rates and pauses all callers.
+
+        Returns:
+            float: Seconds callers are paused for (the provider's Retry-After when given,
+            otherwise an exponential backoff).
+        """
+        with self._lock:
+            self._consecutive_limits += 1
+            self.scale = max(self.min_scale, self.scale / 2)
+            pause = retry_after if retry_after else min(60.0, 2.0**self._consecutive_limits)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            # Drain the buckets so callers restart at the reduced rate
+            self._requests = min(self._requests, 0.0)
+            self._tokens = min(self._tokens, 0.0)
+            return pause
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name, rpm=None, tpm=None):
+    """Returns the process-wide RateLimiter registered under `name`, creating it on first use."""
+    with _rate_limiters_lock:
+        if name not in _rate_limiters:
+            _rate_limiters[name] = RateLimiter(rpm=rpm, tpm=tpm)
+        return _rate_limiters[name]
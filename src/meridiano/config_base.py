@@ -34,6 +34,28 @@ Summary:
 Output ONLY the integer number representing your rating (1-10).
 """
 
+# Used in process_articles when COMBINED_PROCESSING is on (can be overridden per profile).
+# Replaces PROMPT_ARTICLE_SUMMARY and PROMPT_IMPACT_RATING with one JSON answer per article.
+PROMPT_ARTICLE_COMBINED = """
+Analyze the following news article.
+
+1. Summarize its key points objectively in 2-4 sentences.
+2. List the main topics covered (1-5 short tags).
+3. Estimate its overall impact on a scale of 1 to 10. Consider factors like geographic scope
+(local vs global), number of people affected, severity, and potential long-term consequences:
+1-2: Minor, niche, or local interest.
+3-4: Notable event for a specific region or community.
+5-6: Significant event with broader regional or moderate international implications.
+7-8: Major event with significant international importance or wide-reaching effects.
+9-10: Critical global event with severe, widespread, or potentially historic implications.
+
+Answer with ONLY a JSON object of this form:
+{{"summary": "...", "topics": ["...", "..."], "impact_score": 5}}
+
+Article:
+{article_content}
+"""
+
 # Used in generate_brief (can be overridden per profile)
 PROMPT_CLUSTER_ANALYSIS = """
 These are summaries of potentially related news articles from a '{feed_profile}' context:
@@ -58,27 +80,138 @@ Analyzed News Clusters (Most significant first):
 {cluster_analyses_text}
 """
 
+# --- Scraping Settings ---
+# Total number of worker threads used to fetch feeds and article pages concurrently
+SCRAPE_MAX_WORKERS = int(os.getenv("SCRAPE_MAX_WORKERS", "16"))
+# Politeness limits applied per host: in-flight requests and minimum seconds between request starts
+SCRAPE_PER_HOST_CONCURRENCY = 2
+SCRAPE_PER_HOST_DELAY = 0.5
+
+# --- HTTP Client Settings ---
+# Number of per-host connection pools kept alive, and connections kept per host
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 8
+# Retries for connection errors and 429/5xx responses
+HTTP_MAX_RETRIES = 2
+# Timeout (seconds) for article page requests
+HTTP_TIMEOUT = 20
+
+# --- HTML Cache Settings ---
+# Directory for the on-disk cache of fetched article HTML. Unset disables the cache.
+HTML_CACHE_DIR = os.getenv("HTML_CACHE_DIR")
+# Evict least recently fetched pages once the compressed bodies exceed this size
+HTML_CACHE_MAX_BYTES = int(os.getenv("HTML_CACHE_MAX_BYTES", str(2 * 1024**3)))
+# Pages older than this are treated as missing and evicted
+HTML_CACHE_MAX_AGE_DAYS = 90
+
+# --- Full-Text Search (PostgreSQL) ---
+# Text search configuration (language) used to stem and index each profile's articles in the
+# generated articles.search_vector column; profiles not listed use TEXT_SEARCH_CONFIG_DEFAULT.
+# After changing either, run `python -m meridiano.migrate setup_fts` to regenerate the column.
+TEXT_SEARCH_CONFIG_DEFAULT = "english"
+TEXT_SEARCH_CONFIGS = {"brasil": "portuguese"}
+
+# --- Streaming Pipeline (`run_briefing --pipeline`) ---
+# Capacity of the queues between the scrape, summarize, embed and rate stages; a full queue
+# makes the stage before it wait (backpressure)
+PIPELINE_QUEUE_SIZE = 64
+# Longest time (seconds) a partial batch of summaries waits for more before being embedded
+PIPELINE_EMBED_BATCH_WAIT = 2.0
+# Summaries and ratings are written in batches of this many articles, one transaction each.
+# A crash loses at most one unwritten batch, which the LLM cache makes cheap to redo.
+DB_WRITE_BATCH_SIZE = 100
+
+# --- Near-Duplicate Detection ---
+# Before summarization, articles whose text nearly matches an earlier article of the same profile
+# (e.g. syndicated wire stories) are linked to it via Article.duplicate_of and skip the LLM stages.
+DEDUP_ENABLED = False
+# Minimum estimated Jaccard similarity of word 5-grams for two articles to count as duplicates
+DEDUP_THRESHOLD = 0.8
+# MinHash signature length and LSH bands (DEDUP_NUM_PERM must be a multiple of DEDUP_BANDS)
+DEDUP_NUM_PERM = 128
+DEDUP_BANDS = 16
+# Only articles fetched within this many days are considered as originals
+DEDUP_WINDOW_DAYS = 7
+
 # --- Processing Settings ---
 # How many hours back to look for articles when generating a brief
 BRIEFING_ARTICLE_LOOKBACK_HOURS = 24
+# Summarize and rate each article with one JSON completion (PROMPT_ARTICLE_COMBINED) instead of
+# two separate requests. Answers that fail validation fall back to PROMPT_ARTICLE_SUMMARY, and
+# those articles are rated by the rate stage as usual.
+COMBINED_PROCESSING = os.getenv("COMBINED_PROCESSING", "false").lower() in ("1", "true", "yes")
 
 # --- Model Settings ---
 # Model for summarization and analysis (check Deepseek docs for latest models)
 LLM_CHAT_MODEL = os.getenv("LLM_CHAT_MODEL", "deepseek/deepseek-chat")
 # Model for embeddings
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "together_ai/intfloat/multilingual-e5-large-instruct")
+# Texts sent per embedding request, and cap on their estimated total tokens
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_BATCH_MAX_TOKENS = 16000
+
+# --- LLM Concurrency & Rate Limits ---
+# Max concurrent LLM requests issued by a processing stage
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Requests and tokens per minute allowed per model (None = unlimited). Models not listed use
+# LLM_DEFAULT_RATE_LIMIT. Example: {"deepseek/deepseek-chat": {"rpm": 500, "tpm": 1_000_000}}
+LLM_RATE_LIMITS = {}
+LLM_DEFAULT_RATE_LIMIT = {
+    "rpm": int(os.getenv("LLM_DEFAULT_RPM", "120")),
+    "tpm": int(os.getenv("LLM_DEFAULT_TPM")) if os.getenv("LLM_DEFAULT_TPM") else None,
+}
+# Retries after a rate-limit (HTTP 429) response before giving up on a request
+LLM_MAX_RETRIES = 5
+# Cap on in-flight LLM requests across the whole process, i.e. across all feed profiles when
+# several run at once (--feeds/--all-feeds)
+LLM_GLOBAL_MAX_CONCURRENCY = int(os.getenv("LLM_GLOBAL_MAX_CONCURRENCY", str(2 * LLM_MAX_CONCURRENCY)))
+# Cluster analyses run concurrently during brief generation, up to this many at once
+BRIEF_ANALYSIS_CONCURRENCY = int(os.getenv("BRIEF_ANALYSIS_CONCURRENCY", str(LLM_MAX_CONCURRENCY)))
+
+# --- LLM Response Cache ---
+# Completions are cached in a local SQLite file keyed by model, prompt and sampling parameters.
+# Disable with LLM_CACHE_ENABLED=false, or bypass for one run with `run_briefing --no-cache`.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.db")
+LLM_CACHE_MAX_ENTRIES = 50000
+LLM_CACHE_TTL_DAYS = 30
+# Embeddings are cached in the same file, keyed by model and normalized text (least recently used evicted)
+EMBEDDING_CACHE_MAX_ENTRIES = 200000
 
 # Approximate number of clusters to aim for. Fine-tune based on results.
-# Alternatively, use algorithms like DBSCAN that don't require specifying k.
+# Alternatively, use algorithms like HDBSCAN that don't require specifying k.
 N_CLUSTERS = 10  # Example, adjust as needed
 
+# Clustering backend for briefs (can be overridden per profile): "kmeans", "minibatch_kmeans",
+# "spherical_kmeans", "hdbscan" or "agglomerative". Compare them with `python -m meridiano.clustering`.
+CLUSTERING_ALGORITHM = "kmeans"
+# Keyword arguments for the backend, e.g. {"min_cluster_size": 5} for hdbscan
+# or {"distance_threshold": 0.6} for agglomerative
+CLUSTERING_OPTIONS = {}
+
+# Incremental clustering (can be overridden per profile): instead of re-clustering the whole
+# lookback window, each brief run assigns only new articles to persistent story clusters
+# (Article.cluster_id) and briefs the N_CLUSTERS largest stories in the window.
+INCREMENTAL_CLUSTERING = False
+# Minimum cosine similarity between an article and a story centroid to join that story
+STORY_CLUSTER_SIMILARITY_THRESHOLD = 0.8
+# Stories that received no new article for this many hours are no longer extended
+STORY_CLUSTER_MAX_AGE_HOURS = 72
+
 # Minimum number of articles required to attempt clustering/briefing
 MIN_ARTICLES_FOR_BRIEFING = 5
 
 ARTICLES_PER_PAGE = 15
+# The articles listing reuses its filtered total for this many seconds instead of counting
+# the matching rows on every page view (0 = count every time)
+ARTICLE_COUNT_CACHE_SECONDS = 300
 
 MANUALLY_ADDED_PROFILE_NAME = "manual"
 DEFAULT_FEED_PROFILE = "default"
+# Profiles run at once by `run_briefing --feeds a,b,c` / `--all-feeds`
+PROFILE_MAX_CONCURRENCY = int(os.getenv("PROFILE_MAX_CONCURRENCY", "4"))
+# Profiles in meridiano/feeds/ skipped by --all-feeds
+ALL_FEEDS_EXCLUDE = ("test",)
 
 # --- Other ---
 DATABASE_FILE = "meridian.db"  # Keep for backward compatibility
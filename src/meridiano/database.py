@@ -3,22 +3,33 @@ Database operations using SQLModel for the Meridiano application.
 This replaces the SQLite-based database.py with modern SQLModel operations.
 """
 
+import base64
 import json
 import logging
+import operator
+import re
+import threading
+import time
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import reduce
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import text
+import numpy as np
+from sqlalchemy import bindparam, column, literal_column, table, text, tuple_, update
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import and_, asc, desc, func, or_, select
 
 from . import config_base as config
-from .models import Article, Brief, Collection, CollectionArticle, get_session
+from .models import Article, Brief, Collection, CollectionArticle, FeedState, StoryCluster, get_session
 from .models import init_db as model_init_db
+from .vectors import EMBEDDING_DTYPE, load_embedding, pack_embedding, unpack_embedding
 
 logger = logging.getLogger(__name__)
 
 ARTICLES_PER_PAGE_DEFAULT = 25
+# Max bound parameters per IN (...) query; stays well under SQLite's variable limit
+IN_QUERY_CHUNK_SIZE = 500
 
 
 def get_db_connection():
@@ -56,12 +67,28 @@ def get_unrated_articles(feed_profile: str, limit: int = 50) -> List[Dict[str, A
 
 def update_article_rating(article_id: int, impact_score: int) -> None:
     """Updates an article with its impact score."""
-    with get_session() as session:
-        statement = select(Article).where(Article.id == article_id)
-        article = session.exec(statement).first()
-        if article:
-            article.impact_score = impact_score
-            session.add(article)
+    update_article_ratings([(article_id, impact_score)])
+
+
+def update_article_ratings(ratings: List[Tuple[int, int]], chunk_size: int = IN_QUERY_CHUNK_SIZE) -> None:
+    """
+    Stores impact scores for many articles, given as (article_id, impact_score) pairs.
+    Each chunk is one executemany UPDATE in its own transaction.
+    """
+    rows = [{"article_id": article_id, "impact_score": impact_score} for article_id, impact_score in ratings]
+    _bulk_update_articles(rows, chunk_size)
+
+
+def _bulk_update_articles(rows: List[Dict[str, Any]], chunk_size: int) -> None:
+    """
+    Applies executemany UPDATEs to articles. Each row holds 'article_id' plus the columns to
+    set, which become the SET clause; ids that no longer exist are skipped.
+    """
+    articles = Article.__table__
+    statement = update(articles).where(articles.c.id == bindparam("article_id"))
+    for start in range(0, len(rows), chunk_size):
+        with get_session() as session:
+            session.execute(statement, rows[start : start + chunk_size])
             session.commit()
 
 
@@ -89,6 +116,7 @@ def _article_to_dict(article: Article) -> Dict[str, Any]:
             "raw_content",
             "processed_content",
             "embedding",
+            "embedding_vector",
             "processed_at",
             "cluster_id",
             "impact_score",
@@ -132,6 +160,106 @@ def _build_article_filters(
     return filters
 
 
+# SQLite FTS5 index created by models._create_sqlite_fts; rowid is articles.id. MATCH,
+# bm25() and snippet() take the table name itself as their first argument.
+_articles_fts = table("articles_fts", column("rowid"))
+_FTS_TABLE = literal_column("articles_fts")
+# PostgreSQL's generated tsvector column (not mapped on Article, as it cannot be written)
+_search_vector = literal_column("articles.search_vector", type_=TSVECTOR)
+# bm25() column weights for (title, raw_content)
+SQLITE_FTS_WEIGHTS = (10.0, 1.0)
+# Markers around matched terms in search snippets; the web app escapes the text, then turns
+# them into <mark> tags
+SNIPPET_MATCH_START = "\x02"
+SNIPPET_MATCH_END = "\x03"
+SNIPPET_TOKENS = 24
+
+
+def _fts5_query(search_term: str) -> Optional[str]:
+    """
+    Turns free text into an FTS5 query matching all of its words, like plainto_tsquery.
+    Each word is quoted, so FTS5 operators and punctuation in user input are not interpreted.
+    """
+    words = re.findall(r"\w+", search_term)
+    return " ".join(f'"{word}"' for word in words) if words else None
+
+
+def _sqlite_fts_available(session) -> bool:
+    return (
+        session.exec(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'")).first()
+        is not None
+    )
+
+
+def _postgres_tsquery(search_term: str, feed_profile: Optional[str] = None):
+    """
+    plainto_tsquery of `search_term` in the profile's text search configuration, or, across
+    all profiles, the OR of its queries in every configured language. The query is a
+    constant, so `search_vector @@ query` is answered from the GIN index.
+    """
+    if feed_profile:
+        configs = [config.TEXT_SEARCH_CONFIGS.get(feed_profile, config.TEXT_SEARCH_CONFIG_DEFAULT)]
+    else:
+        configs = sorted({config.TEXT_SEARCH_CONFIG_DEFAULT, *config.TEXT_SEARCH_CONFIGS.values()})
+    queries = [func.plainto_tsquery(search_config, search_term) for search_config in configs]
+    return reduce(lambda combined, query: combined.op("||")(query), queries)
+
+
+def _apply_search(session, statement, search_term: str, feed_profile: Optional[str] = None):
+    """
+    Restricts an articles query to those matching `search_term`.
+
+    PostgreSQL matches the stored `search_vector` column (see models.create_postgres_search_vector);
+    SQLite joins the FTS5 index and falls back to LIKE when the index is missing or the term
+    has no words.
+
+    Returns:
+        tuple: (statement, ranking, snippet) where ranking orders best matches first and
+        snippet is a highlighted excerpt column; both are None without full-text search.
+    """
+    if "postgresql" in config.DATABASE_URL.lower():
+        tsquery = _postgres_tsquery(search_term, feed_profile)
+        statement = statement.where(_search_vector.op("@@")(tsquery))
+        # ts_rank_cd reads the stored vector's positions and A/B weights; higher is better
+        return statement, desc(func.ts_rank_cd(_search_vector, tsquery)), None
+
+    fts_query = _fts5_query(search_term)
+    if fts_query and _sqlite_fts_available(session):
+        statement = statement.join(_articles_fts, _articles_fts.c.rowid == Article.id)
+        statement = statement.where(_FTS_TABLE.op("MATCH")(fts_query))
+        # bm25() is lower for better matches; title hits weigh more than body hits
+        ranking = asc(func.bm25(_FTS_TABLE, *SQLITE_FTS_WEIGHTS))
+        snippet = func.snippet(_FTS_TABLE, 1, SNIPPET_MATCH_START, SNIPPET_MATCH_END, "…", SNIPPET_TOKENS)
+        return statement, ranking, snippet
+
+    # Fallback to LIKE search
+    search_filter = or_(
+        Article.title.ilike(f"%{search_term}%"),
+        Article.raw_content.ilike(f"%{search_term}%"),
+    )
+    return statement.where(search_filter), None, None
+
+
+# Columns the articles listing can be sorted by (relevance is handled by the search backend)
+ARTICLE_SORT_COLUMNS = {
+    "published_date": Article.published_date,
+    "impact_score": Article.impact_score,
+    "fetched_at": Article.fetched_at,
+}
+
+
+def _listing_order(sort_column, descending: bool, reverse: bool = False):
+    """
+    ORDER BY clauses of the articles listing: NULLs last in both directions and ties broken
+    by id in the sort direction, which keyset pagination relies on. With `reverse`, the exact
+    opposite order.
+    """
+    descending = descending != reverse
+    column_order = sort_column.desc() if descending else sort_column.asc()
+    column_order = column_order.nulls_first() if reverse else column_order.nulls_last()
+    return column_order, Article.id.desc() if descending else Article.id.asc()
+
+
 def get_all_articles(
     page: int = 1,
     per_page: int = ARTICLES_PER_PAGE_DEFAULT,
@@ -144,7 +272,10 @@ def get_all_articles(
 ) -> List[Dict[str, Any]]:
     """
     Fetches articles with filtering, sorting, and full-text search.
-    Uses PostgreSQL full-text search when available, falls back to LIKE search.
+    Uses PostgreSQL full-text search or the SQLite FTS5 index, falls back to LIKE search.
+    sort_by="relevance" ranks matches by ts_rank_cd (PostgreSQL) or bm25 (SQLite). With
+    FTS5 each article also gets a 'search_snippet' whose matched terms are wrapped in
+    SNIPPET_MATCH_START/SNIPPET_MATCH_END.
     """
     with get_session() as session:
         # Start with base query
@@ -156,43 +287,28 @@ def get_all_articles(
             statement = statement.where(and_(*filters))
 
         # Apply search if provided
+        ranking = snippet = None
         if search_term:
-            if "postgresql" in config.DATABASE_URL.lower():
-                # PostgreSQL full-text search
-                search_vector = func.to_tsvector(
-                    "english",
-                    func.coalesce(Article.title, "") + " " + func.coalesce(Article.raw_content, ""),
-                )
-                # Use SQLAlchemy's match with a plain string and specify the Postgres
-                # text search configuration to avoid nesting plainto_tsquery calls.
-                statement = statement.where(search_vector.match(search_term, postgresql_regconfig="english"))
-            else:
-                # Fallback to LIKE search for SQLite
-                search_filter = or_(
-                    Article.title.ilike(f"%{search_term}%"),
-                    Article.raw_content.ilike(f"%{search_term}%"),
-                )
-                statement = statement.where(search_filter)
+            statement, ranking, snippet = _apply_search(session, statement, search_term, feed_profile)
 
         # Apply sorting
-        sort_columns = {
-            "published_date": Article.published_date,
-            "impact_score": Article.impact_score,
-            "fetched_at": Article.fetched_at,
-        }
-
-        sort_column = sort_columns.get(sort_by, Article.published_date)
-        if direction.lower() == "asc":
-            statement = statement.order_by(asc(sort_column), desc(Article.id))
+        if sort_by == "relevance" and ranking is not None:
+            statement = statement.order_by(ranking, desc(Article.id))
         else:
-            statement = statement.order_by(desc(sort_column), desc(Article.id))
+            sort_column = ARTICLE_SORT_COLUMNS.get(sort_by, Article.published_date)
+            statement = statement.order_by(*_listing_order(sort_column, direction.lower() != "asc"))
 
         # Apply pagination
         offset = (page - 1) * per_page
         statement = statement.offset(offset).limit(per_page)
 
-        articles = session.exec(statement).all()
-        return [_article_to_dict(article) for article in articles]
+        if snippet is None:
+            articles = session.exec(statement).all()
+            return [_article_to_dict(article) for article in articles]
+
+        # Add a highlighted excerpt of the matching body text
+        rows = session.execute(statement.add_columns(snippet)).all()
+        return [{**_article_to_dict(article), "search_snippet": snippet} for article, snippet in rows]
 
 
 def get_total_article_count(
@@ -213,26 +329,159 @@ def get_total_article_count(
 
         # Apply search if provided
         if search_term:
-            if "postgresql" in config.DATABASE_URL.lower():
-                # PostgreSQL full-text search
-                search_vector = func.to_tsvector(
-                    "english",
-                    func.coalesce(Article.title, "") + " " + func.coalesce(Article.raw_content, ""),
-                )
-                # Use SQLAlchemy's match with a plain string and specify the Postgres
-                # text search configuration to avoid nesting plainto_tsquery calls.
-                statement = statement.where(search_vector.match(search_term, postgresql_regconfig="english"))
-            else:
-                # Fallback to LIKE search
-                search_filter = or_(
-                    Article.title.ilike(f"%{search_term}%"),
-                    Article.raw_content.ilike(f"%{search_term}%"),
-                )
-                statement = statement.where(search_filter)
+            statement, _, _ = _apply_search(session, statement, search_term, feed_profile)
 
         return session.exec(statement).one()
 
 
+def encode_article_cursor(sort_by: str, direction: str, value: Any, article_id: int, before: bool, page: int) -> str:
+    """
+    Returns an opaque pagination token pointing just after (or, with `before`, just before)
+    the article with sort key (value, article_id). `page` is the page number it leads to.
+    """
+    if isinstance(value, datetime):
+        value = {"datetime": value.isoformat()}
+    payload = {"s": sort_by, "d": direction, "v": value, "id": article_id, "b": before, "p": page}
+    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_article_cursor(token: str, sort_by: str, direction: str) -> Optional[Dict[str, Any]]:
+    """Decodes a token from encode_article_cursor; None if invalid or made for another sort order."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if payload["s"] != sort_by or payload["d"] != direction or not isinstance(payload["id"], int):
+            return None
+        value = payload["v"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["datetime"])
+        return {"value": value, "id": payload["id"], "before": bool(payload["b"]), "page": int(payload["p"])}
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def _keyset_condition(sort_column, value, article_id: int, descending: bool, before: bool):
+    """
+    Rows strictly after (or before) the cursor row in the listing order: `sort_column` in
+    `descending` order with NULLs last, ties broken by id in the same direction.
+    """
+    key = tuple_(sort_column, Article.id)
+    later = operator.lt if descending else operator.gt
+    earlier = operator.gt if descending else operator.lt
+    if before:
+        if value is None:
+            return or_(sort_column.is_not(None), and_(sort_column.is_(None), earlier(Article.id, article_id)))
+        return earlier(key, tuple_(value, article_id))
+    if value is None:
+        return and_(sort_column.is_(None), later(Article.id, article_id))
+    return or_(later(key, tuple_(value, article_id)), sort_column.is_(None))
+
+
+def get_articles_page(
+    per_page: int = ARTICLES_PER_PAGE_DEFAULT,
+    sort_by: str = "published_date",
+    direction: str = "desc",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    feed_profile: Optional[str] = None,
+    search_term: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Fetches one page of articles with keyset (cursor) pagination: instead of skipping
+    OFFSET rows, the query seeks to the row after the previous page's last (sort value, id),
+    so every page costs the same however deep it is. Filters and search match
+    get_all_articles; relevance ordering is not supported (use get_all_articles).
+
+    Returns:
+        dict: 'articles', 'page' (1-based, for display), and 'next_cursor'/'prev_cursor'
+        tokens for the neighbouring pages, or None at either end.
+    """
+    sort_by = sort_by if sort_by in ARTICLE_SORT_COLUMNS else "published_date"
+    direction = "asc" if direction.lower() == "asc" else "desc"
+    sort_column = ARTICLE_SORT_COLUMNS[sort_by]
+    position = decode_article_cursor(cursor, sort_by, direction) if cursor else None
+    before = bool(position and position["before"])
+    page = position["page"] if position else 1
+
+    with get_session() as session:
+        statement = select(Article)
+        filters = _build_article_filters(start_date, end_date, feed_profile)
+        if filters:
+            statement = statement.where(and_(*filters))
+
+        snippet = None
+        if search_term:
+            statement, _, snippet = _apply_search(session, statement, search_term, feed_profile)
+        if position:
+            descending = direction == "desc"
+            statement = statement.where(
+                _keyset_condition(sort_column, position["value"], position["id"], descending, before)
+            )
+
+        # Pages before the cursor are read in exactly the reverse order and flipped back afterwards
+        statement = statement.order_by(*_listing_order(sort_column, direction == "desc", reverse=before))
+        # One extra row tells whether another page follows in this direction
+        statement = statement.limit(per_page + 1)
+
+        if snippet is None:
+            rows = [(article, None) for article in session.exec(statement).all()]
+        else:
+            rows = session.execute(statement.add_columns(snippet)).all()
+
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if before:
+        rows.reverse()
+    has_next = more if not before else True
+    has_prev = more if before else position is not None
+
+    articles = []
+    for article, article_snippet in rows:
+        article_dict = _article_to_dict(article)
+        if snippet is not None:
+            article_dict["search_snippet"] = article_snippet
+        articles.append(article_dict)
+
+    next_cursor = prev_cursor = None
+    if rows and has_next:
+        last = rows[-1][0]
+        next_cursor = encode_article_cursor(sort_by, direction, getattr(last, sort_by), last.id, False, page + 1)
+    if rows and has_prev and page > 1:
+        first = rows[0][0]
+        prev_cursor = encode_article_cursor(sort_by, direction, getattr(first, sort_by), first.id, True, page - 1)
+    return {"articles": articles, "page": page, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
+
+
+_count_cache: Dict[Tuple, Tuple[float, int]] = {}
+_count_cache_lock = threading.Lock()
+
+
+def get_total_article_count_cached(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    feed_profile: Optional[str] = None,
+    search_term: Optional[str] = None,
+) -> int:
+    """
+    get_total_article_count, reused for ARTICLE_COUNT_CACHE_SECONDS per filter combination.
+    The total can lag behind new articles by that long, which is fine for display.
+    """
+    key = (start_date, end_date, feed_profile, search_term)
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+    if cached and now - cached[0] < config.ARTICLE_COUNT_CACHE_SECONDS:
+        return cached[1]
+
+    total = get_total_article_count(start_date, end_date, feed_profile, search_term)
+    with _count_cache_lock:
+        if len(_count_cache) >= 1024:  # Bound memory: searches make the key space unbounded
+            _count_cache.clear()
+        _count_cache[key] = (now, total)
+    return total
+
+
 def add_article(
     url: str,
     title: str,
@@ -281,6 +530,39 @@ def add_article(
             return None
 
 
+def get_existing_article_urls(urls: List[str], chunk_size: int = IN_QUERY_CHUNK_SIZE) -> set:
+    """
+    Returns the subset of `urls` that are already stored.
+
+    Resolves the URLs against the unique index on articles.url with a few chunked
+    IN queries that only return the URL column, instead of loading one row per URL.
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    existing = set()
+    with get_session() as session:
+        for start in range(0, len(urls), chunk_size):
+            chunk = urls[start : start + chunk_size]
+            existing.update(session.exec(select(Article.url).where(Article.url.in_(chunk))).all())
+    return existing
+
+
+def get_article_urls(feed_profile: str) -> List[Dict[str, Any]]:
+    """Returns the id and URL of every article in a feed profile."""
+    with get_session() as session:
+        statement = select(Article.id, Article.url).where(Article.feed_profile == feed_profile).order_by(Article.id)
+        return [{"id": article_id, "url": url} for article_id, url in session.exec(statement).all()]
+
+
+def update_article_raw_content(article_id: int, raw_content: str) -> None:
+    """Replaces the extracted main content of an article."""
+    with get_session() as session:
+        article = session.get(Article, article_id)
+        if article:
+            article.raw_content = raw_content
+            session.add(article)
+            session.commit()
+
+
 def get_unprocessed_articles(feed_profile: str, limit: int = 50) -> List[Dict[str, Any]]:
     """Gets articles that haven't been processed yet."""
     with get_session() as session:
@@ -291,6 +573,7 @@ def get_unprocessed_articles(feed_profile: str, limit: int = 50) -> List[Dict[st
                     Article.processed_at.is_(None),
                     Article.raw_content.is_not(None),
                     Article.raw_content != "",
+                    Article.duplicate_of.is_(None),  # Near-duplicates skip the LLM stages
                     Article.feed_profile == feed_profile,
                 )
             )
@@ -304,15 +587,29 @@ def get_unprocessed_articles(feed_profile: str, limit: int = 50) -> List[Dict[st
 
 def update_article_processing(article_id: int, processed_content: str, embedding: Optional[List[float]]) -> None:
     """Updates an article with its summary, embedding, and processed timestamp."""
-    with get_session() as session:
-        statement = select(Article).where(Article.id == article_id)
-        article = session.exec(statement).first()
-        if article:
-            article.processed_content = processed_content
-            article.embedding = json.dumps(embedding) if embedding else None
-            article.processed_at = datetime.now()
-            session.add(article)
-            session.commit()
+    update_articles_processing([(article_id, processed_content, embedding)])
+
+
+def update_articles_processing(
+    updates: List[Tuple[int, str, Optional[List[float]]]], chunk_size: int = IN_QUERY_CHUNK_SIZE
+) -> None:
+    """
+    Stores summaries and embeddings for many articles, given as (article_id, summary, embedding)
+    tuples, and marks them processed. Each chunk is one executemany UPDATE in its own
+    transaction, instead of a SELECT, UPDATE and commit per article.
+    """
+    processed_at = datetime.now()
+    rows = [
+        {
+            "article_id": article_id,
+            "processed_content": processed_content,
+            "embedding_vector": pack_embedding(embedding) if embedding else None,
+            "embedding": None,
+            "processed_at": processed_at,
+        }
+        for article_id, processed_content, embedding in updates
+    ]
+    _bulk_update_articles(rows, chunk_size)
 
 
 def get_articles_for_briefing(lookback_hours: int, feed_profile: str) -> List[Dict[str, Any]]:
@@ -325,7 +622,7 @@ def get_articles_for_briefing(lookback_hours: int, feed_profile: str) -> List[Di
             .where(
                 and_(
                     Article.processed_at >= cutoff_time,
-                    Article.embedding.is_not(None),
+                    or_(Article.embedding_vector.is_not(None), Article.embedding.is_not(None)),
                     Article.feed_profile == feed_profile,
                 )
             )
@@ -336,6 +633,273 @@ def get_articles_for_briefing(lookback_hours: int, feed_profile: str) -> List[Di
         return [_article_to_dict(article) for article in articles]
 
 
+def _briefing_filters(lookback_hours: int, feed_profile: str):
+    """Recently processed articles of a profile that have an embedding."""
+    cutoff_time = datetime.now() - timedelta(hours=lookback_hours)
+    return and_(
+        Article.processed_at >= cutoff_time,
+        or_(Article.embedding_vector.is_not(None), Article.embedding.is_not(None)),
+        Article.feed_profile == feed_profile,
+    )
+
+
+def get_summaries_for_briefing(lookback_hours: int, feed_profile: str) -> Tuple[List[int], List[str]]:
+    """
+    Loads only the ids and summaries of the articles get_embedding_matrix_for_briefing would
+    return, for briefs built from stored story clusters, where no vectors are needed.
+    """
+    statement = (
+        select(Article.id, Article.processed_content)
+        .where(_briefing_filters(lookback_hours, feed_profile))
+        .order_by(desc(Article.processed_at))
+    )
+    with get_session() as session:
+        rows = session.exec(statement).all()
+    return [row[0] for row in rows], [row[1] for row in rows]
+
+
+def get_embedding_matrix_for_briefing(
+    lookback_hours: int,
+    feed_profile: str,
+    stream_chunk_size: int = IN_QUERY_CHUNK_SIZE,
+    unclustered_only: bool = False,
+) -> Tuple[List[int], List[str], np.ndarray]:
+    """
+    Loads the ids, summaries and embeddings of recently processed articles for clustering
+    (only those not yet assigned to a story cluster with `unclustered_only`).
+
+    Only those three columns are selected, and rows are streamed from the cursor into one
+    preallocated float32 matrix, so memory scales with the vectors rather than the article bodies.
+    The count and the stream are separate statements, so the matrix grows if more rows arrive.
+    Articles whose embedding is invalid, or differs in dimension from the most recently
+    processed one (e.g. after an embedding model change), are skipped.
+
+    Returns:
+        tuple: (article_ids, summaries, matrix) where matrix row i belongs to article_ids[i].
+    """
+    filters = _briefing_filters(lookback_hours, feed_profile)
+    if unclustered_only:
+        filters = and_(filters, Article.cluster_id.is_(None))
+
+    article_ids: List[int] = []
+    summaries: List[str] = []
+    with get_session() as session:
+        total = session.exec(select(func.count()).select_from(Article).where(filters)).one()
+        statement = (
+            select(Article.id, Article.processed_content, Article.embedding_vector, Article.embedding)
+            .where(filters)
+            .order_by(desc(Article.processed_at))
+            .execution_options(yield_per=stream_chunk_size)
+        )
+
+        matrix = None
+        for article_id, summary, vector_bytes, legacy_json in session.exec(statement):
+            vector = load_embedding(vector_bytes, legacy_json)
+            if vector is None:
+                continue
+            if matrix is None:
+                matrix = np.empty((total, vector.shape[0]), dtype=EMBEDDING_DTYPE)
+            elif vector.shape[0] != matrix.shape[1]:
+                logger.warning(f"Skipping article {article_id}: embedding dimension {vector.shape[0]}")
+                continue
+            if len(article_ids) == len(matrix):
+                # Rows committed after the count (e.g. by an overlapping run): double the matrix
+                matrix = np.concatenate([matrix, np.empty((max(len(matrix), 1), matrix.shape[1]), EMBEDDING_DTYPE)])
+            matrix[len(article_ids)] = vector
+            article_ids.append(article_id)
+            summaries.append(summary)
+
+    if matrix is None:
+        return [], [], np.empty((0, 0), dtype=EMBEDDING_DTYPE)
+    return article_ids, summaries, matrix[: len(article_ids)]
+
+
+def get_story_clusters(feed_profile: str, active_since: datetime) -> List[Dict[str, Any]]:
+    """Returns the story clusters of a profile that received articles since `active_since`."""
+    with get_session() as session:
+        statement = (
+            select(StoryCluster)
+            .where(StoryCluster.feed_profile == feed_profile, StoryCluster.updated_at >= active_since)
+            .order_by(StoryCluster.id)
+        )
+        return [
+            {"id": cluster.id, "centroid": unpack_embedding(cluster.centroid), "size": cluster.size}
+            for cluster in session.exec(statement).all()
+        ]
+
+
+def save_story_clusters(feed_profile: str, clusters: List[Dict[str, Any]], assignments: Dict[int, int]) -> List[int]:
+    """
+    Stores updated and new story clusters and the articles assigned to them, in one transaction.
+
+    Args:
+        clusters: dicts with 'id' (None for a new cluster), 'centroid' and 'size'.
+        assignments: article id -> index into `clusters`.
+
+    Returns:
+        list: The database id of each entry in `clusters`.
+    """
+    now = datetime.now()
+    with get_session() as session:
+        cluster_ids = []
+        for cluster in clusters:
+            story = session.get(StoryCluster, cluster["id"]) if cluster["id"] is not None else None
+            if story is None:
+                story = StoryCluster(feed_profile=feed_profile, centroid=b"", created_at=now)
+            story.centroid = pack_embedding(cluster["centroid"])
+            story.size = cluster["size"]
+            story.updated_at = now
+            session.add(story)
+            session.flush()  # Assigns ids to new clusters
+            cluster_ids.append(story.id)
+
+        article_ids = list(assignments)
+        for start in range(0, len(article_ids), IN_QUERY_CHUNK_SIZE):
+            chunk = article_ids[start : start + IN_QUERY_CHUNK_SIZE]
+            for article in session.exec(select(Article).where(Article.id.in_(chunk))).all():
+                article.cluster_id = cluster_ids[assignments[article.id]]
+                session.add(article)
+        session.commit()
+        return cluster_ids
+
+
+def get_article_cluster_ids(article_ids: List[int], chunk_size: int = IN_QUERY_CHUNK_SIZE) -> Dict[int, int]:
+    """Returns {article_id: cluster_id} for the given articles that belong to a story cluster."""
+    cluster_ids = {}
+    with get_session() as session:
+        for start in range(0, len(article_ids), chunk_size):
+            chunk = article_ids[start : start + chunk_size]
+            statement = select(Article.id, Article.cluster_id).where(
+                Article.id.in_(chunk), Article.cluster_id.is_not(None)
+            )
+            cluster_ids.update(session.exec(statement).all())
+    return cluster_ids
+
+
+def get_articles_to_deduplicate(feed_profile: str, limit: int = 1000) -> List[Dict[str, Any]]:
+    """Returns the id and raw content of unprocessed articles that have no MinHash signature yet, oldest first."""
+    with get_session() as session:
+        statement = (
+            select(Article.id, Article.raw_content)
+            .where(
+                Article.processed_at.is_(None),
+                Article.raw_content.is_not(None),
+                Article.raw_content != "",
+                Article.minhash.is_(None),
+                Article.duplicate_of.is_(None),
+                Article.feed_profile == feed_profile,
+            )
+            .order_by(Article.id)
+            .limit(limit)
+        )
+        return [{"id": article_id, "raw_content": raw_content} for article_id, raw_content in session.exec(statement)]
+
+
+def get_minhash_signatures(feed_profile: str, since: datetime) -> List[Tuple[int, bytes]]:
+    """Returns (id, signature) for canonical (non-duplicate) articles fetched since `since`, oldest first."""
+    with get_session() as session:
+        statement = (
+            select(Article.id, Article.minhash)
+            .where(
+                Article.minhash.is_not(None),
+                Article.duplicate_of.is_(None),
+                Article.fetched_at >= since,
+                Article.feed_profile == feed_profile,
+            )
+            .order_by(Article.id)
+        )
+        return [(article_id, minhash) for article_id, minhash in session.exec(statement) if minhash]
+
+
+def save_dedup_results(results: List[Dict[str, Any]], chunk_size: int = IN_QUERY_CHUNK_SIZE) -> None:
+    """Stores MinHash signatures and duplicate links ('id', 'minhash', 'duplicate_of' per result)."""
+    by_id = {result["id"]: result for result in results}
+    article_ids = list(by_id)
+    with get_session() as session:
+        for start in range(0, len(article_ids), chunk_size):
+            chunk = article_ids[start : start + chunk_size]
+            for article in session.exec(select(Article).where(Article.id.in_(chunk))).all():
+                article.minhash = by_id[article.id]["minhash"]
+                article.duplicate_of = by_id[article.id]["duplicate_of"]
+                session.add(article)
+        session.commit()
+
+
+def backfill_embedding_vectors(chunk_size: int = IN_QUERY_CHUNK_SIZE) -> int:
+    """
+    Converts legacy JSON embeddings to the binary `embedding_vector` column, one committed
+    chunk at a time so readers and writers are never blocked for long.
+
+    Returns:
+        int: Number of articles converted.
+    """
+    converted = 0
+    while True:
+        with get_session() as session:
+            statement = (
+                select(Article)
+                .where(Article.embedding.is_not(None), Article.embedding_vector.is_(None))
+                .order_by(Article.id)
+                .limit(chunk_size)
+            )
+            articles = session.exec(statement).all()
+            if not articles:
+                return converted
+
+            for article in articles:
+                try:
+                    values = json.loads(article.embedding)
+                except (json.JSONDecodeError, TypeError):
+                    values = None
+                if not values:
+                    logger.warning(f"Dropping invalid embedding of article {article.id}")
+                article.embedding_vector = pack_embedding(values) if values else None
+                article.embedding = None
+                session.add(article)
+            session.commit()
+            converted += len(articles)
+            logger.info(f"Converted {converted} embeddings to binary vectors")
+
+
+def get_feed_states(feed_urls: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Returns the stored conditional GET state for each known feed URL, keyed by URL."""
+    if not feed_urls:
+        return {}
+
+    with get_session() as session:
+        statement = select(FeedState).where(FeedState.feed_url.in_(feed_urls))
+        states = session.exec(statement).all()
+        return {
+            state.feed_url: {
+                "etag": state.etag,
+                "modified": state.modified,
+                "seen_guids": set(json.loads(state.seen_guids)) if state.seen_guids else set(),
+                "last_fetched_at": state.last_fetched_at,
+            }
+            for state in states
+        }
+
+
+def update_feed_state(
+    feed_url: str,
+    etag: Optional[str],
+    modified: Optional[str],
+    seen_guids: Optional[List[str]] = None,
+) -> None:
+    """Stores the validators and seen entry GUIDs from the latest fetch of a feed."""
+    with get_session() as session:
+        state = session.get(FeedState, feed_url)
+        if state is None:
+            state = FeedState(feed_url=feed_url)
+        state.etag = etag
+        state.modified = modified
+        if seen_guids is not None:
+            state.seen_guids = json.dumps(sorted(seen_guids))
+        state.last_fetched_at = datetime.now()
+        session.add(state)
+        session.commit()
+
+
 def save_brief(brief_markdown: str, contributing_article_ids: List[int], feed_profile: str) -> int:
     """Saves the generated brief including its feed profile."""
     with get_session() as session:
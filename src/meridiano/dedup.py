@@ -0,0 +1,144 @@
+"""
+Near-duplicate detection for scraped articles (syndicated wire stories reprinted under
+different URLs).
+
+Each article's `raw_content` is reduced to a MinHash signature over word shingles, whose
+matching positions estimate the Jaccard similarity of two texts. Signatures are indexed
+with locality-sensitive hashing (LSH): the signature is cut into bands and articles sharing
+any whole band become candidates, so a lookup only compares against a handful of
+articles instead of every one in the window. Signatures are stored in `Article.minhash`,
+and the index is rebuilt from them on each run.
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Largest prime below 2**32: hash values mod this prime fit in uint32
+_PRIME = np.uint64(4294967291)
+_SEED = 20240601  # Fixed, so signatures stored by earlier runs stay comparable
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def shingles(text: str, size: int = 5) -> set:
+    """Returns the hashed word `size`-grams of `text`, ignoring case and punctuation."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return set()
+    if len(tokens) < size:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))}
+    return {zlib.crc32(" ".join(tokens[i : i + size]).encode("utf-8")) for i in range(len(tokens) - size + 1)}
+
+
+class MinHasher:
+    """Computes MinHash signatures with `num_perm` universal hash functions."""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(_SEED)
+        # a < 2**31 and x < 2**32 keep a * x + b below 2**64
+        self._a = rng.integers(1, 2**31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2**31, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Returns the uint32 signature of `text`, or None when it has no words."""
+        hashed = shingles(text, self.shingle_size)
+        if not hashed:
+            return None
+        values = np.fromiter(hashed, dtype=np.uint64, count=len(hashed))
+        permuted = (np.outer(self._a, values) + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return float(np.mean(first == second))
+
+
+class MinHashLSH:
+    """
+    In-memory LSH index over MinHash signatures.
+
+    With `bands` bands of `num_perm / bands` rows, two texts of Jaccard similarity s become
+    candidates with probability 1 - (1 - s**rows)**bands; candidates are then confirmed against
+    `threshold` with the full signature.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[int, np.ndarray] = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[bytes]:
+        for band in range(self.bands):
+            yield signature[band * self.rows : (band + 1) * self.rows].tobytes()
+
+    def insert(self, key: int, signature: np.ndarray) -> None:
+        self._signatures[key] = signature
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band][band_key].append(key)
+
+    def query(self, signature: np.ndarray) -> Optional[Tuple[int, float]]:
+        """Returns (key, similarity) of the most similar indexed signature at or above the threshold."""
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+
+        best = None
+        for key in candidates:
+            score = similarity(signature, self._signatures[key])
+            if score >= self.threshold and (best is None or (score, -key) > (best[1], -best[0])):
+                best = (key, score)
+        return best
+
+
+def find_duplicates(
+    articles: List[dict],
+    index: MinHashLSH,
+    hasher: MinHasher,
+) -> List[dict]:
+    """
+    Signs each article and looks it up in `index`; articles without a match are added to the
+    index as canonical, so later articles in the same batch can match them.
+
+    Args:
+        articles: dicts with 'id' and 'raw_content', oldest first.
+
+    Returns:
+        list: {'id', 'minhash' (bytes), 'duplicate_of' (id or None), 'similarity'} per article.
+    """
+    results = []
+    for article in articles:
+        signature = hasher.signature(article["raw_content"] or "")
+        if signature is None:
+            results.append({"id": article["id"], "minhash": b"", "duplicate_of": None, "similarity": None})
+            continue
+
+        match = index.query(signature)
+        if match is None:
+            index.insert(article["id"], signature)
+        results.append(
+            {
+                "id": article["id"],
+                "minhash": signature.tobytes(),
+                "duplicate_of": match[0] if match else None,
+                "similarity": match[1] if match else None,
+            }
+        )
+    return results
+
+
+def unpack_signature(data: bytes) -> Optional[np.ndarray]:
+    """Decodes a stored signature; empty bytes mark articles without text."""
+    return np.frombuffer(data, dtype=np.uint32) if data else None
@@ -0,0 +1,190 @@
+"""
+On-disk, content-addressed cache of fetched article HTML.
+
+Layout under the cache directory:
+
+    objects/<hh>/<sha256 of html>.<gz|zst>   compressed page bodies, stored once per distinct body
+    urls/<hh>/<sha256 of url>                 small ref files holding the body hash for a URL
+
+A ref file's mtime is the time the URL was fetched, which drives age-based expiry.
+Size-based eviction drops the least recently fetched URLs first and then deletes
+bodies no URL refers to anymore.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from . import config_base as config
+
+try:  # Python 3.14+
+    from compression import zstd as _zstd
+
+    def _zstd_compress(data):
+        return _zstd.compress(data)
+
+    def _zstd_decompress(data):
+        return _zstd.decompress(data)
+
+except ImportError:
+    try:
+        import zstandard as _zstd
+
+        def _zstd_compress(data):
+            return _zstd.ZstdCompressor().compress(data)
+
+        def _zstd_decompress(data):
+            return _zstd.ZstdDecompressor().decompress(data)
+
+    except ImportError:
+        _zstd = None
+
+DEFAULT_SUFFIX = ".zst" if _zstd else ".gz"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _compress(data: bytes, suffix: str) -> bytes:
+    return _zstd_compress(data) if suffix == ".zst" else gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data: bytes, suffix: str) -> bytes:
+    return _zstd_decompress(data) if suffix == ".zst" else gzip.decompress(data)
+
+
+class HtmlCache:
+    """Content-addressed HTML cache with size- and age-based eviction."""
+
+    def __init__(self, directory, max_bytes: int, max_age_seconds: float):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._objects = self.directory / "objects"
+        self._urls = self.directory / "urls"
+        self._lock = threading.Lock()
+
+    def _url_ref(self, url: str) -> Path:
+        key = _sha256(url.encode("utf-8"))
+        return self._urls / key[:2] / key
+
+    def _object_path(self, content_hash: str, suffix: str) -> Path:
+        return self._objects / content_hash[:2] / f"{content_hash}{suffix}"
+
+    def _find_object(self, content_hash: str) -> Optional[Path]:
+        for suffix in (".zst", ".gz"):
+            path = self._object_path(content_hash, suffix)
+            if path.exists():
+                return path
+        return None
+
+    def _is_expired(self, path: Path, now: float) -> bool:
+        return self.max_age_seconds > 0 and now - path.stat().st_mtime > self.max_age_seconds
+
+    def get(self, url: str) -> Optional[str]:
+        """Returns the cached HTML for `url`, or None if missing or expired."""
+        ref = self._url_ref(url)
+        try:
+            if self._is_expired(ref, time.time()):
+                return None
+            content_hash = ref.read_text().strip()
+            path = self._find_object(content_hash)
+            if path is None:
+                return None
+            if path.suffix == ".zst" and _zstd is None:
+                return None  # Written by an install with zstd support
+            return _decompress(path.read_bytes(), path.suffix).decode("utf-8")
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def put(self, url: str, html: str) -> str:
+        """Stores `html` for `url` and returns the body's content hash."""
+        data = html.encode("utf-8")
+        content_hash = _sha256(data)
+        with self._lock:
+            if self._find_object(content_hash) is None:
+                path = self._object_path(content_hash, DEFAULT_SUFFIX)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(_compress(data, DEFAULT_SUFFIX))
+                tmp_path.replace(path)
+
+            ref = self._url_ref(url)
+            ref.parent.mkdir(parents=True, exist_ok=True)
+            ref.write_text(content_hash)
+        return content_hash
+
+    def evict(self) -> dict:
+        """
+        Drops expired URL refs, then the least recently fetched ones until the stored bodies
+        fit in `max_bytes`, and deletes bodies no longer referenced.
+
+        Returns:
+            dict: {'urls_removed': int, 'objects_removed': int, 'bytes': int}
+        """
+        now = time.time()
+        urls_removed = 0
+        objects_removed = 0
+        with self._lock:
+            refs = []  # (mtime, path, content_hash)
+            for ref in self._urls.glob("*/*"):
+                try:
+                    if self._is_expired(ref, now):
+                        ref.unlink()
+                        urls_removed += 1
+                    else:
+                        refs.append((ref.stat().st_mtime, ref, ref.read_text().strip()))
+                except OSError:
+                    continue
+
+            objects = {}  # content_hash -> (path, size)
+            for path in self._objects.glob("*/*"):
+                if path.suffix in (".zst", ".gz"):
+                    objects[path.name.split(".")[0]] = (path, path.stat().st_size)
+
+            referenced = {}
+            for _, _, content_hash in refs:
+                referenced[content_hash] = referenced.get(content_hash, 0) + 1
+            total = sum(size for h, (_, size) in objects.items() if h in referenced)
+
+            # Oldest first, until what is still referenced fits
+            refs.sort(key=lambda item: item[0])
+            for _, ref, content_hash in refs:
+                if total <= self.max_bytes:
+                    break
+                ref.unlink(missing_ok=True)
+                urls_removed += 1
+                referenced[content_hash] -= 1
+                if referenced[content_hash] == 0 and content_hash in objects:
+                    total -= objects[content_hash][1]
+
+            for content_hash, (path, _) in objects.items():
+                if referenced.get(content_hash, 0) <= 0:
+                    path.unlink(missing_ok=True)
+                    objects_removed += 1
+
+        return {"urls_removed": urls_removed, "objects_removed": objects_removed, "bytes": total}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_html_cache() -> Optional[HtmlCache]:
+    """Returns the shared HTML cache, or None when HTML_CACHE_DIR is not configured."""
+    global _cache
+    if not config.HTML_CACHE_DIR:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.directory != Path(config.HTML_CACHE_DIR):
+            _cache = HtmlCache(
+                config.HTML_CACHE_DIR,
+                max_bytes=config.HTML_CACHE_MAX_BYTES,
+                max_age_seconds=config.HTML_CACHE_MAX_AGE_DAYS * 86400,
+            )
+        return _cache
@@ -0,0 +1,89 @@
+"""
+Shared HTTP client for Meridiano.
+
+All outgoing HTTP requests (article pages, service health checks) go through one
+pooled `requests.Session`, so connections and TLS sessions are reused across
+articles from the same publisher.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from . import config_base as config
+
+# Browser-like headers: several publishers refuse requests that look like bots.
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:137.0) Gecko/20100101 Firefox/137.0",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    # Only advertise the encodings urllib3 can decode here: gzip/deflate always,
+    # br and zstd when the optional `brotli` / `zstandard` packages are installed.
+    "Accept-Encoding": ACCEPT_ENCODING.replace(",", ", "),
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Cache-Control": "max-age=0",
+    "referer": "https://www.google.com",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_http_session(
+    pool_connections: int = None,
+    pool_maxsize: int = None,
+    max_retries: int = None,
+) -> requests.Session:
+    """
+    Creates a `requests.Session` with per-host connection pools.
+
+    Args:
+        pool_connections: Number of per-host pools kept alive (default: config.HTTP_POOL_CONNECTIONS).
+        pool_maxsize: Max connections kept per host (default: config.HTTP_POOL_MAXSIZE).
+        max_retries: Retries for connection errors and 429/5xx responses (default: config.HTTP_MAX_RETRIES).
+    """
+    pool_connections = pool_connections or config.HTTP_POOL_CONNECTIONS
+    pool_maxsize = pool_maxsize or config.HTTP_POOL_MAXSIZE
+    max_retries = config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """Returns the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_http_session()
+    return _session
+
+
+def close_http_session() -> None:
+    """Closes the shared session and its pooled connections. A new one is created on next use."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,256 @@
+"""
+Persistent caches of LLM completions and embeddings, so reruns, prompt iteration and
+syndicated (duplicate) stories don't pay twice.
+
+Completions are keyed by a SHA-256 of the request parameters that determine the answer
+(model, messages, sampling parameters); embeddings by model and a SHA-256 of the
+normalized text. The default backends share a local SQLite file and evict least recently
+used entries; any object implementing `CompletionCache` / `EmbeddingCache` can be plugged
+in with `set_completion_cache` / `set_embedding_cache`.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Optional
+
+from . import config_base as config
+
+
+def completion_cache_key(**params) -> str:
+    """Returns the cache key for a completion request (order-independent over `params`)."""
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """Cache interface; this base implementation stores nothing."""
+
+    def get(self, key: str) -> Optional[str]:
+        return None
+
+    def put(self, key: str, model: str, content: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class NullCompletionCache(CompletionCache):
+    """Cache used when caching is disabled or bypassed."""
+
+
+class SqliteCompletionCache(CompletionCache):
+    """
+    SQLite-backed completion cache.
+
+    Entries older than `ttl_seconds` (0 = never) are treated as missing. Once more than
+    `max_entries` are stored, the least recently used ones are dropped in one batch.
+    """
+
+    def __init__(self, path, max_entries: int = 50000, ttl_seconds: float = 0):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            " key TEXT PRIMARY KEY, model TEXT, content TEXT NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_completions_accessed_at ON completions (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT content, created_at FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            content, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return content
+
+    def put(self, key: str, model: str, content: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, model, content, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, model, content, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM completions WHERE created_at < ?", (now - self.ttl_seconds,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()
+        if self.max_entries and count > self.max_entries:
+            # Drop down to 90% so eviction runs once per batch of inserts, not on every insert
+            excess = count - int(self.max_entries * 0.9)
+            self._conn.execute(
+                "DELETE FROM completions WHERE key IN (SELECT key FROM completions ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_completion_cache = None
+_completion_cache_lock = threading.Lock()
+
+
+def get_completion_cache() -> CompletionCache:
+    """Returns the active completion cache, creating the configured one on first use."""
+    global _completion_cache
+    with _completion_cache_lock:
+        if _completion_cache is None:
+            if config.LLM_CACHE_ENABLED:
+                _completion_cache = SqliteCompletionCache(
+                    config.LLM_CACHE_PATH,
+                    max_entries=config.LLM_CACHE_MAX_ENTRIES,
+                    ttl_seconds=config.LLM_CACHE_TTL_DAYS * 86400,
+                )
+            else:
+                _completion_cache = NullCompletionCache()
+        return _completion_cache
+
+
+def set_completion_cache(cache: CompletionCache) -> None:
+    """Replaces the active completion cache (e.g. `NullCompletionCache()` to bypass it)."""
+    global _completion_cache
+    with _completion_cache_lock:
+        _completion_cache = cache
+
+
+def normalize_text(text: str) -> str:
+    """Normalizes text for cache lookups: Unicode NFC and collapsed whitespace."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def embedding_cache_key(model: str, text: str) -> str:
+    """Returns the cache key for embedding `text` with `model`."""
+    return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Embedding cache interface; this base implementation stores nothing but counts lookups."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, model: str, texts: list) -> dict:
+        """Returns {index: embedding} for the texts found in the cache."""
+        self.misses += len(texts)
+        return {}
+
+    def put_many(self, model: str, items: list) -> None:
+        """Stores (text, embedding) pairs."""
+        pass
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+class NullEmbeddingCache(EmbeddingCache):
+    """Embedding cache used when caching is disabled or bypassed."""
+
+
+class SqliteEmbeddingCache(EmbeddingCache):
+    """SQLite-backed embedding cache with least-recently-used eviction past `max_entries`."""
+
+    def __init__(self, path, max_entries: int = 200000):
+        super().__init__()
+        self.path = str(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, model TEXT, embedding TEXT NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_accessed_at ON embeddings (accessed_at)")
+        self._conn.commit()
+
+    def get_many(self, model: str, texts: list) -> dict:
+        now = time.time()
+        found = {}
+        with self._lock:
+            for index, text in enumerate(texts):
+                key = embedding_cache_key(model, text)
+                row = self._conn.execute("SELECT embedding FROM embeddings WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    continue
+                found[index] = json.loads(row[0])
+                self._conn.execute("UPDATE embeddings SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def put_many(self, model: str, items: list) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, embedding, accessed_at) VALUES (?, ?, ?, ?)",
+                [(embedding_cache_key(model, text), model, json.dumps(embedding), now) for text, embedding in items],
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            if self.max_entries and count > self.max_entries:
+                # Drop down to 90% so eviction runs once per batch of inserts, not on every insert
+                excess = count - int(self.max_entries * 0.9)
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_embedding_cache = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Returns the active embedding cache, creating the configured one on first use."""
+    global _embedding_cache
+    with _embedding_cache_lock:
+        if _embedding_cache is None:
+            if config.LLM_CACHE_ENABLED:
+                _embedding_cache = SqliteEmbeddingCache(
+                    config.LLM_CACHE_PATH, max_entries=config.EMBEDDING_CACHE_MAX_ENTRIES
+                )
+            else:
+                _embedding_cache = NullEmbeddingCache()
+        return _embedding_cache
+
+
+def set_embedding_cache(cache: EmbeddingCache) -> None:
+    """Replaces the active embedding cache (e.g. `NullEmbeddingCache()` to bypass it)."""
+    global _embedding_cache
+    with _embedding_cache_lock:
+        _embedding_cache = cache
@@ -10,7 +10,15 @@ from pathlib import Path
 from sqlmodel import select
 
 from . import config_base as config
-from .models import Article, Brief, create_db_and_tables, get_session
+from .database import backfill_embedding_vectors
+from .models import (
+    Article,
+    Brief,
+    create_db_and_tables,
+    create_postgres_search_vector,
+    get_session,
+    rebuild_sqlite_fts,
+)
 
 
 def migrate_from_sqlite():
@@ -61,6 +69,7 @@ def migrate_from_sqlite():
                         raw_content=row["raw_content"],
                         processed_content=row["processed_content"],
                         embedding=row["embedding"],
+                        embedding_vector=row.get("embedding_vector"),
                         processed_at=datetime.fromisoformat(row["processed_at"]) if row["processed_at"] else None,
                         cluster_id=row["cluster_id"],
                         impact_score=row["impact_score"],
@@ -131,13 +140,45 @@ def migrate_from_sqlite():
 
 def setup_postgresql_fts():
     """
-    Set up PostgreSQL full-text search indexes (already handled in models.py)
+    Regenerate the PostgreSQL search_vector column and its GIN index, e.g. after changing
+    TEXT_SEARCH_CONFIGS. Rewrites every article row, so run it off-peak on large tables
     """
     if "postgresql" not in config.DATABASE_URL.lower():
         print("[WARN] Not using PostgreSQL, skipping FTS setup")
         return
 
-    print("[INFO] PostgreSQL full-text search is configured in models.py")
+    create_db_and_tables()
+    print("[INFO] Regenerating articles.search_vector...")
+    create_postgres_search_vector(rebuild=True)
+    print("[DONE] PostgreSQL full-text search column rebuilt")
+    return True
+
+
+def rebuild_sqlite_fts_index():
+    """
+    Rebuild the SQLite FTS5 search index (articles_fts) from the articles table, e.g. after
+    bulk edits made with the triggers disabled or a restore from an older backup
+    """
+    if "postgresql" in config.DATABASE_URL.lower():
+        print("[WARN] Using PostgreSQL, the SQLite FTS index does not apply")
+        return
+
+    create_db_and_tables()
+    print("[INFO] Rebuilding the SQLite full-text search index...")
+    rebuild_sqlite_fts()
+    print("[DONE] Search index rebuilt")
+    return True
+
+
+def migrate_embeddings():
+    """
+    Convert JSON-text embeddings to binary float32 vectors in the configured database.
+    Runs in small committed batches, so the app and pipeline can keep running meanwhile.
+    """
+    create_db_and_tables()  # Adds the embedding_vector column if missing
+    print("[INFO] Converting JSON embeddings to binary vectors...")
+    converted = backfill_embedding_vectors()
+    print(f"[DONE] Converted {converted} embeddings")
     return True
 
 
@@ -181,10 +222,12 @@ if __name__ == "__main__":
     import sys
 
     if len(sys.argv) < 2:
-        print("Usage: python migrate.py [migrate|verify|setup_fts]")
-        print("  migrate   - Migrate data from SQLite to configured database")
-        print("  verify    - Verify migration by comparing record counts")
-        print("  setup_fts - Set up full-text search (PostgreSQL)")
+        print("Usage: python migrate.py [migrate|verify|setup_fts|rebuild_fts|embeddings]")
+        print("  migrate    - Migrate data from SQLite to configured database")
+        print("  verify     - Verify migration by comparing record counts")
+        print("  setup_fts  - Regenerate the full-text search column (PostgreSQL)")
+        print("  rebuild_fts - Rebuild the full-text search index (SQLite)")
+        print("  embeddings - Convert JSON embeddings to binary vectors")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -195,5 +238,9 @@ if __name__ == "__main__":
         verify_migration()
     elif command == "setup_fts":
         setup_postgresql_fts()
+    elif command == "rebuild_fts":
+        rebuild_sqlite_fts_index()
+    elif command == "embeddings":
+        migrate_embeddings()
     else:
-        print("[ERROR] Unknown command. Use 'migrate', 'verify', or 'setup_fts'")
+        print("[ERROR] Unknown command. Use 'migrate', 'verify', 'setup_fts', 'rebuild_fts' or 'embeddings'")
@@ -2,9 +2,11 @@
 SQLModel database models for Meridiano application.
 """
 
+import re
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Session, SQLModel, create_engine, text
 
 from . import config_base as config
@@ -37,6 +39,33 @@ class Article(SQLModel, table=True):
     """
 
     __tablename__ = "articles"
+    # Composite and partial indexes for the pipeline's work queues. Each leads with
+    # feed_profile (equality) and ends with the ORDER BY column, so a queue query reads its
+    # first `limit` rows straight off the index; the partial ones only hold rows still
+    # waiting for a stage, so they stay small as the table grows.
+    __table_args__ = (
+        # get_unprocessed_articles: not yet summarized, newest fetched first
+        Index(
+            "ix_articles_unprocessed",
+            "feed_profile",
+            "fetched_at",
+            sqlite_where=text("processed_at IS NULL AND duplicate_of IS NULL"),
+            postgresql_where=text("processed_at IS NULL AND duplicate_of IS NULL"),
+        ),
+        # get_unrated_articles: summarized but not rated, newest processed first. impact_score
+        # is also a key column so that, without table statistics, SQLite's planner sees two
+        # equality terms and prefers this index over ix_articles_profile_processed.
+        Index(
+            "ix_articles_unrated",
+            "feed_profile",
+            "impact_score",
+            "processed_at",
+            sqlite_where=text("impact_score IS NULL AND processed_at IS NOT NULL"),
+            postgresql_where=text("impact_score IS NULL AND processed_at IS NOT NULL"),
+        ),
+        # get_articles_for_briefing / get_embedding_matrix_for_briefing: processed_at window
+        Index("ix_articles_profile_processed", "feed_profile", "processed_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     url: str = Field(unique=True, index=True)
@@ -46,7 +75,10 @@ class Article(SQLModel, table=True):
     fetched_at: datetime = Field(default_factory=datetime.now)
     raw_content: Optional[str] = None
     processed_content: Optional[str] = None
-    embedding: Optional[str] = None  # JSON string
+    embedding: Optional[str] = None  # Legacy JSON string, superseded by embedding_vector
+    embedding_vector: Optional[bytes] = None  # float32 bytes, see vectors.py
+    minhash: Optional[bytes] = None  # MinHash signature of raw_content, see dedup.py
+    duplicate_of: Optional[int] = Field(default=None, index=True)  # Canonical article of a near-duplicate
     processed_at: Optional[datetime] = Field(default=None, index=True)
     cluster_id: Optional[int] = None
     impact_score: Optional[int] = None
@@ -78,6 +110,31 @@ class Brief(SQLModel, table=True):
     feed_profile: str = Field(default="default", index=True)
 
 
+class FeedState(SQLModel, table=True):
+    """Conditional GET state for an RSS feed: validators from the last response and recently seen entries."""
+
+    __tablename__ = "feed_states"
+
+    feed_url: str = Field(primary_key=True)
+    etag: Optional[str] = None
+    modified: Optional[str] = None  # Last-Modified header, passed back verbatim
+    seen_guids: Optional[str] = None  # JSON list of entry GUIDs already stored
+    last_fetched_at: Optional[datetime] = None
+
+
+class StoryCluster(SQLModel, table=True):
+    """A story that persists across brief runs: the running mean of its articles' embeddings."""
+
+    __tablename__ = "story_clusters"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    feed_profile: str = Field(index=True)
+    centroid: bytes  # float32 bytes, see vectors.py
+    size: int = 0
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now, index=True)
+
+
 # Collections models (many-to-many association) --------------------------------
 class CollectionArticle(SQLModel, table=True):
     """Association table between collections and articles."""
@@ -99,6 +156,161 @@ class Collection(SQLModel, table=True):
 engine = create_engine(config.DATABASE_URL, echo=False)
 
 
+def _add_column_if_missing(table: str, column: str, sqlite_type: str, postgres_type: str):
+    """Adds a nullable column to an existing table created before the column was introduced."""
+    with Session(engine) as session:
+        try:
+            session.exec(text(f"SELECT {column} FROM {table} LIMIT 1"))
+        except Exception:
+            print(f"Migrating '{table}' table: Adding '{column}' column...")
+            session.rollback()
+            try:
+                column_type = postgres_type if "postgresql" in config.DATABASE_URL.lower() else sqlite_type
+                session.exec(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"))
+                session.commit()
+                print("Migration successful.")
+            except Exception as e:
+                print(f"Migration failed: {e}")
+                session.rollback()
+
+
+# External-content FTS5 index over articles.title and raw_content: the index stores only
+# tokens, and snippet() reads the text back from 'articles' by rowid (= articles.id).
+_SQLITE_FTS_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title,
+        raw_content,
+        content='articles',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    # Triggers keep the index in sync. External-content tables are updated by issuing the
+    # special 'delete' command with the old values, then inserting the new ones.
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts (rowid, title, raw_content) VALUES (new.id, new.title, new.raw_content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, title, raw_content)
+        VALUES ('delete', old.id, old.title, old.raw_content);
+    END
+    """,
+    # Only edits to the indexed columns reindex a row, not summaries, ratings or embeddings
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, raw_content ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, title, raw_content)
+        VALUES ('delete', old.id, old.title, old.raw_content);
+        INSERT INTO articles_fts (rowid, title, raw_content) VALUES (new.id, new.title, new.raw_content);
+    END
+    """,
+]
+
+
+def _create_article_indexes():
+    """
+    Creates the composite and partial indexes declared on Article for databases whose
+    articles table predates them (create_all only indexes tables it creates).
+    """
+    for index in Article.__table__.indexes:
+        try:
+            index.create(engine, checkfirst=True)
+        except Exception as e:
+            print(f"Note: could not create index {index.name}: {e}")
+
+
+def _create_sqlite_fts():
+    """
+    Creates the articles_fts index and its triggers if missing. When the triggers were
+    missing (new index, or a recreated articles table) the index cannot be trusted and is
+    rebuilt from the articles table. Without FTS5 in the SQLite build, search falls back
+    to LIKE.
+    """
+    with Session(engine) as session:
+        in_sync = session.exec(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'articles_fts_ai'")
+        ).first()
+        try:
+            for statement in _SQLITE_FTS_STATEMENTS:
+                session.exec(text(statement))
+            if not in_sync:
+                print("Building the full-text search index...")
+                session.exec(text("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')"))
+            session.commit()
+        except Exception as e:
+            print(f"Note: SQLite FTS5 index not available, search will use LIKE: {e}")
+            session.rollback()
+
+
+def rebuild_sqlite_fts():
+    """Rebuilds the SQLite full-text index from the articles table and merges its segments."""
+    _create_sqlite_fts()
+    with Session(engine) as session:
+        session.exec(text("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')"))
+        session.exec(text("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')"))
+        session.commit()
+
+
+def _regconfig_literal(name: str) -> str:
+    if not re.fullmatch(r"[a-z_]+", name):
+        raise ValueError(f"Invalid text search configuration name: {name!r}")
+    return f"'{name}'::regconfig"
+
+
+def search_config_sql() -> str:
+    """SQL expression choosing a row's text search configuration from its feed_profile."""
+    default = _regconfig_literal(config.TEXT_SEARCH_CONFIG_DEFAULT)
+    if not config.TEXT_SEARCH_CONFIGS:
+        return default
+    cases = " ".join(
+        f"WHEN '{profile.replace(chr(39), chr(39) * 2)}' THEN {_regconfig_literal(name)}"
+        for profile, name in sorted(config.TEXT_SEARCH_CONFIGS.items())
+    )
+    return f"CASE feed_profile {cases} ELSE {default} END"
+
+
+def search_vector_sql() -> str:
+    """
+    Generation expression of articles.search_vector: title (weight A) and body (weight B),
+    each stemmed with the row's profile configuration, so ts_rank_cd favours title hits.
+    """
+    search_config = search_config_sql()
+    return (
+        f"setweight(to_tsvector({search_config}, coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector({search_config}, coalesce(raw_content, '')), 'B')"
+    )
+
+
+def create_postgres_search_vector(rebuild: bool = False):
+    """
+    Adds the generated, stored `search_vector` tsvector column to articles with a GIN index,
+    replacing the old to_tsvector expression index. PostgreSQL computes the column on insert
+    and update, so searches read the index and ranking reads stored vectors. With `rebuild`,
+    the column is dropped and regenerated (after changing TEXT_SEARCH_CONFIGS).
+    """
+    with Session(engine) as session:
+        try:
+            if rebuild:
+                session.exec(text("ALTER TABLE articles DROP COLUMN IF EXISTS search_vector"))
+            session.exec(
+                text(
+                    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                    f"GENERATED ALWAYS AS ({search_vector_sql()}) STORED"
+                )
+            )
+            session.exec(
+                text("CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING GIN (search_vector)")
+            )
+            session.exec(text("DROP INDEX IF EXISTS idx_articles_fts"))
+            session.commit()
+        except Exception as e:
+            print(f"Note: FTS column creation: {e}")
+            session.rollback()
+
+
 def create_db_and_tables():
     """Create database tables if they don't exist."""
     SQLModel.metadata.create_all(engine)
@@ -125,60 +337,22 @@ def create_db_and_tables():
                 print(f"Migration failed: {e}")
                 session.rollback()
 
-    # Old SQLite schema for reference (replaced by to_tsvector in PostgreSQL)
-    """
-    # --- FTS5 Virtual Table ---
-    # Create the virtual table to index title and raw_content from articles
-    # content='' means it doesn't store the content itself, only index
-    # content_rowid='id' links the FTS rowid to the articles table id column
-    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
-        title,
-        raw_content,
-        content='articles',
-        content_rowid='id'
-    )
-
-    # --- Triggers to keep FTS table synchronized ---
-    # After inserting into articles, insert into articles_fts
-    CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
-        INSERT INTO articles_fts (rowid, title, raw_content)
-        VALUES (new.id, new.title, new.raw_content);
-    END;
+    # Migration for the binary 'embedding_vector' column in 'articles'. Existing JSON embeddings
+    # stay readable and are converted in batches by `python -m meridiano.migrate embeddings`.
+    _add_column_if_missing("articles", "embedding_vector", "BLOB", "BYTEA")
+    # Migration for the near-duplicate detection columns in 'articles' (see dedup.py)
+    _add_column_if_missing("articles", "minhash", "BLOB", "BYTEA")
+    _add_column_if_missing("articles", "duplicate_of", "INTEGER", "INTEGER")
+    # Work-queue indexes, which also need duplicate_of to exist
+    _create_article_indexes()
 
-    # Before deleting from articles, delete from articles_fts
-    # Need old.id to identify the row in articles_fts
-    CREATE TRIGGER IF NOT EXISTS articles_ad BEFORE DELETE ON articles BEGIN
-        DELETE FROM articles_fts WHERE rowid=old.id;
-    END;
+    # SQLite full-text search index (PostgreSQL uses to_tsvector below)
+    if "postgresql" not in config.DATABASE_URL.lower():
+        _create_sqlite_fts()
 
-    # After updating articles, update articles_fts
-    CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
-        UPDATE articles_fts SET title=new.title, raw_content=new.raw_content
-        WHERE rowid=old.id;
-    END;
-    # --- End FTS Setup ---
-    """
-
-    # For PostgreSQL, create full-text search index
+    # For PostgreSQL, add the stored full-text search column and its index
     if "postgresql" in config.DATABASE_URL.lower():
-        with Session(engine) as session:
-            try:
-                # Create full-text search index
-                session.exec(
-                    text("""
-                    CREATE INDEX IF NOT EXISTS idx_articles_fts
-                    ON articles USING GIN(
-                        to_tsvector('english',
-                            coalesce(title, '') || ' ' || coalesce(raw_content, '')
-                        )
-                    )
-                """)
-                )
-                session.commit()
-                print("PostgreSQL full-text search index created")
-            except Exception as e:
-                print(f"Note: FTS index creation: {e}")
-                session.rollback()
+        create_postgres_search_vector()
 
 
 def get_session():
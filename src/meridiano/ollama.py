@@ -3,13 +3,15 @@ import os
 
 import requests
 
+from .http_client import get_http_session
+
 OLLAMA_API_BASE = os.getenv("OLLAMA_API_BASE", "http://localhost:11434")
 
 
 def check_ollama(host: str = OLLAMA_API_BASE) -> bool:
     """Check if the Ollama server is reachable."""
     try:
-        response = requests.get(f"{host}/v1/models", timeout=5)
+        response = get_http_session().get(f"{host}/v1/models", timeout=5)
         if response.status_code == 200:
             print("[INFO] Ollama server is reachable.")
             return True
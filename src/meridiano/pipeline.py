@@ -0,0 +1,247 @@
+"""
+Streaming pipeline mode for run_briefing (`run_briefing --pipeline`).
+
+Instead of running each stage to completion over the whole batch, the scrape, summarize,
+embed and rate stages run at the same time, connected by bounded asyncio queues:
+
+    scrape -> [summarize queue] -> summarize workers -> [embed queue] -> embed batcher
+           -> [rate queue] -> rate workers
+
+An article is summarized as soon as it is stored, so the first article is fully processed
+long before the last feed is downloaded. Queues hold at most PIPELINE_QUEUE_SIZE articles;
+when one is full the stage feeding it waits, which keeps memory bounded and stops a fast
+scraper from racing ahead of the LLM rate limits.
+
+Blocking work (HTTP, LLM calls) runs in threads via `asyncio.to_thread`. Database writes
+stay on the event loop thread, except the inserts done by the scraper itself. Summaries are
+written once per embedding batch and ratings every DB_WRITE_BATCH_SIZE articles.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from meridiano import config_base as config
+from meridiano import database
+from meridiano import run_briefing as stages
+from meridiano.dedup import find_duplicates
+from meridiano.llm_cache import get_embedding_cache
+
+_DONE = object()  # Queue sentinel: the producing stage has finished
+
+
+async def run_pipeline(feed_profile, rss_feeds, effective_config, limit=1000, scrape_workers=None):
+    """
+    Scrapes `rss_feeds` and summarizes, embeds and rates each new article as it arrives.
+
+    Articles left unprocessed or unrated by earlier runs (up to `limit` each) are fed into
+    the pipeline before the newly scraped ones. Returns a dict of per-stage counts.
+    """
+    loop = asyncio.get_running_loop()
+    chat_model = getattr(effective_config, "LLM_CHAT_MODEL", "deepseek/deepseek-chat")
+    summarize_article = stages._article_summarizer(effective_config)
+    rating_prompt_template = getattr(effective_config, "PROMPT_IMPACT_RATING", config.PROMPT_IMPACT_RATING)
+    workers = getattr(effective_config, "LLM_MAX_CONCURRENCY", config.LLM_MAX_CONCURRENCY)
+    batch_size = getattr(effective_config, "EMBEDDING_BATCH_SIZE", config.EMBEDDING_BATCH_SIZE)
+    queue_size = getattr(effective_config, "PIPELINE_QUEUE_SIZE", config.PIPELINE_QUEUE_SIZE)
+    batch_wait = getattr(effective_config, "PIPELINE_EMBED_BATCH_WAIT", config.PIPELINE_EMBED_BATCH_WAIT)
+    dedup_enabled = getattr(effective_config, "DEDUP_ENABLED", config.DEDUP_ENABLED)
+    write_batch_size = getattr(effective_config, "DB_WRITE_BATCH_SIZE", config.DB_WRITE_BATCH_SIZE)
+
+    # One thread per summarize and rate worker, plus the scraper and the embedding batcher
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=2 * workers + 2, thread_name_prefix="pipeline"))
+
+    summarize_queue = asyncio.Queue(maxsize=queue_size)
+    embed_queue = asyncio.Queue(maxsize=queue_size)
+    rate_queue = asyncio.Queue(maxsize=queue_size)
+    counts = {"scraped": 0, "duplicates": 0, "processed": 0, "rated": 0}
+    rating_writes = []  # (article_id, impact_score) not yet written, see flush_ratings
+    # Set once the stages have finished (or failed), so the scraper thread stops handing over
+    # articles instead of waiting forever on a queue nobody reads
+    stopping = threading.Event()
+    started = time.perf_counter()
+    first_done = None
+
+    if dedup_enabled:
+        # Check the backlog in one pass; new articles are then checked one by one as they arrive
+        stages.deduplicate_articles(feed_profile, effective_config, limit)
+        hasher, dedup_index = stages._dedup_index(feed_profile, effective_config)
+        dedup_lock = threading.Lock()  # Summarize workers check articles from several threads
+
+    def on_article(article):
+        # Called on the scraper thread; blocks it while the summarize queue is full. Articles
+        # scraped after the pipeline stopped stay unprocessed until the next run.
+        counts["scraped"] += 1
+        if stopping.is_set():
+            return
+        future = asyncio.run_coroutine_threadsafe(summarize_queue.put({**article, "new": True}), loop)
+        while not stopping.is_set():
+            try:
+                future.result(timeout=0.5)
+                return
+            except TimeoutError:
+                continue
+        future.cancel()
+
+    async def scrape():
+        for article in database.get_unprocessed_articles(feed_profile, limit):
+            await summarize_queue.put(article)
+        try:
+            if rss_feeds:
+                await asyncio.to_thread(stages.scrape_articles, feed_profile, rss_feeds, scrape_workers, on_article)
+        finally:
+            for _ in range(workers):
+                await summarize_queue.put(_DONE)
+
+    async def seed_ratings():
+        for article in database.get_unrated_articles(feed_profile, limit):
+            if article["processed_content"]:
+                await rate_queue.put(article)
+
+    def is_duplicate(article):
+        # Runs in a worker thread: MinHash and the database write would stall the event loop
+        try:
+            with dedup_lock:
+                result = find_duplicates([article], dedup_index, hasher)[0]
+                database.save_dedup_results([result])
+        except Exception as e:
+            print(f"  Warning: Duplicate check failed for article {article['id']}: {e}")
+            return False
+        if result["duplicate_of"] is None:
+            return False
+        print(
+            f"  Article {article['id']} duplicates article {result['duplicate_of']} "
+            f"({result['similarity']:.0%} similar), skipping."
+        )
+        counts["duplicates"] += 1
+        return True
+
+    async def summarize():
+        while (article := await summarize_queue.get()) is not _DONE:
+            if dedup_enabled and article.get("new") and await asyncio.to_thread(is_duplicate, article):
+                continue
+            try:
+                summary, impact_score = await asyncio.to_thread(summarize_article, article)
+            except Exception as e:
+                print(f"Skipping article {article['id']} due to error: {e}")
+                continue
+            if not summary:
+                print(f"Skipping article {article['id']} due to summarization error.")
+                continue
+            await embed_queue.put((article, summary, impact_score))
+        await embed_queue.put(_DONE)
+
+    async def embed():
+        nonlocal first_done
+        pending = []
+        finished_workers = 0
+
+        async def flush():
+            nonlocal first_done
+            batch = list(pending)
+            pending.clear()
+            try:
+                embeddings = await asyncio.to_thread(
+                    stages.get_deepseek_embeddings, [summary for _, summary, _ in batch], batch_size=batch_size
+                )
+            except Exception as e:
+                print(f"Skipping {len(batch)} articles due to embedding error: {e}")
+                return
+            embedded = []
+            for item, embedding in zip(batch, embeddings):
+                if embedding:
+                    embedded.append((item, embedding))
+                else:
+                    print(f"Skipping article {item[0]['id']} due to embedding error.")
+            # One transaction per embedding batch, written before the articles move on to rating
+            try:
+                database.update_articles_processing(
+                    [(article["id"], summary, embedding) for (article, summary, _), embedding in embedded]
+                )
+                database.update_article_ratings(
+                    [(article["id"], score) for (article, _, score), _ in embedded if score is not None]
+                )
+            except Exception as e:
+                # Left unprocessed, so the next run picks them up again
+                print(f"Skipping {len(embedded)} articles due to database error: {e}")
+                return
+            for (article, summary, impact_score), _ in embedded:
+                counts["processed"] += 1
+                if first_done is None:
+                    first_done = time.perf_counter() - started
+                print(f"Successfully processed article ID: {article['id']}")
+                if impact_score is None:
+                    await rate_queue.put({**article, "processed_content": summary})
+                else:
+                    # Rated by the same request (COMBINED_PROCESSING)
+                    print(f"  Article ID {article['id']} rated as: {impact_score}")
+                    counts["rated"] += 1
+
+        while finished_workers < workers:
+            try:
+                # Wait for more summaries only briefly once a partial batch is pending
+                item = await asyncio.wait_for(embed_queue.get(), timeout=batch_wait if pending else None)
+            except asyncio.TimeoutError:
+                item = None
+            if item is _DONE:
+                finished_workers += 1
+            elif item is not None:
+                pending.append(item)
+            if pending and (len(pending) >= batch_size or item is None or finished_workers == workers):
+                await flush()
+
+    async def rate():
+        while (article := await rate_queue.get()) is not _DONE:
+            try:
+                impact_score = await asyncio.to_thread(
+                    stages._rate_article, article, rating_prompt_template, chat_model
+                )
+            except Exception as e:
+                print(f"  Warning: Rating failed for article {article['id']}: {e}")
+                continue
+            # Failed ratings stay NULL and are retried next run
+            if impact_score is not None:
+                print(f"  Article ID {article['id']} rated as: {impact_score}")
+                rating_writes.append((article["id"], impact_score))
+                counts["rated"] += 1
+                if len(rating_writes) >= write_batch_size:
+                    flush_ratings()
+
+    def flush_ratings():
+        try:
+            database.update_article_ratings(rating_writes)
+        except Exception as e:
+            # Failed ratings stay NULL and are retried next run
+            print(f"  Warning: Could not store {len(rating_writes)} ratings: {e}")
+            counts["rated"] -= len(rating_writes)
+        rating_writes.clear()
+
+    async def embed_then_stop_rating(seeding):
+        await embed()
+        await seeding
+        for _ in range(workers):
+            await rate_queue.put(_DONE)
+
+    print(f"Pipeline: {workers} summarize/rate workers, queues of {queue_size}, embedding batches of {batch_size}.")
+    seeding = asyncio.create_task(seed_ratings())
+    try:
+        await asyncio.gather(
+            scrape(),
+            embed_then_stop_rating(seeding),
+            *(summarize() for _ in range(workers)),
+            *(rate() for _ in range(workers)),
+        )
+    finally:
+        stopping.set()
+    flush_ratings()
+
+    cache_stats = get_embedding_cache().stats()
+    print(f"Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses.")
+    first = f"{first_done:.1f}s" if first_done is not None else "-"
+    print(
+        f"--- Pipeline Finished in {time.perf_counter() - started:.1f}s (first article processed after {first}). "
+        f"Scraped {counts['scraped']}, skipped {counts['duplicates']} duplicates, "
+        f"processed {counts['processed']}, rated {counts['rated']}. ---"
+    )
+    return counts
@@ -1,24 +1,38 @@
 # simple-meridian/run_briefing.py
 
 import argparse
+import asyncio
 import importlib
-import json
 import os
+import pkgutil
 import re
-import time
-from datetime import datetime
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 
 import feedparser
 import litellm
 import numpy as np
 from dotenv import load_dotenv
-from sklearn.cluster import KMeans
-from sqlmodel import select
+from pydantic import BaseModel, Field, ValidationError
 
 from meridiano import config_base as config  # Load base config first
 from meridiano import database
-from meridiano.models import Article, get_session
-from meridiano.utils import fetch_article_content_and_og_image
+from meridiano.clustering import NOISE_LABEL, assign_story_clusters, cluster_embeddings
+from meridiano.concurrency import get_host_throttle, get_rate_limiter
+from meridiano.dedup import MinHasher, MinHashLSH, find_duplicates, unpack_signature
+from meridiano.html_cache import get_html_cache
+from meridiano.llm_cache import (
+    NullCompletionCache,
+    NullEmbeddingCache,
+    completion_cache_key,
+    get_completion_cache,
+    get_embedding_cache,
+    set_completion_cache,
+    set_embedding_cache,
+)
+from meridiano.utils import extract_article_from_html, fetch_article_content_and_og_image
 
 # --- Setup ---
 load_dotenv()
@@ -31,9 +45,79 @@ embedding_client = {
     "api_base": os.getenv("EMBEDDING_API_BASE_URL"),
 }
 
+# Process-wide cap on in-flight LLM requests, shared by all stages and feed profiles
+_llm_slots = threading.BoundedSemaphore(config.LLM_GLOBAL_MAX_CONCURRENCY)
 
-def call_deepseek_chat(prompt, model=config.LLM_CHAT_MODEL, system_prompt=None):
-    """Calls the LLM API (Deepseek, Ollama, etc)."""
+
+def _rate_limiter_for(model):
+    """Returns the shared rate limiter for a model, configured from LLM_RATE_LIMITS."""
+    limits = config.LLM_RATE_LIMITS.get(model, config.LLM_DEFAULT_RATE_LIMIT)
+    return get_rate_limiter(model, rpm=limits.get("rpm"), tpm=limits.get("tpm"))
+
+
+def _estimate_tokens(text):
+    """Rough token count (~4 characters per token) used to budget tokens-per-minute limits."""
+    return len(text) // 4 + 1 if text else 0
+
+
+def _usage_tokens(response):
+    """Returns the total tokens reported by a litellm response, if any."""
+    try:
+        return int(response["usage"]["total_tokens"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _retry_after(error):
+    """Returns the Retry-After delay (seconds) sent with a rate-limit error, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _rate_limited_call(model, estimated_tokens, request):
+    """
+    Runs `request()` under the model's RateLimiter, backing off and retrying on HTTP 429.
+
+    Returns:
+        The response, or None once LLM_MAX_RETRIES rate-limited retries are exhausted.
+        Other errors propagate to the caller.
+    """
+    limiter = _rate_limiter_for(model)
+    for attempt in range(config.LLM_MAX_RETRIES + 1):
+        limiter.acquire(estimated_tokens)
+        try:
+            with _llm_slots:
+                response = request()
+        except litellm.RateLimitError as e:
+            pause = limiter.on_rate_limited(_retry_after(e))
+            print(
+                f"Rate limited by {model} (attempt {attempt + 1}/{config.LLM_MAX_RETRIES + 1}), "
+                f"backing off {pause:.1f}s."
+            )
+            continue
+        limiter.on_success()
+        limiter.settle(estimated_tokens, _usage_tokens(response))
+        return response
+
+    print(f"Giving up on {model} request after {config.LLM_MAX_RETRIES + 1} rate-limited attempts.")
+    return None
+
+
+def call_deepseek_chat(prompt, model=config.LLM_CHAT_MODEL, system_prompt=None, response_format=None, validate=None):
+    """
+    Calls the LLM API (Deepseek, Ollama, etc).
+
+    `response_format` is passed through to the provider, e.g. {"type": "json_object"} for JSON mode.
+
+    Requests are paced by the model's shared RateLimiter (LLM_RATE_LIMITS) and retried
+    with backoff when the provider answers 429, so it is safe to call from many threads.
+    Answers are stored in the completion cache (see llm_cache.py) and reused for
+    identical requests. With `validate`, only answers for which `validate(answer)` is true
+    are cached or served from the cache, so a rejected answer is requested again next time.
+    """
     messages = []
     if system_prompt:
         messages.append({"role": "system", "content": system_prompt})
@@ -46,6 +130,8 @@ def call_deepseek_chat(prompt, model=config.LLM_CHAT_MODEL, system_prompt=None):
         "max_tokens": 2048,
         "temperature": 0.7,
     }
+    if response_format:
+        completion_kwargs["response_format"] = response_format
 
     # Only pass api_base if it's set and we are NOT using Ollama (which has its own default/env var)
     # or if we want to support a custom OLLAMA_API_BASE env var handled by litellm.
@@ -61,111 +147,292 @@ def call_deepseek_chat(prompt, model=config.LLM_CHAT_MODEL, system_prompt=None):
             completion_kwargs["api_base"] = ollama_base
             # print(f"DEBUG: Using Ollama API Base: {ollama_base}")
 
+    cache = get_completion_cache()
+    cache_key = completion_cache_key(**completion_kwargs)
+    cached = cache.get(cache_key)
+    if cached is not None and (validate is None or validate(cached)):
+        return cached
+
+    estimated_tokens = _estimate_tokens(prompt) + _estimate_tokens(system_prompt) + completion_kwargs["max_tokens"]
     try:
-        response = litellm.completion(**completion_kwargs)
-        return response["choices"][0]["message"]["content"].strip()
+        response = _rate_limited_call(model, estimated_tokens, lambda: litellm.completion(**completion_kwargs))
     except Exception as e:
         print(f"Error calling Deepseek Chat API: {e}")
-        # Implement retry logic or better error handling here if needed
-        time.sleep(1)  # Basic backoff
         return None
+    if response is None:
+        return None
+
+    try:
+        content = response["choices"][0]["message"]["content"].strip()
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        print(f"Error reading Deepseek Chat API response: {e}")
+        return None
+    if content and (validate is None or validate(content)):
+        cache.put(cache_key, model, content)
+    return content
+
+
+def _embedding_batches(texts, batch_size, max_batch_tokens):
+    """Yields lists of indexes into `texts`, each within the item and (estimated) token caps."""
+    batch, batch_tokens = [], 0
+    for index, text in enumerate(texts):
+        tokens = _estimate_tokens(text)
+        if batch and (len(batch) >= batch_size or batch_tokens + tokens > max_batch_tokens):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(index)
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+
+def _embed_batch(texts, model):
+    """
+    Embeds a batch of texts with one request. When the provider rejects the input or returns
+    the wrong number of vectors, the batch is split in halves and retried, so one bad item
+    only loses itself. Rate limiting and other errors are not split: more, smaller requests
+    would only add load.
+
+    Returns:
+        list: One embedding (or None) per text, in order.
+    """
+    try:
+        response = _rate_limited_call(
+            model,
+            sum(_estimate_tokens(text) for text in texts),
+            lambda: litellm.embedding(api_base=embedding_client["api_base"], model=model, input=texts),
+        )
+    except litellm.BadRequestError as e:
+        print(f"Embedding API rejected a batch of {len(texts)} texts: {e}")
+        response = {}
+    except Exception as e:
+        print(f"Error calling Embedding API for {len(texts)} texts: {e}")
+        return [None] * len(texts)
+    if response is None:  # Rate-limit retries ran out
+        return [None] * len(texts)
+
+    data = response.get("data")
+    if data and len(data) == len(texts):
+        # Providers may return items out of order; "index" maps them back to the input
+        data = sorted(data, key=lambda item: item.get("index", 0)) if "index" in data[0] else data
+        return [item["embedding"] for item in data]
+    if response:
+        print(f"Warning: Embedding API returned {len(data or [])} vectors for {len(texts)} texts.")
+
+    if len(texts) == 1:
+        return [None]
+    middle = len(texts) // 2
+    return _embed_batch(texts[:middle], model) + _embed_batch(texts[middle:], model)
+
+
+def get_deepseek_embeddings(texts, model=config.EMBEDDING_MODEL, batch_size=None, max_batch_tokens=None):
+    """
+    Gets embeddings for many texts, sending up to EMBEDDING_BATCH_SIZE texts
+    (and EMBEDDING_BATCH_MAX_TOKENS estimated tokens) per request. Texts already in the
+    embedding cache are not sent.
+
+    Returns:
+        list: One embedding (or None on failure) per text, in the order of `texts`.
+    """
+    batch_size = batch_size or config.EMBEDDING_BATCH_SIZE
+    max_batch_tokens = max_batch_tokens or config.EMBEDDING_BATCH_MAX_TOKENS
+    embeddings = [None] * len(texts)
+
+    # Identical (e.g. syndicated) texts are served from the embedding cache
+    cache = get_embedding_cache()
+    for index, embedding in cache.get_many(model, texts).items():
+        embeddings[index] = embedding
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+
+    missing_texts = [texts[i] for i in missing]
+    for batch in _embedding_batches(missing_texts, batch_size, max_batch_tokens):
+        print(f"INFO: Requesting embeddings for {len(batch)} texts.")
+        batch_texts = [missing_texts[i] for i in batch]
+        batch_embeddings = _embed_batch(batch_texts, model)
+        for i, embedding in zip(batch, batch_embeddings):
+            embeddings[missing[i]] = embedding
+        cache.put_many(model, [(text, emb) for text, emb in zip(batch_texts, batch_embeddings) if emb is not None])
+    return embeddings
 
 
 def get_deepseek_embedding(text, model=config.EMBEDDING_MODEL):
-    """Gets embeddings."""
+    """Gets the embedding for a single text."""
     print(f"INFO: Attempting to get embedding for text snippet: '{text[:50]}...'")
+    embedding = get_deepseek_embeddings([text], model=model)[0]
+    if embedding is None:
+        print("Warning: No embedding returned for text.")
+    return embedding
 
-    try:
-        response = litellm.embedding(
-            api_base=embedding_client["api_base"],
-            model=model,
-            input=[text],
+
+# --- Core Functions ---
+
+
+def _find_rss_image(entry):
+    """Returns the first image URL advertised by a feed entry (enclosures, media content or image tag)."""
+    # Check enclosures
+    if "enclosures" in entry:
+        for enc in entry.enclosures:
+            if enc.get("type", "").startswith("image/"):
+                return enc.get("href")  # Take the first image enclosure
+    # Check media_content if no enclosure image found
+    if "media_content" in entry:
+        for media in entry.media_content:
+            if media.get("medium") == "image" and media.get("url"):
+                return media.get("url")  # Take the first media image
+            elif media.get("type", "").startswith("image/") and media.get("url"):
+                return media.get("url")
+    # Check simple image tag (less common)
+    if "image" in entry and isinstance(entry.image, dict) and entry.image.get("url"):
+        return entry.image.get("url")
+    return None
+
+
+def _fetch_feed(feed_url, feed_state, throttle):
+    """
+    Downloads and parses one RSS feed, honouring the per-host limits. Runs in a worker thread.
+
+    The ETag/Last-Modified validators from the previous fetch are sent along, so an
+    unchanged feed comes back as a bodiless 304 response.
+    """
+    feed_state = feed_state or {}
+    with throttle.slot(feed_url):
+        return feedparser.parse(feed_url, etag=feed_state.get("etag"), modified=feed_state.get("modified"))
+
+
+def _feed_validator(feed, key):
+    """Returns the 'etag' or 'modified' validator of a parsed feed, if the server sent one."""
+    value = feed.get(key)
+    return value if isinstance(value, str) else None
+
+
+def _feed_candidates(feed, feed_url):
+    """Turns the entries of a parsed feed into candidate article dicts."""
+    feed_source = feed.feed.get("title", feed_url)
+    candidates = []
+    for entry in feed.entries:
+        url = entry.get("link")
+        if not url:
+            continue
+        published_parsed = entry.get("published_parsed")
+        candidates.append(
+            {
+                "guid": entry.get("id") or url,
+                "url": url,
+                "title": entry.get("title", "No Title"),
+                "published_date": datetime(*published_parsed[:6]) if published_parsed else datetime.now(),
+                "feed_source": feed_source,
+                "rss_image_url": _find_rss_image(entry),
+            }
         )
-        # Access the embedding vector based on the actual API response structure
-        if response["data"] and len(response["data"]) > 0:
-            return response["data"][0]["embedding"]
-        else:
-            print("Warning: No embedding returned for text.")
-            return None
-    except Exception as e:
-        print(f"Error calling Embedding API: {e}")
-        return None
+    return candidates
 
 
-# --- Core Functions ---
+def _fetch_candidate(candidate, throttle):
+    """Fetches article content and OG image for a candidate, honouring the per-host limits. Runs in a worker thread."""
+    with throttle.slot(candidate["url"]):
+        return fetch_article_content_and_og_image(candidate["url"])
+
+
+def scrape_articles(feed_profile, rss_feeds, max_workers=None, on_article=None):
+    """
+    Scrapes articles for a specific feed profile.
 
+    Feeds and article pages are downloaded concurrently by a pool of `max_workers` threads
+    (default: config.SCRAPE_MAX_WORKERS), with politeness limits applied per host instead of
+    a global sleep. Database writes happen on the calling thread, which also calls
+    `on_article(article)` with the id, url, title and raw_content of each stored article.
 
-def scrape_articles(feed_profile, rss_feeds):  # Added params
-    """Scrapes articles for a specific feed profile."""
+    Each feed is fetched with the ETag/Last-Modified validators stored from its previous
+    fetch; unchanged feeds (HTTP 304) are skipped entirely and entries already stored on
+    an earlier run are skipped without a database lookup.
+    """
     print(f"\n--- Starting Article Scraping [{feed_profile}] ---")
     new_articles_count = 0
     if not rss_feeds:
         print(f"Warning: No RSS_FEEDS defined for profile '{feed_profile}'. Skipping scrape.")
         return
 
-    for feed_url in rss_feeds:
-        print(f"Fetching feed: {feed_url}")
-        feed = feedparser.parse(feed_url)
-
-        if feed.bozo:
-            print(f"Warning: Potential issue parsing feed {feed_url}: {feed.bozo_exception}")
-
-        for entry in feed.entries:
-            url = entry.get("link")
-            title = entry.get("title", "No Title")
-            published_parsed = entry.get("published_parsed")
-            published_date = datetime(*published_parsed[:6]) if published_parsed else datetime.now()
-            feed_source = feed.feed.get("title", feed_url)
-
-            if not url:
+    max_workers = max_workers or config.SCRAPE_MAX_WORKERS
+    # Shared by every profile scraped in this process (--feeds / --all-feeds)
+    throttle = get_host_throttle(config.SCRAPE_PER_HOST_CONCURRENCY, config.SCRAPE_PER_HOST_DELAY)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape") as executor:
+        # --- 1. Fetch all feeds concurrently (conditional GET) ---
+        feed_states = database.get_feed_states(list(rss_feeds))
+        feed_futures = {}
+        for feed_url in rss_feeds:
+            print(f"Fetching feed: {feed_url}")
+            feed_futures[executor.submit(_fetch_feed, feed_url, feed_states.get(feed_url), throttle)] = feed_url
+
+        seen_urls = set()
+        fetched_feeds = {}  # feed_url -> (etag, modified, guids of entries already stored)
+        article_futures = {}
+        for future in as_completed(feed_futures):
+            feed_url = feed_futures[future]
+            try:
+                feed = future.result()
+            except Exception as e:
+                print(f"Error fetching feed {feed_url}: {e}")
                 continue
 
-            # --- Check if article exists ---
-            with get_session() as session:
-                exists = session.exec(select(Article).where(Article.url == url)).first()
-            if exists:
+            if getattr(feed, "status", None) == 304:
+                print(f"  Feed not modified since last fetch: {feed_url}")
                 continue
+
+            if feed.bozo:
+                print(f"Warning: Potential issue parsing feed {feed_url}: {feed.bozo_exception}")
+
+            seen_guids = feed_states.get(feed_url, {}).get("seen_guids", set())
+            stored_guids = set()
+            fetched_feeds[feed_url] = (_feed_validator(feed, "etag"), _feed_validator(feed, "modified"), stored_guids)
+
+            candidates = []
+            for candidate in _feed_candidates(feed, feed_url):
+                if candidate["guid"] in seen_guids:
+                    stored_guids.add(candidate["guid"])
+                    continue  # Already stored on a previous run
+                if candidate["url"] in seen_urls:
+                    continue  # Same story listed by more than one feed
+                seen_urls.add(candidate["url"])
+                candidate["stored_guids"] = stored_guids
+                candidates.append(candidate)
+
+            # --- Check which articles exist, one bulk lookup per feed ---
+            existing_urls = database.get_existing_article_urls([c["url"] for c in candidates])
+            new_candidates = []
+            for candidate in candidates:
+                if candidate["url"] in existing_urls:
+                    stored_guids.add(candidate["guid"])
+                else:
+                    new_candidates.append(candidate)
             # --- End Check ---
 
+            # --- 2. Start fetching article content & OG image right away ---
+            if new_candidates:
+                print(f"  {len(new_candidates)} new entries in {feed_url}.")
+            for candidate in new_candidates:
+                article_futures[executor.submit(_fetch_candidate, candidate, throttle)] = candidate
+
+        print(f"Fetching content for {len(article_futures)} new articles with {max_workers} workers...")
+        for future in as_completed(article_futures):
+            candidate = article_futures[future]
+            url, title = candidate["url"], candidate["title"]
             print(f"Processing new entry: {title} ({url})")
+            try:
+                fetch_result = future.result()
+            except Exception as e:
+                print(f"  Error fetching article {url}: {e}")
+                continue
 
-            # --- 1. Try getting image from RSS feed ---
-            rss_image_url = None
-            # Check enclosures
-            if "enclosures" in entry:
-                for enc in entry.enclosures:
-                    if enc.get("type", "").startswith("image/"):
-                        rss_image_url = enc.get("href")
-                        break  # Take the first image enclosure
-            # Check media_content if no enclosure image found
-            if not rss_image_url and "media_content" in entry:
-                for media in entry.media_content:
-                    if media.get("medium") == "image" and media.get("url"):
-                        rss_image_url = media.get("url")
-                        break  # Take the first media image
-                    elif media.get("type", "").startswith("image/") and media.get("url"):
-                        rss_image_url = media.get("url")
-                        break
-            # Check simple image tag (less common)
-            if not rss_image_url and "image" in entry and isinstance(entry.image, dict) and entry.image.get("url"):
-                rss_image_url = entry.image.get("url")
-
-            if rss_image_url:
-                print(f"  Found image in RSS: {rss_image_url[:60]}...")
-            # --- End RSS Image Check ---
-
-            # --- 2. Fetch Article Content & OG Image ---
-            print("  Fetching article content and OG image...")
-            fetch_result = fetch_article_content_and_og_image(url)
             raw_content = fetch_result["content"]
             og_image_url = fetch_result["og_image"]
-            # --- End Fetch ---
 
             if not raw_content:
                 print(f"  Skipping article, failed to extract main content: {title}")
                 continue
 
             # --- 3. Determine Final Image URL and Save ---
+            rss_image_url = candidate["rss_image_url"]
             final_image_url = rss_image_url if rss_image_url else og_image_url
             if final_image_url:
                 print(f"  Using image URL: {final_image_url[:60]}...")
@@ -173,20 +440,220 @@ def scrape_articles(feed_profile, rss_feeds):  # Added params
                 print("  No image found in RSS or OG tags.")
 
             article_id = database.add_article(
-                url, title, published_date, feed_source, raw_content, feed_profile, final_image_url
+                url,
+                title,
+                candidate["published_date"],
+                candidate["feed_source"],
+                raw_content,
+                feed_profile,
+                final_image_url,
             )
             if article_id:
                 new_articles_count += 1
-            time.sleep(0.5)  # Be polite
+                candidate["stored_guids"].add(candidate["guid"])
+                if on_article:
+                    on_article({"id": article_id, "url": url, "title": title, "raw_content": raw_content})
+
+    # --- 4. Remember validators and stored entries for the next conditional GET ---
+    # Entries that failed extraction are left out, so they are retried next time.
+    for feed_url, (etag, modified, stored_guids) in fetched_feeds.items():
+        database.update_feed_state(feed_url, etag, modified, stored_guids)
+
+    html_cache = get_html_cache()
+    if html_cache:
+        stats = html_cache.evict()
+        print(
+            f"HTML cache: {stats['bytes'] / 1024**2:.1f} MiB stored, "
+            f"evicted {stats['urls_removed']} pages ({stats['objects_removed']} bodies)."
+        )
 
     print(f"--- Scraping Finished [{feed_profile}]. Added {new_articles_count} new articles. ---")
 
 
-def process_articles(feed_profile, effective_config, limit=1000):
-    """Processes unprocessed articles: summarizes and generates embeddings."""
-    print("\n--- Starting Article Processing ---")
+def reextract_articles(feed_profile):
+    """
+    Rebuilds raw_content for a feed profile's articles from the HTML cache.
+
+    No network requests are made: articles whose page is not cached are left untouched.
+    """
+    print(f"\n--- Starting Content Re-extraction [{feed_profile}] ---")
+    html_cache = get_html_cache()
+    if html_cache is None:
+        print("Skipping re-extraction: HTML_CACHE_DIR is not configured.")
+        return
+
+    articles = database.get_article_urls(feed_profile)
+    updated_count = 0
+    missing_count = 0
+    for article in articles:
+        html_content = html_cache.get(article["url"])
+        if html_content is None:
+            missing_count += 1
+            continue
+
+        try:
+            result = extract_article_from_html(html_content, article["url"])
+        except Exception as e:
+            print(f"  Error re-extracting article {article['id']}: {e}")
+            continue
+
+        if result.content:
+            database.update_article_raw_content(article["id"], result.content)
+            updated_count += 1
+
+    print(
+        f"--- Re-extraction Finished [{feed_profile}]. Updated {updated_count} of {len(articles)} articles "
+        f"({missing_count} not cached). ---"
+    )
+
+
+def _dedup_index(feed_profile, effective_config):
+    """Returns a MinHasher and an LSH index of the signatures stored within DEDUP_WINDOW_DAYS."""
+    threshold = getattr(effective_config, "DEDUP_THRESHOLD", config.DEDUP_THRESHOLD)
+    num_perm = getattr(effective_config, "DEDUP_NUM_PERM", config.DEDUP_NUM_PERM)
+    bands = getattr(effective_config, "DEDUP_BANDS", config.DEDUP_BANDS)
+    window_days = getattr(effective_config, "DEDUP_WINDOW_DAYS", config.DEDUP_WINDOW_DAYS)
+
+    hasher = MinHasher(num_perm=num_perm)
+    index = MinHashLSH(threshold=threshold, num_perm=num_perm, bands=bands)
+    since = datetime.now() - timedelta(days=window_days)
+    for article_id, minhash in database.get_minhash_signatures(feed_profile, since):
+        signature = unpack_signature(minhash)
+        if signature is not None and len(signature) == num_perm:
+            index.insert(article_id, signature)
+    return hasher, index
+
+
+def deduplicate_articles(feed_profile, effective_config, limit=1000):
+    """
+    Links near-duplicate articles (same text under another URL) to the earliest copy, so they
+    skip summarization, rating and clustering. See dedup.py.
+    """
+    print("\n--- Starting Near-Duplicate Detection ---")
+
+    articles = database.get_articles_to_deduplicate(feed_profile, limit)
+    if not articles:
+        print("No new articles to check for duplicates.")
+        return
+
+    hasher, index = _dedup_index(feed_profile, effective_config)
+    results = find_duplicates(articles, index, hasher)
+    database.save_dedup_results(results)
+
+    duplicates = [r for r in results if r["duplicate_of"] is not None]
+    for result in duplicates:
+        print(
+            f"  Article {result['id']} duplicates article {result['duplicate_of']} "
+            f"({result['similarity']:.0%} similar)"
+        )
+    print(f"--- Duplicate Detection Finished. {len(duplicates)} of {len(results)} articles are near-duplicates. ---")
+
+
+def _summarize_article(article, summary_prompt_template, chat_model):
+    """Summarizes an article. Runs in a worker thread."""
+    # Format the potentially profile-specific summary prompt
+    summary_prompt = summary_prompt_template.format(
+        article_content=article["raw_content"][:4000]  # Limit context
+    )
+    return call_deepseek_chat(summary_prompt, model=chat_model)
+
+
+class ArticleAnalysis(BaseModel):
+    """Schema of the JSON answer to PROMPT_ARTICLE_COMBINED."""
+
+    summary: str = Field(min_length=1)
+    impact_score: int = Field(ge=1, le=10)
+    topics: list[str] = Field(default_factory=list)
+
+    def summary_with_topics(self):
+        """The text stored as `processed_content`: the summary followed by its topic tags."""
+        topics = [topic.strip() for topic in self.topics if topic.strip()]
+        if not topics:
+            return self.summary.strip()
+        return f"{self.summary.strip()}\n\nTopics: {', '.join(topics)}"
+
+
+def _parse_article_analysis(response, article_id):
+    """Validates a combined summary/rating answer; returns an ArticleAnalysis or None."""
+    if not response:
+        print(f"  Warning: No combined analysis received for article {article_id}.")
+        return None
+    try:
+        return ArticleAnalysis.model_validate_json(_strip_code_fence(response))
+    except ValidationError as e:
+        print(f"  Warning: Invalid combined analysis for article {article_id}: {e.errors()[0]['msg']}")
+        return None
+
+
+def _strip_code_fence(response):
+    # Some models wrap JSON in a Markdown code fence despite JSON mode
+    return re.sub(r"^```(?:json)?\s*|\s*```$", "", response.strip())
+
+
+def _is_article_analysis(response):
+    """Whether a combined answer validates; invalid ones are not cached."""
+    try:
+        ArticleAnalysis.model_validate_json(_strip_code_fence(response))
+    except ValidationError:
+        return False
+    return True
+
+
+def _analyze_article(article, combined_prompt_template, summary_prompt_template, chat_model):
+    """
+    Summarizes and rates an article with one JSON completion. Runs in a worker thread.
+
+    Returns:
+        tuple: (summary, impact_score). When the answer fails validation the article is
+        summarized with the plain summary prompt instead and impact_score is None, leaving
+        the rating to rate_articles.
+    """
+    prompt = combined_prompt_template.format(article_content=article["raw_content"][:4000])
+    response = call_deepseek_chat(
+        prompt, model=chat_model, response_format={"type": "json_object"}, validate=_is_article_analysis
+    )
+    analysis = _parse_article_analysis(response, article["id"])
+    if analysis is None:
+        return _summarize_article(article, summary_prompt_template, chat_model), None
+    return analysis.summary_with_topics(), analysis.impact_score
+
+
+def _article_summarizer(effective_config):
+    """
+    Returns `summarize(article) -> (summary, impact_score)` for the profile: one combined
+    JSON request when COMBINED_PROCESSING is on, else the summary prompt alone (score None).
+    """
     chat_model = getattr(effective_config, "LLM_CHAT_MODEL", "deepseek/deepseek-chat")
     summary_prompt_template = getattr(effective_config, "PROMPT_ARTICLE_SUMMARY", config.PROMPT_ARTICLE_SUMMARY)
+    if getattr(effective_config, "COMBINED_PROCESSING", config.COMBINED_PROCESSING):
+        combined_prompt_template = getattr(
+            effective_config, "PROMPT_ARTICLE_COMBINED", config.PROMPT_ARTICLE_COMBINED
+        )
+        return lambda article: _analyze_article(article, combined_prompt_template, summary_prompt_template, chat_model)
+    return lambda article: (_summarize_article(article, summary_prompt_template, chat_model), None)
+
+
+def process_articles(feed_profile, effective_config, limit=1000):
+    """
+    Processes unprocessed articles: summarizes and generates embeddings.
+
+    Up to LLM_MAX_CONCURRENCY articles are summarized at once; the pace of requests is
+    governed by the per-model rate limits instead of a fixed sleep. Summaries are embedded
+    in batches of EMBEDDING_BATCH_SIZE as they complete.
+
+    With COMBINED_PROCESSING, the same request also rates the article, and the impact score
+    is stored right away so rate_articles has nothing left to do for it.
+
+    Results are written DB_WRITE_BATCH_SIZE articles at a time, one transaction per batch.
+    """
+    print("\n--- Starting Article Processing ---")
+    summarize = _article_summarizer(effective_config)
+    max_workers = getattr(effective_config, "LLM_MAX_CONCURRENCY", config.LLM_MAX_CONCURRENCY)
+    batch_size = getattr(effective_config, "EMBEDDING_BATCH_SIZE", config.EMBEDDING_BATCH_SIZE)
+    write_batch_size = getattr(effective_config, "DB_WRITE_BATCH_SIZE", config.DB_WRITE_BATCH_SIZE)
+
+    if getattr(effective_config, "DEDUP_ENABLED", config.DEDUP_ENABLED):
+        deduplicate_articles(feed_profile, effective_config, limit)
 
     unprocessed = database.get_unprocessed_articles(feed_profile, limit)
     processed_count = 0
@@ -194,42 +661,123 @@ def process_articles(feed_profile, effective_config, limit=1000):
         print("No new articles to process.")
         return
 
-    print(f"Found {len(unprocessed)} articles to process (Limit: {limit}).")
-    for article in unprocessed:
-        print(f"Processing article ID: {article['id']} - {article['url'][:50]}...")
+    print(f"Found {len(unprocessed)} articles to process (Limit: {limit}, concurrency: {max_workers}).")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="process") as executor:
+        summary_futures = {executor.submit(summarize, article): article for article in unprocessed}
+        embedding_futures = {}  # future -> [(article, summary, impact_score), ...]
+        pending = []
 
-        # 1. Summarize using Deepseek Chat
-        # Format the potentially profile-specific summary prompt
-        summary_prompt = summary_prompt_template.format(
-            article_content=article["raw_content"][:4000]  # Limit context
-        )
-        summary = call_deepseek_chat(summary_prompt, model=chat_model)
+        def submit_embeddings():
+            # Use summaries for embedding to focus on core topics and save tokens/time
+            future = executor.submit(
+                get_deepseek_embeddings, [summary for _, summary, _ in pending], batch_size=batch_size
+            )
+            embedding_futures[future] = list(pending)
+            pending.clear()
 
-        if not summary:
-            print(f"Skipping article {article['id']} due to summarization error.")
-            continue
+        for future in as_completed(summary_futures):
+            article = summary_futures[future]
+            print(f"Processing article ID: {article['id']} - {article['url'][:50]}...")
+            try:
+                summary, impact_score = future.result()
+            except Exception as e:
+                print(f"Skipping article {article['id']} due to error: {e}")
+                continue
+
+            if not summary:
+                print(f"Skipping article {article['id']} due to summarization error.")
+                continue
 
-        print(f"Article summary is: {summary}")
+            print(f"Article summary is: {summary}")
+            pending.append((article, summary, impact_score))
+            if len(pending) >= batch_size:
+                submit_embeddings()
+        if pending:
+            submit_embeddings()
+
+        processed_writes = []  # (article_id, summary, embedding)
+        rating_writes = []  # (article_id, impact_score)
+
+        def flush_writes():
+            # Update Database (on this thread)
+            database.update_articles_processing(processed_writes)
+            database.update_article_ratings(rating_writes)
+            processed_writes.clear()
+            rating_writes.clear()
+
+        for future in as_completed(embedding_futures):
+            batch = embedding_futures[future]
+            try:
+                embeddings = future.result()
+            except Exception as e:
+                print(f"Skipping {len(batch)} articles due to embedding error: {e}")
+                continue
 
-        # 2. Generate Embedding using Deepseek (or alternative)
-        # Use summary for embedding to focus on core topics and save tokens/time
-        embedding = get_deepseek_embedding(summary)
+            for (article, summary, impact_score), embedding in zip(batch, embeddings):
+                if not embedding:
+                    print(f"Skipping article {article['id']} due to embedding error.")
+                    continue  # Or store article without embedding if desired
+
+                processed_writes.append((article["id"], summary, embedding))
+                if impact_score is not None:
+                    print(f"  Article ID {article['id']} rated as: {impact_score}")
+                    rating_writes.append((article["id"], impact_score))
+                processed_count += 1
+                print(f"Successfully processed article ID: {article['id']}")
+            if len(processed_writes) >= write_batch_size:
+                flush_writes()
+        flush_writes()
+
+    cache_stats = get_embedding_cache().stats()
+    print(f"Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses.")
+    print(f"--- Processing Finished. Processed {processed_count} articles. ---")
 
-        if not embedding:
-            print(f"Skipping article {article['id']} due to embedding error.")
-            continue  # Or store article without embedding if desired
 
-        # 3. Update Database
-        database.update_article_processing(article["id"], summary, embedding)
-        processed_count += 1
-        print(f"Successfully processed article ID: {article['id']}")
-        time.sleep(1)  # Avoid hitting API rate limits
+_IMPACT_SCORE_PATTERN = re.compile(r"\b([1-9]|10)\b")
 
-    print(f"--- Processing Finished. Processed {processed_count} articles. ---")
+
+def _parse_impact_score(rating_response, article_id):
+    """Extracts the 1-10 impact score from a rating response, or None."""
+    if not rating_response:
+        print(f"  Warning: No rating response received for article {article_id}.")
+        return None
+    try:
+        # Extract first integer (1-10) from response using regex
+        # This handles multi-line responses and text around the number
+        match = _IMPACT_SCORE_PATTERN.search(rating_response.strip())
+        if match:
+            score = int(match.group(1))
+            if 1 <= score <= 10:
+                return score
+            print(f"  Warning: Rating response '{rating_response}' for article {article_id} is out of range (1-10).")
+        else:
+            print(
+                f"  Warning: Could not find valid rating (1-10) in response '{rating_response}' "
+                f"for article {article_id}."
+            )
+    except (ValueError, AttributeError) as e:
+        print(
+            f"  Warning: Could not parse integer rating from response '{rating_response}' for article {article_id}: {e}"
+        )
+    return None
+
+
+def _rate_article(article, rating_prompt_template, chat_model):
+    """Asks the LLM for an article's impact score. Runs in a worker thread."""
+    # Format the potentially profile-specific rating prompt
+    rating_prompt = rating_prompt_template.format(summary=article["processed_content"])
+    # Answers without a score are not cached, so failed ratings are retried next run
+    rating_response = call_deepseek_chat(
+        rating_prompt, model=chat_model, validate=lambda answer: _IMPACT_SCORE_PATTERN.search(answer) is not None
+    )
+    return _parse_impact_score(rating_response, article["id"])
 
 
 def rate_articles(feed_profile, effective_config, limit=1000):
-    """Rates the impact of processed articles using an LLM."""
+    """
+    Rates the impact of processed articles using an LLM, LLM_MAX_CONCURRENCY articles at a time.
+    Scores are written DB_WRITE_BATCH_SIZE articles at a time.
+    """
     print("\n--- Starting Article Impact Rating ---")
     if not client:
         print("Skipping rating: Deepseek client not initialized.")
@@ -237,6 +785,8 @@ def rate_articles(feed_profile, effective_config, limit=1000):
 
     chat_model = getattr(effective_config, "LLM_CHAT_MODEL", "deepseek/deepseek-chat")
     rating_prompt_template = getattr(effective_config, "PROMPT_IMPACT_RATING", config.PROMPT_IMPACT_RATING)
+    max_workers = getattr(effective_config, "LLM_MAX_CONCURRENCY", config.LLM_MAX_CONCURRENCY)
+    write_batch_size = getattr(effective_config, "DB_WRITE_BATCH_SIZE", config.DB_WRITE_BATCH_SIZE)
 
     unrated = database.get_unrated_articles(feed_profile, limit)
     rated_count = 0
@@ -244,118 +794,154 @@ def rate_articles(feed_profile, effective_config, limit=1000):
         print("No new articles to rate.")
         return
 
-    print(f"Found {len(unrated)} processed articles to rate (Limit: {limit}).")
-    for article in unrated:
-        print(f"Rating article ID: {article['id']}: {article['title']}...")
-        summary = article["processed_content"]
-        if not summary:
-            print(f"  Skipping article {article['id']} - no summary found.")
-            continue
-
-        # Format the potentially profile-specific rating prompt
-        rating_prompt = rating_prompt_template.format(summary=summary)
-        rating_response = call_deepseek_chat(rating_prompt, model=chat_model)
+    print(f"Found {len(unrated)} processed articles to rate (Limit: {limit}, concurrency: {max_workers}).")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rate") as executor:
+        futures = {}
+        for article in unrated:
+            if not article["processed_content"]:
+                print(f"  Skipping article {article['id']} - no summary found.")
+                continue
+            futures[executor.submit(_rate_article, article, rating_prompt_template, chat_model)] = article
 
-        impact_score = None
-        if rating_response:
+        rating_writes = []  # (article_id, impact_score)
+        for future in as_completed(futures):
+            article = futures[future]
+            print(f"Rating article ID: {article['id']}: {article['title']}...")
             try:
-                # Extract first integer (1-10) from response using regex
-                # This handles multi-line responses and text around the number
-                match = re.search(r"\b([1-9]|10)\b", rating_response.strip())
-                if match:
-                    score = int(match.group(1))
-                    if 1 <= score <= 10:
-                        impact_score = score
-                        print(f"  Article ID {article['id']} rated as: {impact_score}")
-                    else:
-                        print(
-                            f"  Warning: Rating response '{rating_response}' for article {article['id']} "
-                            "is out of range (1-10)."
-                        )
-                else:
-                    print(
-                        f"  Warning: Could not find valid rating (1-10) in response '{rating_response}' "
-                        f"for article {article['id']}."
-                    )
-            except (ValueError, AttributeError) as e:
-                print(
-                    f"  Warning: Could not parse integer rating from response '{rating_response}' "
-                    f"for article {article['id']}: {e}"
-                )
-        else:
-            print(f"  Warning: No rating response received for article {article['id']}.")
-
-        # Update database even if rating failed (impact_score will be None, prevents re-attempting failed ones
-        # immediately)
-        # Or only update if impact_score is not None:
-        if impact_score is not None:
-            database.update_article_rating(article["id"], impact_score)
-            rated_count += 1
-        # else: # Decide if you want to mark failed attempts differently
-        # database.update_article_rating(article['id'], -1) # Example: Mark as failed with -1? Or leave NULL?
-        # Leaving NULL for now.
+                impact_score = future.result()
+            except Exception as e:
+                print(f"  Warning: Rating failed for article {article['id']}: {e}")
+                continue
 
-        time.sleep(1)  # API rate limiting
+            # Only update if impact_score is not None: failed ratings stay NULL and are retried next run
+            if impact_score is not None:
+                print(f"  Article ID {article['id']} rated as: {impact_score}")
+                rating_writes.append((article["id"], impact_score))
+                rated_count += 1
+                if len(rating_writes) >= write_batch_size:
+                    database.update_article_ratings(rating_writes)
+                    rating_writes.clear()
+        database.update_article_ratings(rating_writes)
 
     print(f"--- Rating Finished. Rated {rated_count} articles. ---")
 
 
+def update_story_clusters(feed_profile, effective_config):
+    """
+    Assigns processed articles that have no cluster yet to the profile's persistent story
+    clusters (opening new ones as needed) and stores the updated centroids and cluster_ids.
+    """
+    threshold = getattr(
+        effective_config, "STORY_CLUSTER_SIMILARITY_THRESHOLD", config.STORY_CLUSTER_SIMILARITY_THRESHOLD
+    )
+    max_age_hours = getattr(effective_config, "STORY_CLUSTER_MAX_AGE_HOURS", config.STORY_CLUSTER_MAX_AGE_HOURS)
+
+    new_ids, _, new_matrix = database.get_embedding_matrix_for_briefing(
+        config.BRIEFING_ARTICLE_LOOKBACK_HOURS, feed_profile, unclustered_only=True
+    )
+    if not new_ids:
+        print("No new articles to assign to story clusters.")
+        return
+
+    active_since = datetime.now() - timedelta(hours=max_age_hours)
+    # Stories embedded with a different model (dimension) can't be extended
+    clusters = [
+        c
+        for c in database.get_story_clusters(feed_profile, active_since)
+        if c["centroid"].shape[0] == new_matrix.shape[1]
+    ]
+    labels, centroids, sizes = assign_story_clusters(
+        new_matrix, [c["centroid"] for c in clusters], [c["size"] for c in clusters], threshold
+    )
+
+    touched = sorted(set(labels.tolist()))
+    updated = [
+        {"id": clusters[i]["id"] if i < len(clusters) else None, "centroid": centroids[i], "size": sizes[i]}
+        for i in touched
+    ]
+    position = {label: index for index, label in enumerate(touched)}
+    database.save_story_clusters(
+        feed_profile, updated, {article_id: position[label] for article_id, label in zip(new_ids, labels.tolist())}
+    )
+    opened = sum(1 for i in touched if i >= len(clusters))
+    print(
+        f"Assigned {len(new_ids)} new articles to story clusters "
+        f"({len(touched) - opened} existing stories extended, {opened} new)."
+    )
+
+
+def _largest_cluster_labels(labels, n_clusters):
+    """
+    Relabels all but the `n_clusters` largest clusters as noise, so a brief makes at most
+    `n_clusters` analysis calls whatever the backend (hdbscan and agglomerative ignore the count).
+    """
+    sizes = {}
+    for label in labels.tolist():
+        if label != NOISE_LABEL:
+            sizes[label] = sizes.get(label, 0) + 1
+    largest = sorted(sizes, key=lambda c: (-sizes[c], c))[:n_clusters]
+    if len(sizes) > n_clusters:
+        print(f"Briefing the {len(largest)} largest of {len(sizes)} clusters.")
+    return np.where(np.isin(labels, largest), labels, NOISE_LABEL)
+
+
+def _story_cluster_labels(article_ids, n_clusters):
+    """Labels articles with their story cluster, keeping only the `n_clusters` largest stories in the window."""
+    cluster_ids = database.get_article_cluster_ids(article_ids)
+    return _largest_cluster_labels(np.array([cluster_ids.get(a, NOISE_LABEL) for a in article_ids]), n_clusters)
+
+
 def generate_brief(feed_profile, effective_config):
     """Generates the briefing for a specific feed profile."""
     print(f"\n--- Starting Brief Generation [{feed_profile}] ---")
     chat_model = getattr(effective_config, "LLM_CHAT_MODEL", "deepseek/deepseek-chat")
 
-    # Get articles *for this specific profile*
-    articles = database.get_articles_for_briefing(config.BRIEFING_ARTICLE_LOOKBACK_HOURS, feed_profile)
-
-    if not articles or len(articles) < config.MIN_ARTICLES_FOR_BRIEFING:
-        print(
-            f"Not enough recent articles ({len(articles)}) for profile '{feed_profile}'. "
-            f"Min required: {config.MIN_ARTICLES_FOR_BRIEFING}."
+    incremental = getattr(effective_config, "INCREMENTAL_CLUSTERING", config.INCREMENTAL_CLUSTERING)
+    if incremental:
+        # Stories are stored; only update_story_clusters reads vectors, and only the new ones
+        article_ids, summaries = database.get_summaries_for_briefing(
+            config.BRIEFING_ARTICLE_LOOKBACK_HOURS, feed_profile
+        )
+    else:
+        # Get ids, summaries and the embedding matrix *for this specific profile*
+        article_ids, summaries, embedding_matrix = database.get_embedding_matrix_for_briefing(
+            config.BRIEFING_ARTICLE_LOOKBACK_HOURS, feed_profile
         )
-        return
-
-    print(f"Generating brief from {len(articles)} articles.")
-
-    # Prepare data for clustering
-    article_ids = [a["id"] for a in articles]
-    summaries = [a["processed_content"] for a in articles]
-    embeddings = [json.loads(a["embedding"]) for a in articles if a["embedding"]]  # Load JSON string
-
-    if len(embeddings) != len(articles):
-        print("Warning: Some articles selected for briefing are missing embeddings. Proceeding with available ones.")
-        # Filter articles, summaries, ids to match embeddings
-        valid_indices = [i for i, a in enumerate(articles) if a["embedding"]]
-        articles = [articles[i] for i in valid_indices]
-        article_ids = [article_ids[i] for i in valid_indices]
-        summaries = [summaries[i] for i in valid_indices]
-        # embeddings are already filtered
 
-    if len(embeddings) < config.MIN_ARTICLES_FOR_BRIEFING:
+    if len(article_ids) < config.MIN_ARTICLES_FOR_BRIEFING:
         print(
-            f"Not enough articles ({len(embeddings)}) with embeddings to cluster. "
+            f"Not enough recent articles with embeddings ({len(article_ids)}) for profile '{feed_profile}'. "
             f"Min required: {config.MIN_ARTICLES_FOR_BRIEFING}."
         )
         return
 
-    embedding_matrix = np.array(embeddings)
+    print(f"Generating brief from {len(article_ids)} articles.")
 
-    # Clustering (using KMeans as an example)
-    n_clusters = min(config.N_CLUSTERS, len(embedding_matrix) // 2)  # Ensure clusters < samples/2
+    # Clustering (backend selectable per profile, see clustering.py)
+    n_clusters = min(getattr(effective_config, "N_CLUSTERS", config.N_CLUSTERS), len(article_ids) // 2)
     if n_clusters < 2:  # Need at least 2 clusters for KMeans typically
         print("Not enough articles to form meaningful clusters. Skipping clustering.")
         # Alternative: Treat all articles as one cluster or generate simple list summary
         # For now, we'll just exit brief generation
         return
 
-    print(f"Clustering {len(embedding_matrix)} articles into {n_clusters} clusters...")
-    try:
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)  # n_init='auto' in newer sklearn
-        kmeans.fit(embedding_matrix)
-        labels = kmeans.labels_
-    except Exception as e:
-        print(f"Error during clustering: {e}")
-        return
+    if incremental:
+        try:
+            update_story_clusters(feed_profile, effective_config)
+        except Exception as e:
+            print(f"Error during incremental clustering: {e}")
+            return
+        labels = _story_cluster_labels(article_ids, n_clusters)
+    else:
+        algorithm = getattr(effective_config, "CLUSTERING_ALGORITHM", config.CLUSTERING_ALGORITHM)
+        options = getattr(effective_config, "CLUSTERING_OPTIONS", config.CLUSTERING_OPTIONS)
+        print(f"Clustering {len(embedding_matrix)} articles into {n_clusters} clusters ({algorithm})...")
+        try:
+            labels = cluster_embeddings(embedding_matrix, n_clusters, algorithm, **options)
+        except Exception as e:
+            print(f"Error during clustering: {e}")
+            return
+        labels = _largest_cluster_labels(labels, n_clusters)
 
     # Analyze each cluster
     cluster_analyses = []
@@ -369,10 +955,10 @@ def generate_brief(feed_profile, effective_config):
     )
     print(f"DEBUG: Using Cluster Analysis Prompt Template:\n'''{cluster_analysis_prompt_template[:100]}...'''")  # Debug
 
-    for i in range(n_clusters):  # Use the actual n_clusters determined
+    cluster_labels = sorted(set(labels.tolist()) - {NOISE_LABEL})  # Noise (unclustered) articles are left out
+
+    def analyze_cluster(i):
         cluster_indices = np.where(labels == i)[0]
-        if len(cluster_indices) == 0:
-            continue  # Skip empty clusters
 
         cluster_summaries = [summaries[idx] for idx in cluster_indices]
         print(f"  Analyzing Cluster {i} ({len(cluster_summaries)} articles)")
@@ -387,15 +973,19 @@ def generate_brief(feed_profile, effective_config):
 
         # *** Call LLM with the formatted prompt ***
         # System prompt could also be configurable
-        cluster_analysis = call_deepseek_chat(analysis_prompt, model=chat_model)
+        return call_deepseek_chat(analysis_prompt, model=chat_model), len(cluster_summaries)
 
+    # Clusters are analyzed concurrently; map() yields the results in label order, so the
+    # synthesis prompt is the same however the calls interleave.
+    max_workers = getattr(effective_config, "BRIEF_ANALYSIS_CONCURRENCY", config.BRIEF_ANALYSIS_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="analyze") as executor:
+        results = list(executor.map(analyze_cluster, cluster_labels))
+
+    for i, (cluster_analysis, size) in zip(cluster_labels, results):
         if cluster_analysis:
             # (Consider adding more robust filtering of non-analysis responses)
-            if "unrelated" not in cluster_analysis.lower() or len(cluster_summaries) > 2:
-                cluster_analyses.append(
-                    {"topic": f"Cluster {i + 1}", "analysis": cluster_analysis, "size": len(cluster_summaries)}
-                )
-        time.sleep(1)  # Rate limiting
+            if "unrelated" not in cluster_analysis.lower() or size > 2:
+                cluster_analyses.append({"topic": f"Cluster {i + 1}", "analysis": cluster_analysis, "size": size})
     # --- End Analyze each cluster ---
 
     if not cluster_analyses:
@@ -430,78 +1020,39 @@ def generate_brief(feed_profile, effective_config):
 
 
 # --- Main Execution ---
-def main():
-    parser = argparse.ArgumentParser(
-        description="Meridian Briefing Runner: Scrapes, processes, and generates briefings.",
-        formatter_class=argparse.RawTextHelpFormatter,  # Nicer help text formatting
-    )
-    parser.add_argument(
-        "--feed",
-        type=str,
-        default=config.DEFAULT_FEED_PROFILE,  # Use default from base config
-        help=f"Specify the feed profile name (e.g., brazil, tech). Default: '{config.DEFAULT_FEED_PROFILE}'.",
-    )
-    parser.add_argument(
-        "--rate-articles",
-        dest="rate",
-        action="store_true",
-        help="Run only the article impact rating stage (requires processed articles).",
-    )
-    parser.add_argument(
-        "--scrape-articles", dest="scrape", action="store_true", help="Run only the article scraping stage."
-    )
-    parser.add_argument(
-        "--process-articles",
-        dest="process",
-        action="store_true",
-        help="Run only the article processing (summarize, embed) stage.",
-    )
-    parser.add_argument(
-        "--generate-brief",
-        dest="generate",
-        action="store_true",
-        help="Run only the brief generation (cluster, analyze, synthesize) stage.",
-    )
-    parser.add_argument(
-        '--all',
-        dest='run_all',
-        action='store_true',
-        help=(
-            'Run all stages sequentially (scrape, process, generate).\n'
-            'This is the default behavior if no specific stage argument is given.'
-        ),
-    )
-    parser.add_argument(
-        '-m', '--model',
-        type=str,
-        help='Override the LLM model (e.g., "ollama:qwen3:30b").'
-    )
-    parser.add_argument(
-        '-n', '--limit',
-        type=int,
-        default=1000,
-        help='Limit the number of articles to process/rate (default: 1000).'
-    )
+class EffectiveConfig:
+    """Base config values overridden by a feed profile's module attributes."""
+
+    def __init__(self, dictionary):
+        for k, v in dictionary.items():
+            setattr(self, k, v)
+
+
+def discover_feed_profiles():
+    """Returns the names of the feed profile modules in meridiano/feeds/, sorted."""
+    feeds_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "feeds")
+    return sorted(module.name for module in pkgutil.iter_modules([feeds_dir]) if not module.name.startswith("_"))
 
-    args = parser.parse_args()
 
-    # --- Load Feed Specific Config ---
-    feed_profile_name = args.feed
-    feed_config = None
+def load_feed_config(feed_profile_name):
+    """Imports the feed profile module `feeds/<feed_profile_name>.py`, or returns None."""
     # Try importing from meridiano.feeds first (when running as module)
     try:
         feed_module_name = f".feeds.{feed_profile_name}"
-        feed_config = importlib.import_module(feed_module_name, package="meridiano")
+        return importlib.import_module(feed_module_name, package="meridiano")
     except ImportError:
         # Fallback for when running differently or if package name differs
         try:
             feed_module_name = f"feeds.{feed_profile_name}"
-            feed_config = importlib.import_module(feed_module_name)
+            return importlib.import_module(feed_module_name)
         except ImportError:
             print(f"ERROR: Could not import feed configuration for '{feed_profile_name}'.")
             print(f"Please ensure 'src/meridiano/feeds/{feed_profile_name}.py' exists.")
-            rss_feeds = None
+            return None
+
 
+def build_effective_config(feed_config, model=None):
+    """Returns the EffectiveConfig for a feed profile module (the base config alone if None)."""
     if feed_config:
         print(f"Loaded feed configuration: {feed_config.__name__}")
         # Optionally merge settings if feed configs override base config values
@@ -512,7 +1063,6 @@ def main():
     else:
         rss_feeds = None
 
-    # --- Create Effective Config ---
     # Start with base config vars
     effective_config_dict = {k: v for k, v in config.__dict__.items() if not k.startswith("__")}
     # Override with feed_config vars if they exist
@@ -521,12 +1071,6 @@ def main():
             if not k.startswith("__"):
                 effective_config_dict[k] = v
 
-    # Convert dict to a simple object for easier access (optional)
-    class EffectiveConfig:
-        def __init__(self, dictionary):
-            for k, v in dictionary.items():
-                setattr(self, k, v)
-
     effective_config = EffectiveConfig(effective_config_dict)
 
     # Ensure RSS_FEEDS is correctly set in the effective config if loaded
@@ -534,27 +1078,42 @@ def main():
         effective_config.RSS_FEEDS = rss_feeds
 
     # Handle Model Override
-    if args.model:
-        # Fix ollama format if needed (ollama:model -> ollama/model)
-        if args.model.startswith("ollama:") and "/" not in args.model:
-            args.model = args.model.replace("ollama:", "ollama/", 1)
+    if model:
+        effective_config.LLM_CHAT_MODEL = model
+        print(f"Overriding chat model to: {model}")
+    return effective_config
 
-        effective_config.LLM_CHAT_MODEL = args.model
-        print(f"Overriding chat model to: {args.model}")
+
+def run_profile(feed_profile_name, args):
+    """Runs the stages selected by the parsed command line `args` for one feed profile."""
+    effective_config = build_effective_config(load_feed_config(feed_profile_name), model=args.model)
 
     # Default to running all if no specific stage OR --all is provided
-    should_run_all = args.run_all or not (args.scrape or args.process or args.generate or args.rate)
+    should_run_all = args.run_all or not (args.scrape or args.process or args.generate or args.rate or args.reextract)
 
     print(f"\nMeridian Briefing Run [{feed_profile_name}] - {datetime.now()}")
-    print("Initializing database...")
-    database.init_db()  # Initialize DB regardless of stage run
 
     current_rss_feeds = getattr(effective_config, "RSS_FEEDS", None)
+    scrape_workers = args.scrape_workers or getattr(effective_config, "SCRAPE_MAX_WORKERS", None)
 
-    if should_run_all:
+    if args.pipeline:
+        # Imported here: the pipeline module builds on this module's stage functions
+        from meridiano.pipeline import run_pipeline
+
+        print("\n>>> Running streaming pipeline (scrape -> process -> rate) <<<")
+        asyncio.run(
+            run_pipeline(
+                feed_profile_name, current_rss_feeds, effective_config, limit=args.limit, scrape_workers=scrape_workers
+            )
+        )
+        if current_rss_feeds:
+            generate_brief(feed_profile_name, effective_config)
+        else:
+            print("Skipping generate stage: No RSS_FEEDS found for profile.")
+    elif should_run_all:
         print("\n>>> Running ALL stages <<<")
         if current_rss_feeds:
-            scrape_articles(feed_profile_name, current_rss_feeds)
+            scrape_articles(feed_profile_name, current_rss_feeds, max_workers=scrape_workers)
         else:
             print("Skipping scrape stage: No RSS_FEEDS found for profile.")
         process_articles(feed_profile_name, effective_config, limit=args.limit)
@@ -567,9 +1126,12 @@ def main():
         if args.scrape:
             if current_rss_feeds:
                 print(f"\n>>> Running ONLY Scrape Articles stage [{feed_profile_name}] <<<")
-                scrape_articles(feed_profile_name, current_rss_feeds)
+                scrape_articles(feed_profile_name, current_rss_feeds, max_workers=scrape_workers)
             else:
                 print(f"Cannot run scrape stage: No RSS_FEEDS found for profile '{feed_profile_name}'.")
+        if args.reextract:
+            print(f"\n>>> Running ONLY Re-extract Content stage [{feed_profile_name}] <<<")
+            reextract_articles(feed_profile_name)
         if args.process:
             print("\n>>> Running ONLY Process Articles stage <<<")
             process_articles(feed_profile_name, effective_config, limit=args.limit)
@@ -586,5 +1148,141 @@ def main():
     print(f"\nRun Finished [{feed_profile_name}] - {datetime.now()}")
 
 
+def main():
+    parser = argparse.ArgumentParser(
+        description="Meridian Briefing Runner: Scrapes, processes, and generates briefings.",
+        formatter_class=argparse.RawTextHelpFormatter,  # Nicer help text formatting
+    )
+    parser.add_argument(
+        "--feed",
+        type=str,
+        default=config.DEFAULT_FEED_PROFILE,  # Use default from base config
+        help=f"Specify the feed profile name (e.g., brazil, tech). Default: '{config.DEFAULT_FEED_PROFILE}'.",
+    )
+    profile_group = parser.add_mutually_exclusive_group()
+    profile_group.add_argument(
+        "--feeds",
+        type=str,
+        help=(
+            "Comma-separated feed profiles to run concurrently in this process (e.g., brasil,tech,infosec).\n"
+            f"Up to PROFILE_MAX_CONCURRENCY ({config.PROFILE_MAX_CONCURRENCY}) profiles run at once."
+        ),
+    )
+    profile_group.add_argument(
+        "--all-feeds",
+        dest="all_feeds",
+        action="store_true",
+        help="Run every profile found in meridiano/feeds/ (except ALL_FEEDS_EXCLUDE) concurrently.",
+    )
+    parser.add_argument(
+        "--rate-articles",
+        dest="rate",
+        action="store_true",
+        help="Run only the article impact rating stage (requires processed articles).",
+    )
+    parser.add_argument(
+        "--scrape-articles", dest="scrape", action="store_true", help="Run only the article scraping stage."
+    )
+    parser.add_argument(
+        "--process-articles",
+        dest="process",
+        action="store_true",
+        help="Run only the article processing (summarize, embed) stage.",
+    )
+    parser.add_argument(
+        "--reextract-content",
+        dest="reextract",
+        action="store_true",
+        help="Rebuild article content from the HTML cache without network access (requires HTML_CACHE_DIR).",
+    )
+    parser.add_argument(
+        "--generate-brief",
+        dest="generate",
+        action="store_true",
+        help="Run only the brief generation (cluster, analyze, synthesize) stage.",
+    )
+    parser.add_argument(
+        '--all',
+        dest='run_all',
+        action='store_true',
+        help=(
+            'Run all stages sequentially (scrape, process, generate).\n'
+            'This is the default behavior if no specific stage argument is given.'
+        ),
+    )
+    parser.add_argument(
+        '-m', '--model',
+        type=str,
+        help='Override the LLM model (e.g., "ollama:qwen3:30b").'
+    )
+    parser.add_argument(
+        '-n', '--limit',
+        type=int,
+        default=1000,
+        help='Limit the number of articles to process/rate (default: 1000).'
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help=(
+            "Run scrape, process and rate as one streaming pipeline: each new article is summarized,\n"
+            "embedded and rated as soon as it is scraped. The brief is generated afterwards."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="Bypass the LLM response and embedding caches: neither read nor store them for this run.",
+    )
+    parser.add_argument(
+        '--scrape-workers',
+        type=int,
+        default=None,
+        help=f'Number of concurrent fetch workers for scraping (default: {config.SCRAPE_MAX_WORKERS}).'
+    )
+
+    args = parser.parse_args()
+
+    if args.no_cache:
+        set_completion_cache(NullCompletionCache())
+        set_embedding_cache(NullEmbeddingCache())
+
+    # Fix ollama format if needed (ollama:model -> ollama/model)
+    if args.model and args.model.startswith("ollama:") and "/" not in args.model:
+        args.model = args.model.replace("ollama:", "ollama/", 1)
+
+    if args.all_feeds:
+        profiles = [name for name in discover_feed_profiles() if name not in config.ALL_FEEDS_EXCLUDE]
+    elif args.feeds:
+        profiles = [name.strip() for name in args.feeds.split(",") if name.strip()]
+    else:
+        profiles = [args.feed]
+
+    print("Initializing database...")
+    database.init_db()  # Once per process, shared by all profiles
+
+    if len(profiles) == 1:
+        run_profile(profiles[0], args)
+        return
+
+    max_workers = min(len(profiles), config.PROFILE_MAX_CONCURRENCY)
+    print(f"Running {len(profiles)} feed profiles ({', '.join(profiles)}), {max_workers} at a time.")
+    # Profiles share this process's HTTP session, LLM caches and rate limiters, the database
+    # engine and the LLM_GLOBAL_MAX_CONCURRENCY request slots
+    failed = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="profile") as executor:
+        futures = {executor.submit(run_profile, name, args): name for name in profiles}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"ERROR: Run for profile '{futures[future]}' failed: {e}")
+                failed.append(futures[future])
+    if failed:
+        print(f"Profiles with errors: {', '.join(sorted(failed))}")
+        sys.exit(1)  # Like a failing single-profile run, so cron notices
+
+
 if __name__ == "__main__":
     main()
@@ -1,10 +1,16 @@
 import logging
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional
 from urllib.parse import urljoin
 
 import requests
 import trafilatura
-from bs4 import BeautifulSoup
+from trafilatura.utils import load_html
+
+from . import config_base as config
+from .html_cache import get_html_cache
+from .http_client import get_http_session
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
@@ -27,127 +33,204 @@ def format_datetime(value, format="%Y-%m-%d %H:%M"):
     return value
 
 
-def fetch_article_content_and_og_image(url):
+@dataclass
+class ArticleExtraction:
+    """Everything extracted from a single download and parse of an article page."""
+
+    url: str
+    content: Optional[str] = None
+    title: Optional[str] = None
+    og_image: Optional[str] = None
+    canonical_url: Optional[str] = None
+    published_date: Optional[datetime] = None
+    language: Optional[str] = None
+    # All OpenGraph (og:*, article:*) and Twitter card (twitter:*) fields found in <head>
+    metadata: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+# Meta tags that carry the publication date, in order of preference (keys are lower-cased)
+PUBLISHED_DATE_META = (
+    "article:published_time",
+    "og:published_time",
+    "datepublished",
+    "pubdate",
+    "publishdate",
+    "date",
+    "dc.date",
+)
+
+# Prefixes of the OpenGraph and Twitter card fields kept in ArticleExtraction.metadata
+SOCIAL_META_PREFIXES = ("og:", "article:", "twitter:")
+
+
+def extract_head_metadata(tree):
     """
-    Fetches HTML, extracts main content using Trafilatura,
-    and extracts the og:image URL using BeautifulSoup.
+    Extracts page metadata from the <head> of a parsed HTML page in a single pass over
+    its children.
 
     Returns:
-        dict: {'content': str|None, 'og_image': str|None}
+        dict: {'title': str|None, 'language': str|None, 'canonical_url': str|None,
+               'meta': {lower-cased property/name/itemprop: content}} (first value wins)
     """
-    content = None
-    og_image = None
+    metadata = {"title": None, "language": None, "canonical_url": None, "meta": {}}
+
+    if tree.tag == "html":
+        metadata["language"] = (tree.get("lang") or "").strip() or None
+
+    head = tree.find("head")
+    for element in head if head is not None else ():
+        tag = element.tag
+        if tag == "title" and metadata["title"] is None:
+            metadata["title"] = "".join(element.itertext()).strip() or None
+        elif tag == "meta":
+            key = element.get("property") or element.get("name") or element.get("itemprop")
+            content = (element.get("content") or "").strip()
+            if key and content:
+                metadata["meta"].setdefault(key.strip().lower(), content)
+        elif tag == "link" and metadata["canonical_url"] is None:
+            if (element.get("rel") or "").strip().lower() == "canonical" and element.get("href"):
+                metadata["canonical_url"] = element.get("href").strip()
+
+    return metadata
+
+
+def _parse_published_date(value):
+    """Parses an ISO 8601 date from a meta tag into a naive datetime, or None."""
+    if not value:
+        return None
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:137.0) Gecko/20100101 Firefox/137.0",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-            "Cache-Control": "max-age=0",
-            "referer": "https://www.google.com",
-        }
-        response = requests.get(url, headers=headers, timeout=20)  # Increased timeout slightly
-        response.raise_for_status()
-        html_content = response.text
-
-        # 1. Extract text content
-        content = trafilatura.extract(html_content, include_comments=False, include_tables=False)
-
-        # 2. Extract og:image using BeautifulSoup
-        soup = BeautifulSoup(html_content, "lxml")  # Use lxml or html.parser
-        og_image_tag = soup.find("meta", property="og:image")
-        if og_image_tag and og_image_tag.get("content"):
-            og_image = og_image_tag["content"]
-            # Optionally resolve relative URLs - less common for og:image but possible
-            og_image = urljoin(url, og_image)
-
-        return {"content": content, "og_image": og_image}
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching {url}: {e}")
-        return {"content": None, "og_image": None}
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def extract_article_from_html(html_content, url):
+    """
+    Extracts content and metadata from an already downloaded article page.
+
+    The HTML is parsed once into an lxml tree; metadata is read from that tree's <head>
+    in one pass and the same tree is handed to Trafilatura for main content extraction.
+
+    Returns:
+        ArticleExtraction
+    """
+    result = ArticleExtraction(url=url)
+    tree = load_html(html_content)
+    if tree is None:
+        result.error = "Could not parse HTML."
+        return result
+
+    # 1. Metadata from the parsed tree's <head>
+    head = extract_head_metadata(tree)
+    meta = head["meta"]
+    result.metadata = {k: v for k, v in meta.items() if k.startswith(SOCIAL_META_PREFIXES)}
+    result.title = head["title"] or meta.get("og:title") or meta.get("twitter:title")
+
+    og_image = meta.get("og:image") or meta.get("og:image:url") or meta.get("twitter:image")
+    if og_image:
+        # Optionally resolve relative URLs - less common for og:image but possible
+        result.og_image = urljoin(url, og_image)
+
+    canonical = head["canonical_url"] or meta.get("og:url")
+    if canonical:
+        result.canonical_url = urljoin(url, canonical)
+
+    for key in PUBLISHED_DATE_META:
+        result.published_date = _parse_published_date(meta.get(key))
+        if result.published_date:
+            break
+
+    result.language = head["language"] or meta.get("og:locale")
+
+    # 2. Main text content
+    result.content = trafilatura.extract(tree, include_comments=False, include_tables=False)
+    return result
+
+
+def extract_article(url, use_cache=True):
+    """
+    Downloads an article page once, through the shared pooled HTTP session, and extracts
+    its content, title, og:image, canonical URL, publish date and language.
+
+    When the HTML cache is enabled (HTML_CACHE_DIR), a cached copy of the page is used
+    instead of the network, and freshly downloaded pages are added to it.
+
+    Returns:
+        ArticleExtraction: `error` is set when the download or extraction failed.
+    """
+    cache = get_html_cache() if use_cache else None
+    html_content = cache.get(url) if cache else None
+
+    if html_content is None:
+        try:
+            response = get_http_session().get(url, timeout=config.HTTP_TIMEOUT)
+            response.raise_for_status()
+            html_content = response.text
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching {url}: {e}")
+            return ArticleExtraction(url=url, error=f"Error fetching article: {e}")
+
+        if cache:
+            try:
+                cache.put(url, html_content)
+            except OSError as e:
+                logger.warning(f"Could not write {url} to the HTML cache: {e}")
+
+    try:
+        return extract_article_from_html(html_content, url)
     except Exception as e:
-        # Catch potential BeautifulSoup errors or others
-        print(f"Error processing content/og:image from {url}: {e}")
-        # Still return content if it was extracted before the error
-        return {"content": content, "og_image": None}
+        print(f"Error processing content/metadata from {url}: {e}")
+        return ArticleExtraction(url=url, error=f"Error processing article: {e}")
+
+
+def fetch_article_content_and_og_image(url):
+    """
+    Fetches an article and returns its main content and og:image URL.
+
+    Returns:
+        dict: {'content': str|None, 'og_image': str|None}
+    """
+    result = extract_article(url)
+    return {"content": result.content, "og_image": result.og_image}
 
 
 def scrape_single_article_details(article_url):
     """
-    Fetches and extracts details (title, raw_content, image_url) for a single article URL.
+    Fetches and extracts details (title, raw_content, image_url, ...) for a single article URL.
+
+    The page is downloaded and parsed only once.
 
     Args:
         article_url (str): The URL of the article to scrape.
 
     Returns:
-        dict: {'title': str|None, 'raw_content': str|None, 'image_url': str|None, 'error': str|None}
+        dict: {'title': str|None, 'raw_content': str|None, 'image_url': str|None,
+               'published_date': datetime|None, 'canonical_url': str|None, 'language': str|None,
+               'error': str|None}
               'error' key will be present if fetching/processing failed.
     """
     print(f"Attempting to scrape single article: {article_url}")
-    fetched_title = None
-    raw_content = None
-    final_image_url = None
-    error_message = None
+    result = extract_article(article_url)
+    error_message = result.error
 
-    try:
-        # Use the existing fetch_article_content_and_og_image helper
-        fetch_result = fetch_article_content_and_og_image(article_url)  # This already logs its own errors
-
-        raw_content = fetch_result["content"]
-        og_image_url = fetch_result["og_image"]
-
-        if not raw_content:
-            # fetch_article_content_and_og_image might have already logged, but good to have a specific error here
+    if not error_message:
+        if not result.content:
             error_message = "Failed to extract main content from the article."
             logger.warning(f"{error_message} URL: {article_url}")
-            # Even if content fails, we might still get a title or image from OG tags if fetch worked partially
-            # So, continue to try and extract title if possible.
-
-        # --- Attempt to get a title from the page if not from RSS ---
-        # We need to re-fetch or use the already fetched HTML if available from fetch_article_content_and_og_image
-        # Let's assume fetch_article_content_and_og_image doesn't return the full soup object.
-        # If it did, we could reuse it. For now, we might need a minimal re-fetch or a helper modification.
-        # Simplification: If trafilatura got content, it often implies page was fetched.
-        # We could parse the title from the raw_content's source HTML (if fetch_... stored it)
-        # or do another small HEAD request or parse from a snippet.
-        # For now, we'll use a placeholder if the feed didn't provide it.
-        # A more robust solution would be to enhance fetch_article_content_and_og_image
-        # to also return the <title> tag content.
-
-        if raw_content:  # If we got content, try to get title from HTML
-            try:
-                # Need to parse the HTML again if not already available from previous fetch
-                headers = {"User-Agent": "Mozilla/5.0 ..."}  # Your headers
-                response = requests.get(article_url, headers=headers, timeout=15)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, "lxml")
-                title_tag = soup.find("title")
-                if title_tag and title_tag.string:
-                    fetched_title = title_tag.string.strip()
-                # Fallback to OG title if HTML title is poor/missing
-                if not fetched_title:
-                    og_title_tag = soup.find("meta", property="og:title")
-                    if og_title_tag and og_title_tag.get("content"):
-                        fetched_title = og_title_tag["content"].strip()
-            except Exception as title_e:
-                logger.warning(f"Could not extract title for {article_url}: {title_e}")
-                # Continue without title if it fails
-
-        final_image_url = og_image_url  # For a single manual add, OG image is the primary target
-
-        if not raw_content and not fetched_title and not final_image_url:
+        if not result.content and not result.title and not result.og_image:
             # If absolutely nothing was fetched, it's a more significant error
             error_message = "Failed to fetch any content, title, or image from the URL."
 
-    except Exception as e:
-        error_message = f"General error scraping single article {article_url}: {e}"
-        logger.error(error_message, exc_info=True)
-
-    return {"title": fetched_title, "raw_content": raw_content, "image_url": final_image_url, "error": error_message}
+    return {
+        "title": result.title,
+        "raw_content": result.content,
+        "image_url": result.og_image,  # For a single manual add, OG image is the primary target
+        "published_date": result.published_date,
+        "canonical_url": result.canonical_url,
+        "language": result.language,
+        "error": error_message,
+    }
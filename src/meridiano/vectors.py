@@ -0,0 +1,39 @@
+"""
+Binary encoding of embedding vectors.
+
+Embeddings are stored as little-endian float32 bytes (4 bytes per dimension) in
+`Article.embedding_vector` and decoded with `np.frombuffer`, which wraps the bytes
+without copying. Rows written before the binary column existed keep their JSON text in
+`Article.embedding` until `python -m meridiano.migrate embeddings` converts them.
+"""
+
+import json
+from typing import Optional, Sequence
+
+import numpy as np
+
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+
+def pack_embedding(vector: Sequence[float]) -> bytes:
+    """Encodes an embedding as float32 bytes."""
+    return np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def unpack_embedding(data: bytes) -> np.ndarray:
+    """Decodes float32 bytes into a read-only array backed by `data`."""
+    return np.frombuffer(data, dtype=EMBEDDING_DTYPE)
+
+
+def load_embedding(vector_bytes: Optional[bytes], legacy_json: Optional[str] = None) -> Optional[np.ndarray]:
+    """Returns an article's embedding from the binary column, falling back to legacy JSON text."""
+    if vector_bytes:
+        return unpack_embedding(vector_bytes)
+    if legacy_json:
+        try:
+            values = json.loads(legacy_json)
+        except (json.JSONDecodeError, TypeError):
+            return None
+        if values:
+            return np.asarray(values, dtype=EMBEDDING_DTYPE)
+    return None
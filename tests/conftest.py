@@ -13,6 +13,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../s
 
 # Set test database URL before importing models
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+# Tests must not read or write the on-disk LLM response cache
+os.environ["LLM_CACHE_ENABLED"] = "false"
 
 
 @pytest.fixture
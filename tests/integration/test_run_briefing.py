@@ -1,18 +1,25 @@
+import asyncio
+import json
 import os
+import re
 import shutil
 import sys
 import tempfile
+import threading
 import time
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 import feedparser
+import litellm
+import numpy as np
 import pytest
+from sqlmodel import select
 
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
 
-from meridiano import database, models, run_briefing
+from meridiano import database, models, pipeline, run_briefing
 
 
 @pytest.fixture
@@ -117,7 +124,12 @@ def test_full_workflow(mock_fetch, mock_parse, setup_integration):
         # Random-ish embedding
         import random
 
-        return {"data": [{"embedding": [random.random(), random.random(), random.random()]}]}
+        return {
+            "data": [
+                {"index": i, "embedding": [random.random(), random.random(), random.random()]}
+                for i in range(len(kwargs["input"]))
+            ]
+        }
 
     mock_embedding.side_effect = embedding_side_effect
 
@@ -152,7 +164,8 @@ def test_full_workflow(mock_fetch, mock_parse, setup_integration):
             database.select(models.Article).where(models.Article.url == "http://example.com/article1")
         ).first()
         assert article.processed_content == "This is a summary."
-        assert article.embedding is not None
+        assert article.embedding_vector is not None
+        assert len(article.embedding_vector) == 3 * 4  # float32
 
     # 3. Rate
     class DummyConfigRate(DummyConfig):
@@ -227,6 +240,45 @@ def test_cli_main(mock_import, setup_integration):
             mock_rate.assert_not_called()
             mock_generate.assert_not_called()
 
+        # Test the streaming pipeline
+        mock_scrape.reset_mock()
+        with (
+            patch.object(pipeline, "run_pipeline") as mock_pipeline,
+            patch.object(sys, "argv", ["run_briefing.py", "--feed", "test", "--pipeline"]),
+        ):
+            run_briefing.main()
+
+            mock_pipeline.assert_called_once()
+            mock_scrape.assert_not_called()
+            mock_process.assert_not_called()
+            mock_generate.assert_called_once()
+
+
+def test_cli_multiple_profiles(setup_integration):
+    """Test that --feeds runs every profile and exits non-zero if any of them failed."""
+    ran = []
+
+    def run_profile(name, args):
+        ran.append(name)
+        if name == "broken":
+            raise RuntimeError("feed config missing")
+
+    with (
+        patch.object(run_briefing, "run_profile", side_effect=run_profile),
+        patch.object(sys, "argv", ["run_briefing.py", "--feeds", "a,broken,b"]),
+    ):
+        with pytest.raises(SystemExit) as exit_info:
+            run_briefing.main()
+        assert exit_info.value.code == 1
+        assert sorted(ran) == ["a", "b", "broken"]
+
+    with (
+        patch.object(run_briefing, "run_profile") as mock_run_profile,
+        patch.object(sys, "argv", ["run_briefing.py", "--feeds", "a,b"]),
+    ):
+        run_briefing.main()
+        assert mock_run_profile.call_count == 2
+
 
 def test_edge_cases(setup_integration):
     feed_profile = "test_edge"
@@ -316,3 +368,423 @@ def test_empty_feed_profile(setup_integration):
             output = captured_output.getvalue()
             assert "Skipping scrape stage: No RSS_FEEDS found" in output
             assert "Skipping generate stage: No RSS_FEEDS found" in output
+
+
+def test_scrape_conditional_get(setup_integration):
+    feed_profile = "test_conditional"
+    feed_url = "http://example.com/rss"
+
+    feed = feedparser.FeedParserDict(
+        {
+            "bozo": 0,
+            "status": 200,
+            "etag": '"v1"',
+            "modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+            "feed": feedparser.FeedParserDict({"title": "Test Feed"}),
+            "entries": [
+                feedparser.FeedParserDict({"id": "guid-1", "title": "Article 1", "link": "http://example.com/cond1"}),
+            ],
+        }
+    )
+    not_modified = feedparser.FeedParserDict({"bozo": 0, "status": 304, "entries": []})
+
+    fetch_result = {"content": "Some content", "og_image": None}
+    with (
+        patch("meridiano.run_briefing.feedparser.parse", side_effect=[feed, not_modified]) as mock_parse,
+        patch("meridiano.run_briefing.fetch_article_content_and_og_image", return_value=fetch_result) as mock_fetch,
+    ):
+        run_briefing.scrape_articles(feed_profile, [feed_url])
+        run_briefing.scrape_articles(feed_profile, [feed_url])
+
+    # First fetch has no validators, the second sends back what the server returned
+    assert mock_parse.call_args_list[0].kwargs == {"etag": None, "modified": None}
+    assert mock_parse.call_args_list[1].kwargs == {"etag": '"v1"', "modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert mock_fetch.call_count == 1
+
+    state = database.get_feed_states([feed_url])[feed_url]
+    assert state["seen_guids"] == {"guid-1"}
+
+
+def test_profiles_share_host_throttle(setup_integration):
+    """Test that profiles scraped in one process share the per-host politeness limits."""
+    throttles = []
+
+    def fetch_feed(feed_url, state, throttle):
+        throttles.append(throttle)
+        return MagicMock(status=304)
+
+    with patch.object(run_briefing, "_fetch_feed", side_effect=fetch_feed):
+        run_briefing.scrape_articles("test_a", ["http://example.com/a.rss"])
+        run_briefing.scrape_articles("test_b", ["http://example.com/b.rss"])
+
+    assert len(throttles) == 2
+    assert throttles[0] is throttles[1]
+
+
+def test_reextract_articles_from_cache(setup_integration):
+    feed_profile = "test_reextract"
+    url = "http://example.com/cached-article"
+    article_id = database.add_article(url, "Cached", datetime.now(), "Test Feed", "old content", feed_profile)
+
+    html = "<html><body><article><p>" + "Freshly extracted paragraph. " * 30 + "</p></article></body></html>"
+    with patch("meridiano.config_base.HTML_CACHE_DIR", os.path.join(setup_integration["test_dir"], "html")):
+        from meridiano.html_cache import get_html_cache
+
+        get_html_cache().put(url, html)
+        with patch("meridiano.utils.get_http_session") as mock_session:
+            run_briefing.reextract_articles(feed_profile)
+            mock_session.assert_not_called()
+
+    article = database.get_article_by_id(article_id)
+    assert "Freshly extracted paragraph." in article["raw_content"]
+
+
+def test_embeddings_are_batched(setup_integration):
+    """Test that embeddings are requested in batches and mapped back in input order."""
+    mock_embedding = setup_integration["mock_embedding"]
+
+    def embedding_side_effect(*args, **kwargs):
+        # Return the vectors out of order; "index" must be used to map them back
+        items = [{"index": i, "embedding": [float(text.split()[-1])]} for i, text in enumerate(kwargs["input"])]
+        return {"data": list(reversed(items))}
+
+    mock_embedding.side_effect = embedding_side_effect
+
+    texts = [f"summary {i}" for i in range(5)]
+    embeddings = run_briefing.get_deepseek_embeddings(texts, model="test-embedding", batch_size=2)
+
+    assert embeddings == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+    assert [len(c.kwargs["input"]) for c in mock_embedding.call_args_list] == [2, 2, 1]
+
+
+def test_failed_embedding_batch_is_split(setup_integration):
+    """Test that a failing batch is split so only the bad text loses its embedding."""
+    mock_embedding = setup_integration["mock_embedding"]
+
+    def embedding_side_effect(*args, **kwargs):
+        if "bad" in kwargs["input"]:
+            raise litellm.BadRequestError(message="input rejected", model="test-embedding", llm_provider="openai")
+        return {"data": [{"index": i, "embedding": [1.0]} for i in range(len(kwargs["input"]))]}
+
+    mock_embedding.side_effect = embedding_side_effect
+
+    embeddings = run_briefing.get_deepseek_embeddings(["a", "b", "bad", "c"], model="test-embedding", batch_size=4)
+
+    assert embeddings == [[1.0], [1.0], None, [1.0]]
+
+
+def test_rate_limited_embedding_batch_is_not_split(setup_integration):
+    """Test that a batch whose rate-limit retries ran out fails as a whole instead of being split."""
+    mock_embedding = setup_integration["mock_embedding"]
+    mock_embedding.side_effect = litellm.RateLimitError(
+        message="slow down", model="test-embedding-429", llm_provider="openai"
+    )
+
+    with patch("meridiano.config_base.LLM_MAX_RETRIES", 0):
+        embeddings = run_briefing.get_deepseek_embeddings(
+            [f"text {i}" for i in range(16)], model="test-embedding-429", batch_size=16
+        )
+
+    assert embeddings == [None] * 16
+    assert mock_embedding.call_count == 1
+
+
+def test_incremental_story_clusters(setup_integration):
+    """Test that story clusters persist across runs and only new articles are assigned."""
+    feed_profile = "test_incremental"
+
+    def add_processed(url, embedding):
+        article_id = database.add_article(url, url, datetime.now(), "Test Source", "Content", feed_profile, None)
+        database.update_article_processing(article_id, f"Summary of {url}", embedding)
+        return article_id
+
+    first = [add_processed(f"http://example.com/a{i}", [1.0, 0.01 * i, 0.0]) for i in range(3)]
+    second = [add_processed(f"http://example.com/b{i}", [0.0, 1.0, 0.01 * i]) for i in range(2)]
+
+    class IncrementalConfig:
+        INCREMENTAL_CLUSTERING = True
+
+    run_briefing.update_story_clusters(feed_profile, IncrementalConfig())
+    cluster_ids = database.get_article_cluster_ids(first + second)
+    assert len({cluster_ids[a] for a in first}) == 1
+    assert len({cluster_ids[a] for a in second}) == 1
+    assert cluster_ids[first[0]] != cluster_ids[second[0]]
+
+    # A later run only assigns the new article, which joins the existing story
+    late = add_processed("http://example.com/a-late", [1.0, 0.02, 0.01])
+    run_briefing.update_story_clusters(feed_profile, IncrementalConfig())
+
+    assert database.get_article_cluster_ids([late])[late] == cluster_ids[first[0]]
+    stories = database.get_story_clusters(feed_profile, datetime(2000, 1, 1))
+    assert sorted(story["size"] for story in stories) == [2, 4]
+
+    # Briefs read the window's ids and summaries only; vectors are read just for new articles
+    newest = add_processed("http://example.com/b-late", [0.0, 1.0, 0.03])
+    setup_integration["mock_completion"].return_value = {"choices": [{"message": {"content": "Brief"}}]}
+    with patch.object(
+        database, "get_embedding_matrix_for_briefing", wraps=database.get_embedding_matrix_for_briefing
+    ) as matrix_query:
+        run_briefing.generate_brief(feed_profile, IncrementalConfig())
+
+    assert [c.kwargs.get("unclustered_only") for c in matrix_query.call_args_list] == [True]
+    assert database.get_article_cluster_ids([newest])[newest] == cluster_ids[second[0]]
+    with database.get_session() as session:
+        brief = session.exec(select(models.Brief).where(models.Brief.feed_profile == feed_profile)).one()
+    assert sorted(json.loads(brief.contributing_article_ids)) == sorted(first + second + [late, newest])
+
+
+def test_cluster_analyses_run_concurrently_in_order(setup_integration):
+    """Test that cluster analyses overlap and are gathered in cluster order for the synthesis."""
+    feed_profile = "test_parallel_analysis"
+    for i in range(6):
+        article_id = database.add_article(
+            f"http://example.com/p{i}", f"P{i}", datetime.now(), "Test Source", "Content", feed_profile, None
+        )
+        database.update_article_processing(article_id, f"Story {i % 3}", [float(i % 3 == k) for k in range(3)])
+
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    synthesis_prompts = []
+    delays = {}
+
+    def chat_side_effect(*args, **kwargs):
+        nonlocal active, peak
+        content = kwargs["messages"][-1]["content"]
+        if "Presidential-style" in content:
+            synthesis_prompts.append(content)
+            return {"choices": [{"message": {"content": "# Brief"}}]}
+        story = re.search(r"Story (\d)", content).group(1)
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(delays[story])
+        with lock:
+            active -= 1
+        return {"choices": [{"message": {"content": f"Analysis of story {story}"}}]}
+
+    setup_integration["mock_completion"].side_effect = chat_side_effect
+
+    class ParallelConfig:
+        N_CLUSTERS = 3
+        BRIEF_ANALYSIS_CONCURRENCY = 3
+
+    # Analyses finish in opposite orders in the two runs; the synthesis prompt must not change
+    for order in ("012", "210"):
+        delays = {story: 0.05 * (rank + 1) for rank, story in enumerate(order)}
+        run_briefing.generate_brief(feed_profile, ParallelConfig())
+
+    assert peak == 3
+    assert len(synthesis_prompts) == 2
+    assert synthesis_prompts[0] == synthesis_prompts[1]
+    assert all(f"Analysis of story {story}" in synthesis_prompts[0] for story in "012")
+
+
+def test_density_clustering_analyzes_at_most_n_clusters(setup_integration):
+    """Test that hdbscan finding many small stories still makes at most N_CLUSTERS analysis calls."""
+    feed_profile = "test_many_clusters"
+    rng = np.random.default_rng(0)
+    for group in range(80):
+        for i in range(4):
+            article_id = database.add_article(
+                f"http://example.com/g{group}-{i}", f"G{group}", datetime.now(), "Test Source", "C", feed_profile, None
+            )
+            vector = np.zeros(80)
+            vector[group] = 1.0
+            vector += rng.normal(0, 0.01, 80)
+            database.update_article_processing(article_id, f"Story {group}", vector.tolist())
+
+    analysis_prompts = []
+
+    def chat_side_effect(*args, **kwargs):
+        content = kwargs["messages"][-1]["content"]
+        if "Presidential-style" not in content:
+            analysis_prompts.append(content)
+        return {"choices": [{"message": {"content": "# Analysis"}}]}
+
+    setup_integration["mock_completion"].side_effect = chat_side_effect
+
+    class DensityConfig:
+        N_CLUSTERS = 10
+        CLUSTERING_ALGORITHM = "hdbscan"
+        CLUSTERING_OPTIONS = {}
+
+    run_briefing.generate_brief(feed_profile, DensityConfig())
+
+    assert 0 < len(analysis_prompts) <= 10
+
+
+def test_near_duplicates_skip_llm_stages(setup_integration):
+    """Test that a reprint is linked to the original and not summarized, also across runs."""
+    feed_profile = "test_dedup"
+    story = " ".join(f"word{i}" for i in range(200))
+    original = database.add_article(
+        "http://example.com/original", "Original", datetime.now(), "Wire", story, feed_profile, None
+    )
+
+    mock_completion = setup_integration["mock_completion"]
+    mock_completion.return_value = {"choices": [{"message": {"content": "A summary."}}]}
+    setup_integration["mock_embedding"].side_effect = lambda *args, **kwargs: {
+        "data": [{"index": i, "embedding": [1.0, 0.0]} for i in range(len(kwargs["input"]))]
+    }
+
+    class DedupConfig:
+        DEDUP_ENABLED = True
+
+    run_briefing.process_articles(feed_profile, DedupConfig())
+    assert mock_completion.call_count == 1
+
+    # The reprint arrives in a later run; the original's stored signature is reused
+    reprint = database.add_article(
+        "http://example.com/reprint", "Reprint", datetime.now(), "Paper", "By Staff. " + story, feed_profile, None
+    )
+    run_briefing.process_articles(feed_profile, DedupConfig())
+
+    assert mock_completion.call_count == 1
+    article = database.get_article_by_id(reprint)
+    assert article["processed_content"] is None
+    with database.get_session() as session:
+        assert session.get(models.Article, reprint).duplicate_of == original
+
+
+@patch("meridiano.run_briefing.feedparser.parse")
+@patch("meridiano.run_briefing.fetch_article_content_and_og_image")
+def test_pipeline_streams_articles_through_all_stages(mock_fetch, mock_parse, setup_integration):
+    """Test that --pipeline summarizes, embeds and rates scraped and backlog articles, skipping reprints."""
+    feed_profile = "test_pipeline"
+    story = " ".join(f"word{i}" for i in range(200))
+    backlog = database.add_article(
+        "http://example.com/backlog", "Backlog", datetime.now(), "Wire", "Left over from an earlier run.", feed_profile
+    )
+
+    entries = []
+    for i in range(1, 6):
+        entry = MagicMock()
+        entry.get.side_effect = (
+            lambda i=i: lambda k, default=None: {
+                "link": f"http://example.com/article{i}",
+                "title": f"Article {i}",
+                "published_parsed": time.struct_time((2023, 1, 1, 12, 0, 0, 6, 1, 0)),
+            }.get(k, default)
+        )()
+        entries.append(entry)
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.entries = entries
+    mock_feed.feed.get.return_value = "Test Feed Source"
+    mock_parse.return_value = mock_feed
+
+    # Articles 4 and 5 are reprints of the same wire story
+    def fetch(url, *args, **kwargs):
+        number = int(url.rsplit("article", 1)[1])
+        content = story if number >= 4 else f"Unrelated story number {number} " * 20
+        return {"content": content, "og_image": None}
+
+    mock_fetch.side_effect = fetch
+
+    def chat(*args, **kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        content = "7" if "Rate the impact" in prompt else f"Summary {len(prompt)}"
+        return {"choices": [{"message": {"content": content}}]}
+
+    setup_integration["mock_completion"].side_effect = chat
+    setup_integration["mock_embedding"].side_effect = lambda *args, **kwargs: {
+        "data": [{"index": i, "embedding": [1.0, float(i)]} for i in range(len(kwargs["input"]))]
+    }
+
+    class PipelineConfig:
+        DEDUP_ENABLED = True
+        LLM_MAX_CONCURRENCY = 2
+        EMBEDDING_BATCH_SIZE = 2
+        PIPELINE_QUEUE_SIZE = 1
+        PIPELINE_EMBED_BATCH_WAIT = 0.05
+
+    counts = asyncio.run(pipeline.run_pipeline(feed_profile, ["http://example.com/rss"], PipelineConfig()))
+
+    assert counts == {"scraped": 5, "duplicates": 1, "processed": 5, "rated": 5}
+    assert database.get_article_by_id(backlog)["impact_score"] == 7
+    assert database.get_unprocessed_articles(feed_profile) == []
+    assert database.get_unrated_articles(feed_profile) == []
+    with database.get_session() as session:
+        duplicates = session.exec(select(models.Article).where(models.Article.duplicate_of.isnot(None))).all()
+        assert [a.url for a in duplicates] == ["http://example.com/article5"]
+
+
+def _pipeline_feed(mock_parse, mock_fetch, count):
+    """Serves one feed of `count` distinct articles to the mocked feedparser and fetcher."""
+    entries = []
+    for i in range(count):
+        entry = MagicMock()
+        entry.get.side_effect = (
+            lambda i=i: lambda k, default=None: {"link": f"http://example.com/article{i}", "title": f"Article {i}"}.get(
+                k, default
+            )
+        )()
+        entries.append(entry)
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.entries = entries
+    mock_feed.feed.get.return_value = "Test Feed Source"
+    mock_parse.return_value = mock_feed
+    mock_fetch.side_effect = lambda url, *args, **kwargs: {"content": f"Story {url} " * 20, "og_image": None}
+
+
+def _capture(call):
+    """Returns `call()`, or the exception it raised."""
+    try:
+        return call()
+    except Exception as e:
+        return e
+
+
+class _SmallPipelineConfig:
+    LLM_MAX_CONCURRENCY = 1
+    EMBEDDING_BATCH_SIZE = 2
+    PIPELINE_QUEUE_SIZE = 1
+    PIPELINE_EMBED_BATCH_WAIT = 0.05
+
+
+@patch("meridiano.run_briefing.feedparser.parse")
+@patch("meridiano.run_briefing.fetch_article_content_and_og_image")
+def test_pipeline_skips_articles_on_database_errors(mock_fetch, mock_parse, setup_integration):
+    """Test that failing database writes are logged and the articles left for the next run."""
+    feed_profile = "test_pipeline_db_error"
+    _pipeline_feed(mock_parse, mock_fetch, 4)
+    setup_integration["mock_completion"].return_value = {"choices": [{"message": {"content": "Summary"}}]}
+    setup_integration["mock_embedding"].side_effect = lambda *args, **kwargs: {
+        "data": [{"index": i, "embedding": [1.0]} for i in range(len(kwargs["input"]))]
+    }
+
+    with patch("meridiano.database.update_articles_processing", side_effect=RuntimeError("database is locked")):
+        counts = asyncio.run(pipeline.run_pipeline(feed_profile, ["http://example.com/rss"], _SmallPipelineConfig()))
+
+    assert counts == {"scraped": 4, "duplicates": 0, "processed": 0, "rated": 0}
+    assert len(database.get_unprocessed_articles(feed_profile)) == 4
+
+
+@patch("meridiano.run_briefing.feedparser.parse")
+@patch("meridiano.run_briefing.fetch_article_content_and_og_image")
+def test_cancelled_pipeline_releases_scraper(mock_fetch, mock_parse, setup_integration):
+    """Test that a pipeline stopped mid-run does not leave the scraper thread blocked on a full queue."""
+    feed_profile = "test_pipeline_cancelled"
+    _pipeline_feed(mock_parse, mock_fetch, 8)
+
+    def slow_summary(*args, **kwargs):
+        time.sleep(0.2)
+        return {"choices": [{"message": {"content": "Summary"}}]}
+
+    setup_integration["mock_completion"].side_effect = slow_summary
+
+    async def run_with_timeout():
+        run = pipeline.run_pipeline(feed_profile, ["http://example.com/rss"], _SmallPipelineConfig())
+        return await asyncio.wait_for(run, timeout=0.5)
+
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.update(result=_capture(lambda: asyncio.run(run_with_timeout()))))
+    thread.start()
+    thread.join(timeout=30)
+
+    assert not thread.is_alive()
+    assert isinstance(outcome["result"], TimeoutError)
+    # Everything was scraped and stored; what the pipeline didn't reach is left for the next run
+    assert len(database.get_unprocessed_articles(feed_profile)) >= 4
@@ -3,6 +3,7 @@ Tests for Flask application routes.
 """
 
 import os
+import re
 import sys
 
 import pytest
@@ -13,6 +14,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../s
 
 # Import app after setting up test database
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+from meridiano import database
 from meridiano.app import app
 from meridiano.database import add_article, create_collection, get_collection_by_id
 
@@ -29,6 +31,7 @@ def client():
             # Drop all tables to ensure a clean state before each test
             SQLModel.metadata.drop_all(get_session().bind)
             init_db()
+            database._count_cache.clear()
         yield client
 
 
@@ -66,6 +69,43 @@ class TestArticlesRoute:
         response = client.get("/articles?search=test")
         assert response.status_code == 200
 
+    def test_articles_route_search_highlights_matches(self, client, sample_article_data):
+        """Test that search results are ranked by relevance and show an escaped, highlighted snippet."""
+        data = sample_article_data.copy()
+        data["raw_content"] = "Markets <b>fell</b> as the central bank raised rates."
+        add_article(**data)
+
+        response = client.get("/articles?search=bank")
+
+        assert response.status_code == 200
+        assert b"<mark>bank</mark>" in response.data
+        assert b"&lt;b&gt;fell&lt;/b&gt;" in response.data
+        assert b"Relevance" in response.data
+
+    def test_articles_route_cursor_pagination(self, client, sample_article_data):
+        """Test that the default listing links to the next page with a keyset cursor."""
+        from datetime import timedelta
+
+        for i in range(20):
+            data = sample_article_data.copy()
+            data["url"] = f"https://example.com/article{i}"
+            data["title"] = f"Cursor Article {i:02d}"
+            data["published_date"] = sample_article_data["published_date"] + timedelta(hours=i)
+            add_article(**data)
+
+        first = client.get("/articles")
+        assert first.status_code == 200
+        assert b"Cursor Article 19" in first.data
+        assert b"Cursor Article 04" not in first.data
+        assert b"cursor=" in first.data
+
+        next_url = re.search(rb'href="([^"]*cursor=[^"]*)"\s+class="page-link next"', first.data).group(1)
+        second = client.get(next_url.decode().replace("&amp;", "&"))
+        assert second.status_code == 200
+        assert b"Cursor Article 04" in second.data
+        assert b"Cursor Article 05" not in second.data
+        assert b"Page 2 of 2" in second.data
+
     def test_articles_route_with_date_filter(self, client):
         """Test articles route with date filters."""
         response = client.get("/articles?start_date=2024-01-01&end_date=2024-01-31")
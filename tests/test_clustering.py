@@ -0,0 +1,114 @@
+"""
+Tests for the clustering backends.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from meridiano.clustering import (
+    CLUSTERING_BACKENDS,
+    NOISE_LABEL,
+    _synthetic_embeddings,
+    assign_story_clusters,
+    benchmark_clustering,
+    cluster_embeddings,
+    register_clustering_backend,
+)
+
+
+def _stories(n_stories=3, per_story=10, dimensions=16, seed=0):
+    """Tight, well separated groups of vectors and their true story labels."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_stories, dimensions)) * 10
+    truth = np.repeat(np.arange(n_stories), per_story)
+    return centers[truth] + rng.normal(scale=0.1, size=(len(truth), dimensions)), truth
+
+
+class TestClusterEmbeddings:
+    """Tests for cluster_embeddings."""
+
+    @pytest.mark.parametrize("algorithm", sorted(CLUSTERING_BACKENDS))
+    def test_backends_recover_separated_stories(self, algorithm):
+        """Test that every backend groups each story's articles together."""
+        matrix, truth = _stories()
+        labels = cluster_embeddings(matrix, 3, algorithm)
+
+        assert labels.shape == truth.shape
+        for story in range(3):
+            story_labels = set(labels[truth == story].tolist()) - {NOISE_LABEL}
+            assert len(story_labels) == 1
+
+    def test_agglomerative_distance_threshold(self):
+        """Test that a distance threshold picks the number of clusters itself."""
+        matrix, _ = _stories(n_stories=4)
+        labels = cluster_embeddings(matrix, 2, "agglomerative", distance_threshold=0.5)
+        assert len(set(labels.tolist())) == 4
+
+    def test_unknown_algorithm(self):
+        """Test that an unknown backend name is rejected with the available names."""
+        with pytest.raises(ValueError, match="kmeans"):
+            cluster_embeddings(np.zeros((4, 2)), 2, "nope")
+
+    def test_register_backend(self):
+        """Test plugging in a custom backend."""
+
+        @register_clustering_backend("test_single")
+        def _single(matrix, n_clusters):
+            return np.zeros(len(matrix), dtype=int)
+
+        try:
+            assert cluster_embeddings(np.ones((3, 2)), 2, "test_single").tolist() == [0, 0, 0]
+        finally:
+            del CLUSTERING_BACKENDS["test_single"]
+
+
+class TestAssignStoryClusters:
+    """Tests for the incremental story assignment."""
+
+    def test_joins_similar_and_opens_new_stories(self):
+        """Test that close articles join an existing story and distant ones open a new one."""
+        centroids = [np.array([1.0, 0.0, 0.0])]
+        matrix = np.array([[0.9, 0.1, 0.0], [0.0, 1.0, 0.0], [0.0, 0.95, 0.05]])
+
+        labels, new_centroids, sizes = assign_story_clusters(matrix, centroids, [4], threshold=0.8)
+
+        assert labels.tolist() == [0, 1, 1]
+        assert sizes == [5, 2]
+        assert len(new_centroids) == 2
+
+    def test_centroid_is_running_mean(self):
+        """Test the centroid update for a joined story."""
+        labels, centroids, sizes = assign_story_clusters(
+            np.array([[0.0, 1.0]]), [np.array([1.0, 0.0])], [1], threshold=0.0
+        )
+        assert labels.tolist() == [0]
+        assert np.allclose(centroids[0], [0.5, 0.5])
+        assert sizes == [2]
+
+    def test_no_existing_stories(self):
+        """Test assignment when the profile has no active story yet."""
+        labels, centroids, sizes = assign_story_clusters(np.array([[1.0, 0.0], [1.0, 0.01]]), [], [], threshold=0.9)
+        assert labels.tolist() == [0, 0]
+        assert sizes == [2]
+
+
+class TestBenchmarkClustering:
+    """Tests for benchmark_clustering."""
+
+    def test_reports_time_and_quality(self):
+        """Test the benchmark rows for a couple of backends."""
+        matrix = _synthetic_embeddings(200, 8, 4)
+        rows = benchmark_clustering(matrix, 4, algorithms=["kmeans", "minibatch_kmeans"])
+
+        assert [row["algorithm"] for row in rows] == ["kmeans", "minibatch_kmeans"]
+        for row in rows:
+            assert row["seconds"] >= 0
+            assert row["clusters"] == 4
+            assert row["noise"] == 0
+            assert 0 < row["silhouette"] <= 1
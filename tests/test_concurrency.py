@@ -0,0 +1,115 @@
+"""
+Tests for concurrency helpers.
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from meridiano.concurrency import HostThrottle, RateLimiter, get_host_throttle, get_rate_limiter
+
+
+class TestHostThrottle:
+    """Tests for the per-host politeness limiter."""
+
+    def test_limits_concurrency_per_host(self):
+        """Test that no more than max_per_host requests to one host run at once."""
+        throttle = HostThrottle(max_per_host=2, min_interval=0)
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def request(_):
+            nonlocal active, peak
+            with throttle.slot("https://example.com/article"):
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(request, range(8)))
+
+        assert peak == 2
+
+    def test_spaces_requests_to_same_host(self):
+        """Test that request starts to the same host are spaced by min_interval."""
+        throttle = HostThrottle(max_per_host=4, min_interval=0.05)
+        starts = []
+
+        def request(_):
+            with throttle.slot("https://example.com/a"):
+                starts.append(time.monotonic())
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(request, range(3)))
+
+        starts.sort()
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert all(gap >= 0.04 for gap in gaps)
+
+    def test_different_hosts_do_not_wait(self):
+        """Test that the delay only applies within a host."""
+        throttle = HostThrottle(max_per_host=1, min_interval=1.0)
+        started = time.monotonic()
+        with throttle.slot("https://one.example.com/"):
+            pass
+        with throttle.slot("https://two.example.com/"):
+            pass
+        assert time.monotonic() - started < 0.5
+
+    def test_get_host_throttle_is_shared(self):
+        """Test that all callers get the same process-wide throttle."""
+        assert get_host_throttle(2, 0.5) is get_host_throttle(8, 0.0)
+
+
+class TestRateLimiter:
+    """Tests for the token-bucket LLM rate limiter."""
+
+    def test_requests_per_minute(self):
+        """Test that requests beyond the bucket wait for a refill."""
+        limiter = RateLimiter(rpm=600)  # 10 per second
+        limiter._requests = 1
+        started = time.monotonic()
+        limiter.acquire()
+        limiter.acquire()
+        assert time.monotonic() - started >= 0.08
+
+    def test_tokens_per_minute(self):
+        """Test that token budgets are enforced and corrected by settle()."""
+        limiter = RateLimiter(tpm=6000)  # 100 tokens per second
+        limiter.acquire(5000)
+        limiter.settle(5000, 100)
+        started = time.monotonic()
+        limiter.acquire(5000)
+        assert time.monotonic() - started < 0.5
+
+    def test_rate_limited_backs_off_and_recovers(self):
+        """Test multiplicative decrease on 429 and additive recovery on success."""
+        limiter = RateLimiter(rpm=60, recovery_step=0.25)
+        assert limiter.on_rate_limited(retry_after=0.05) == 0.05
+        assert limiter.scale == 0.5
+        assert limiter.on_rate_limited() == 4.0  # second consecutive 429 without Retry-After
+        assert limiter.scale == 0.25
+
+        limiter.on_success()
+        assert limiter.scale == 0.5
+
+    def test_unlimited_does_not_wait(self):
+        """Test that a limiter without limits never blocks."""
+        limiter = RateLimiter()
+        started = time.monotonic()
+        for _ in range(100):
+            limiter.acquire(10_000)
+        assert time.monotonic() - started < 0.1
+
+    def test_get_rate_limiter_is_shared(self):
+        """Test that limiters are shared per name."""
+        assert get_rate_limiter("test/model", rpm=10) is get_rate_limiter("test/model")
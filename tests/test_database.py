@@ -5,36 +5,61 @@ Tests for database operations.
 import json
 import os
 import sys
+from datetime import datetime
+from unittest.mock import patch
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
 
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
-from sqlmodel import SQLModel
+from sqlmodel import SQLModel, select, text
 
-from meridiano.models import get_session, init_db
+from meridiano.models import engine, get_session, init_db, rebuild_sqlite_fts, search_vector_sql
 
 # Set test database before importing database module
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 
 from meridiano.database import (
+    SNIPPET_MATCH_END,
+    SNIPPET_MATCH_START,
+    _apply_search,
     add_article,
     add_article_to_collection,
+    backfill_embedding_vectors,
     create_collection,
     delete_collection,
     get_all_articles,
     get_article_by_id,
     get_article_count_for_collection,
+    get_articles_for_briefing,
     get_articles_for_collection,
+    get_articles_page,
     get_brief_by_id,
     get_collection_by_id,
     get_collections,
     get_distinct_feed_profiles,
+    get_embedding_matrix_for_briefing,
+    get_existing_article_urls,
+    get_feed_states,
+    get_total_article_count,
+    get_total_article_count_cached,
+    get_unprocessed_articles,
+    get_unrated_articles,
     remove_article_from_collection,
     save_brief,
     toggle_collection_archive_status,
+    update_article_processing,
+    update_article_rating,
+    update_article_ratings,
+    update_articles_processing,
+    update_feed_state,
 )
+from meridiano.models import Article
+from meridiano.vectors import load_embedding, unpack_embedding
 
 
 @pytest.fixture(autouse=True)
@@ -120,6 +145,302 @@ class TestGetAllArticles:
         assert len(articles) == 3
 
 
+class TestArticleSearch:
+    """Tests for full-text search through the SQLite FTS5 index."""
+
+    def _add(self, sample_article_data, slug, title, content):
+        data = sample_article_data.copy()
+        data.update(url=f"https://example.com/{slug}", title=title, raw_content=content)
+        return add_article(**data)
+
+    def test_search_matches_all_words(self, sample_article_data):
+        """Test that every word must match, in the title or the body, ignoring case and accents."""
+        both = self._add(sample_article_data, "a", "Central bank raises rates", "Inflation in São Paulo.")
+        self._add(sample_article_data, "b", "Bank holiday", "Nothing about money.")
+
+        assert [a["id"] for a in get_all_articles(search_term="BANK inflation")] == [both]
+        assert [a["id"] for a in get_all_articles(search_term="sao paulo")] == [both]
+        assert get_total_article_count(search_term="bank") == 2
+
+    def test_search_ignores_query_syntax(self, sample_article_data):
+        """Test that FTS5 operators and quotes in user input are treated as plain words."""
+        article_id = self._add(sample_article_data, "a", "C++ NOT dead", 'He said "AND" (twice).')
+
+        assert [a["id"] for a in get_all_articles(search_term='"C++" NOT')] == [article_id]
+        assert [a["id"] for a in get_all_articles(search_term="and OR")] == []
+        assert get_all_articles(search_term="***") == []
+
+    def test_search_ranks_by_relevance_with_snippet(self, sample_article_data):
+        """Test bm25 ordering, with title matches first, and highlighted snippets."""
+        body = self._add(sample_article_data, "body", "Weather report", "A long report. Elections were mentioned.")
+        title = self._add(sample_article_data, "title", "Elections called", "The vote is in May.")
+
+        results = get_all_articles(search_term="elections", sort_by="relevance")
+
+        assert [a["id"] for a in results] == [title, body]
+        snippet = results[1]["search_snippet"]
+        assert f"{SNIPPET_MATCH_START}Elections{SNIPPET_MATCH_END}" in snippet
+
+    def test_search_index_follows_updates_and_deletes(self, sample_article_data):
+        """Test that the triggers reindex edited text and drop deleted articles."""
+        article_id = self._add(sample_article_data, "a", "Draft", "Old wording.")
+        with get_session() as session:
+            article = session.get(Article, article_id)
+            article.raw_content = "New wording."
+            session.add(article)
+            session.commit()
+
+        assert get_all_articles(search_term="old") == []
+        assert [a["id"] for a in get_all_articles(search_term="new")] == [article_id]
+
+        with get_session() as session:
+            session.delete(session.get(Article, article_id))
+            session.commit()
+        assert get_total_article_count(search_term="new") == 0
+
+    def test_rebuild_search_index(self, sample_article_data):
+        """Test that a rebuild indexes rows written while the triggers were missing."""
+        with get_session() as session:
+            session.exec(text("DROP TRIGGER articles_fts_ai"))
+            session.commit()
+        article_id = self._add(sample_article_data, "a", "Unindexed", "Written without the trigger.")
+        assert get_all_articles(search_term="unindexed") == []
+
+        rebuild_sqlite_fts()
+
+        assert [a["id"] for a in get_all_articles(search_term="unindexed")] == [article_id]
+
+
+class TestPostgresSearch:
+    """Tests for the PostgreSQL search SQL (compiled only; the suite runs on SQLite)."""
+
+    def _compile(self, statement):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        return str(compiled), compiled.params
+
+    def test_search_vector_uses_profile_configs(self):
+        """Test that the generated column stems each profile in its own language, title weighted first."""
+        with (
+            patch("meridiano.config_base.TEXT_SEARCH_CONFIGS", {"brasil": "portuguese", "o'hara": "simple"}),
+            patch("meridiano.config_base.TEXT_SEARCH_CONFIG_DEFAULT", "english"),
+        ):
+            sql = search_vector_sql()
+
+        assert "WHEN 'brasil' THEN 'portuguese'::regconfig" in sql
+        assert "WHEN 'o''hara' THEN 'simple'::regconfig" in sql
+        assert "ELSE 'english'::regconfig" in sql
+        assert sql.index("coalesce(title, '')), 'A')") < sql.index("coalesce(raw_content, '')), 'B')")
+
+    def test_search_vector_rejects_invalid_config(self):
+        """Test that configuration names cannot inject SQL into the column definition."""
+        with (
+            patch("meridiano.config_base.TEXT_SEARCH_CONFIGS", {"brasil": "portuguese'; DROP TABLE articles; --"}),
+            pytest.raises(ValueError, match="Invalid text search configuration"),
+        ):
+            search_vector_sql()
+
+    def test_search_uses_stored_vector_and_ranks(self):
+        """Test that searches match and rank the stored column with the profile's configuration."""
+        with patch("meridiano.config_base.DATABASE_URL", "postgresql://localhost/meridiano"):
+            statement, ranking, snippet = _apply_search(None, select(Article.id), "bank rates", "brasil")
+            all_profiles, _, _ = _apply_search(None, select(Article.id), "bank rates")
+
+        sql, params = self._compile(statement.order_by(ranking))
+        assert "articles.search_vector @@ plainto_tsquery(" in sql
+        assert "ORDER BY ts_rank_cd(articles.search_vector, plainto_tsquery(" in sql
+        assert "to_tsvector" not in sql
+        assert sorted(params.values()) == ["bank rates", "portuguese"]
+        assert snippet is None
+
+        # Across profiles, the query ORs the term in every configured language
+        sql, params = self._compile(all_profiles)
+        assert sql.count("plainto_tsquery(") == 2
+        assert {"english", "portuguese"} <= set(params.values())
+
+
+class TestWorkQueueIndexes:
+    """Tests that the pipeline's queue queries are served by the composite and partial indexes."""
+
+    def _query_plans(self, query):
+        """Runs `query()` and returns the EXPLAIN QUERY PLAN details of each statement it issued."""
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            query()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        with engine.connect() as conn:
+            return [
+                " ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+                for statement, parameters in statements
+            ]
+
+    def test_queue_queries_use_indexes(self):
+        """Test that each queue query searches its index and reads rows in index order (no sort step)."""
+        cases = [
+            (lambda: get_unprocessed_articles("tech", 10), "ix_articles_unprocessed"),
+            (lambda: get_unrated_articles("tech", 10), "ix_articles_unrated"),
+            (lambda: get_articles_for_briefing(24, "tech"), "ix_articles_profile_processed"),
+        ]
+        for query, index_name in cases:
+            plans = self._query_plans(query)
+            assert len(plans) == 1
+            assert f"SEARCH articles USING INDEX {index_name} (feed_profile=?" in plans[0]
+            assert "TEMP B-TREE" not in plans[0]
+
+    def test_indexes_added_to_existing_table(self):
+        """Test that init_db creates the indexes on an articles table that predates them."""
+        with get_session() as session:
+            for name in ("ix_articles_unprocessed", "ix_articles_unrated", "ix_articles_profile_processed"):
+                session.exec(text(f"DROP INDEX {name}"))
+            session.commit()
+
+        init_db()
+
+        with get_session() as session:
+            indexes = session.exec(text("SELECT name FROM sqlite_master WHERE type = 'index'")).all()
+        assert {"ix_articles_unprocessed", "ix_articles_unrated", "ix_articles_profile_processed"} <= {
+            row[0] for row in indexes
+        }
+
+    def test_partial_index_ddl(self):
+        """Test that the partial indexes carry their WHERE clause on both backends."""
+        index = next(i for i in Article.__table__.indexes if i.name == "ix_articles_unprocessed")
+        for dialect in (postgresql.dialect(), engine.dialect):
+            ddl = str(CreateIndex(index).compile(dialect=dialect))
+            assert ddl.endswith("WHERE processed_at IS NULL AND duplicate_of IS NULL")
+
+
+class TestKeysetPagination:
+    """Tests for cursor-based pagination of the articles listing."""
+
+    @pytest.fixture
+    def articles(self, sample_article_data):
+        """Eleven articles with tied and missing impact scores."""
+        ids = []
+        for i, score in enumerate([5, None, 7, 5, None, 3, 7, 5, None, 9, 1]):
+            data = sample_article_data.copy()
+            data["url"] = f"https://example.com/keyset{i}"
+            data["published_date"] = datetime(2024, 1, 1 + i % 4)
+            article_id = add_article(**data)
+            if score is not None:
+                update_article_rating(article_id, score)
+            ids.append((article_id, score))
+        return ids
+
+    def _walk(self, **kwargs):
+        pages, cursor = [], None
+        while True:
+            result = get_articles_page(per_page=3, cursor=cursor, **kwargs)
+            pages.append(result)
+            cursor = result["next_cursor"]
+            if not cursor:
+                return pages
+
+    @pytest.mark.parametrize("direction", ["desc", "asc"])
+    def test_pages_cover_listing_in_order_with_nulls_last(self, articles, direction):
+        """Test that walking forward visits every article once, ordered by (score, id) with NULLs last."""
+        pages = self._walk(sort_by="impact_score", direction=direction)
+
+        reverse = direction == "desc"
+        scored = sorted(((s, i) for i, s in articles if s is not None), reverse=reverse)
+        unscored = sorted((i for i, s in articles if s is None), reverse=reverse)
+        expected = [i for _, i in scored] + unscored
+        assert [a["id"] for page in pages for a in page["articles"]] == expected
+        assert [page["page"] for page in pages] == [1, 2, 3, 4]
+        assert pages[0]["prev_cursor"] is None
+        assert all(len(page["articles"]) == 3 for page in pages[:-1])
+
+    @pytest.mark.parametrize(("sort_by", "direction"), [("impact_score", "asc"), ("published_date", "desc")])
+    def test_offset_pages_match_cursor_pages(self, articles, sort_by, direction):
+        """Test that ?page=N links and cursor links list the articles in the same order."""
+        cursor_ids = [a["id"] for page in self._walk(sort_by=sort_by, direction=direction) for a in page["articles"]]
+        offset_ids = [
+            a["id"]
+            for page in range(1, 5)
+            for a in get_all_articles(page=page, per_page=3, sort_by=sort_by, direction=direction)
+        ]
+        assert offset_ids == cursor_ids
+
+    @pytest.mark.parametrize(("sort_by", "direction"), [("impact_score", "desc"), ("published_date", "asc")])
+    def test_prev_cursor_returns_previous_page(self, articles, sort_by, direction):
+        """Test that following prev cursors from the last page retraces the same pages."""
+        pages = self._walk(sort_by=sort_by, direction=direction)
+
+        cursor = pages[-1]["prev_cursor"]
+        for expected in reversed(pages[:-1]):
+            result = get_articles_page(per_page=3, sort_by=sort_by, direction=direction, cursor=cursor)
+            assert [a["id"] for a in result["articles"]] == [a["id"] for a in expected["articles"]]
+            assert result["page"] == expected["page"]
+            assert result["next_cursor"] is not None
+            cursor = result["prev_cursor"]
+        assert cursor is None
+
+    def test_invalid_or_mismatched_cursor_starts_over(self, articles):
+        """Test that garbage tokens and tokens for another sort order give the first page."""
+        first = get_articles_page(per_page=3)
+        by_score = get_articles_page(per_page=3, sort_by="impact_score")
+
+        for cursor in ["not-a-cursor", "e30", by_score["next_cursor"]]:
+            result = get_articles_page(per_page=3, cursor=cursor)
+            assert [a["id"] for a in result["articles"]] == [a["id"] for a in first["articles"]]
+            assert result["page"] == 1
+
+    def test_cursor_pages_with_search_and_filters(self, articles, sample_article_data):
+        """Test that filters and full-text search apply to cursor pages, with snippets."""
+        data = sample_article_data.copy()
+        data.update(url="https://example.com/other", feed_profile="other", raw_content="Other profile text.")
+        add_article(**data)
+
+        pages = self._walk(feed_profile="test", search_term="test content")
+
+        assert sum(len(page["articles"]) for page in pages) == len(articles)
+        assert all(a["feed_profile"] == "test" for page in pages for a in page["articles"])
+        assert SNIPPET_MATCH_START in pages[0]["articles"][0]["search_snippet"]
+
+    def test_cached_count(self, articles, sample_article_data):
+        """Test that the cached total is reused until it expires."""
+        assert get_total_article_count_cached(feed_profile="test") == len(articles)
+        data = sample_article_data.copy()
+        data["url"] = "https://example.com/late"
+        add_article(**data)
+
+        assert get_total_article_count_cached(feed_profile="test") == len(articles)
+        with patch("meridiano.config_base.ARTICLE_COUNT_CACHE_SECONDS", 0):
+            assert get_total_article_count_cached(feed_profile="test") == len(articles) + 1
+
+
+class TestExistingArticleUrls:
+    """Tests for the bulk URL-existence check."""
+
+    def test_get_existing_article_urls(self, sample_article_data):
+        """Test that only stored URLs are returned."""
+        add_article(**sample_article_data)
+        urls = [sample_article_data["url"], "https://example.com/new", sample_article_data["url"]]
+
+        assert get_existing_article_urls(urls) == {sample_article_data["url"]}
+
+    def test_get_existing_article_urls_chunked(self, sample_article_data):
+        """Test that lookups spanning several chunks are combined."""
+        stored = []
+        for i in range(5):
+            data = sample_article_data.copy()
+            data["url"] = f"https://example.com/chunk{i}"
+            add_article(**data)
+            stored.append(data["url"])
+
+        urls = stored + [f"https://example.com/missing{i}" for i in range(5)]
+        assert get_existing_article_urls(urls, chunk_size=2) == set(stored)
+
+    def test_get_existing_article_urls_empty(self):
+        """Test that an empty input does not query."""
+        assert get_existing_article_urls([]) == set()
+
+
 class TestFeedProfiles:
     """Tests for feed profile operations."""
 
@@ -140,6 +461,31 @@ class TestFeedProfiles:
         assert "default" in distinct_profiles
 
 
+class TestFeedState:
+    """Tests for conditional GET feed state."""
+
+    def test_get_feed_states_unknown_feed(self):
+        """Test that feeds never fetched have no state."""
+        assert get_feed_states(["https://example.com/rss"]) == {}
+
+    def test_update_and_get_feed_state(self):
+        """Test storing and updating validators and seen GUIDs."""
+        feed_url = "https://example.com/rss"
+        update_feed_state(feed_url, '"abc"', "Mon, 01 Jan 2024 00:00:00 GMT", {"guid-1", "guid-2"})
+
+        state = get_feed_states([feed_url])[feed_url]
+        assert state["etag"] == '"abc"'
+        assert state["modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert state["seen_guids"] == {"guid-1", "guid-2"}
+        assert state["last_fetched_at"] is not None
+
+        update_feed_state(feed_url, '"def"', None, {"guid-3"})
+        state = get_feed_states([feed_url])[feed_url]
+        assert state["etag"] == '"def"'
+        assert state["modified"] is None
+        assert state["seen_guids"] == {"guid-3"}
+
+
 class TestSaveBrief:
     """Tests for saving briefs."""
 
@@ -354,3 +700,135 @@ class TestCollections:
         article = get_article_by_id(article_id)
         assert article is not None
         assert article["id"] == article_id
+
+
+class TestBulkArticleUpdates:
+    """Tests for the batched processing and rating writes."""
+
+    def test_bulk_updates_in_chunks(self, sample_article_data):
+        """Test that summaries and ratings are written with one executemany per chunk."""
+        ids = [add_article(**{**sample_article_data, "url": f"https://example.com/{i}"}) for i in range(5)]
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE"):
+                statements.append(len(parameters) if executemany else 1)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            update_articles_processing([(i, f"Summary {i}", [float(i), 0.5]) for i in ids], chunk_size=2)
+            update_article_ratings([(i, i % 10 + 1) for i in ids], chunk_size=3)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert statements == [2, 2, 1, 3, 2]  # Rows per statement
+        for article_id in ids:
+            article = get_article_by_id(article_id)
+            assert article["processed_content"] == f"Summary {article_id}"
+            assert unpack_embedding(article["embedding_vector"]).tolist() == [float(article_id), 0.5]
+            assert article["processed_at"] is not None
+            assert article["impact_score"] == article_id % 10 + 1
+
+    def test_bulk_updates_skip_missing_articles(self, sample_article_data):
+        """Test that ids deleted in the meantime are skipped and empty batches are no-ops."""
+        article_id = add_article(**sample_article_data)
+
+        update_articles_processing([(article_id, "Summary", None), (article_id + 100, "Gone", None)])
+        update_article_ratings([(article_id + 100, 5)])
+        update_article_ratings([])
+
+        article = get_article_by_id(article_id)
+        assert article["processed_content"] == "Summary"
+        assert article["embedding_vector"] is None
+        assert article["impact_score"] is None
+
+
+class TestEmbeddingVectors:
+    """Tests for binary embedding storage."""
+
+    def test_update_article_processing_stores_float32(self, sample_article_data):
+        """Test that embeddings are written as float32 bytes and read back without JSON."""
+        article_id = add_article(**sample_article_data)
+        update_article_processing(article_id, "Summary", [0.5, -1.25, 2.0])
+
+        article = get_article_by_id(article_id)
+        assert article["embedding"] is None
+        assert unpack_embedding(article["embedding_vector"]).tolist() == [0.5, -1.25, 2.0]
+
+    def test_backfill_converts_legacy_json(self, sample_article_data):
+        """Test the chunked migration of JSON embeddings, and briefing reads during it."""
+        ids = []
+        for i in range(3):
+            article_id = add_article(**{**sample_article_data, "url": f"https://example.com/{i}"})
+            update_article_processing(article_id, "Summary", None)
+            ids.append(article_id)
+        with get_session() as session:
+            for article_id in ids:
+                article = session.get(Article, article_id)
+                article.embedding = json.dumps([float(article_id), 0.5])
+                session.add(article)
+            session.commit()
+
+        # Legacy rows are still picked up before the backfill runs
+        briefing = get_articles_for_briefing(1, sample_article_data["feed_profile"])
+        assert len(briefing) == 3
+        assert load_embedding(briefing[0]["embedding_vector"], briefing[0]["embedding"]) is not None
+
+        assert backfill_embedding_vectors(chunk_size=2) == 3
+        assert backfill_embedding_vectors(chunk_size=2) == 0
+        article = get_article_by_id(ids[0])
+        assert article["embedding"] is None
+        assert unpack_embedding(article["embedding_vector"]).tolist() == [float(ids[0]), 0.5]
+
+
+class TestEmbeddingMatrix:
+    """Tests for get_embedding_matrix_for_briefing."""
+
+    def test_loads_ids_summaries_and_matrix(self, sample_article_data):
+        """Test that rows line up with ids and missing or older-dimension vectors are skipped."""
+        vectors = {0: [5.0, 6.0, 7.0], 1: [1.0, 2.0], 2: None, 3: [3.0, 4.0]}
+        ids = {}
+        for i, vector in vectors.items():
+            ids[i] = add_article(**{**sample_article_data, "url": f"https://example.com/{i}"})
+            update_article_processing(ids[i], f"Summary {i}", vector)
+
+        article_ids, summaries, matrix = get_embedding_matrix_for_briefing(
+            1, sample_article_data["feed_profile"], stream_chunk_size=1
+        )
+
+        assert matrix.dtype == "float32"
+        assert matrix.shape == (2, 2)
+        rows = {article_id: (summary, row.tolist()) for article_id, summary, row in zip(article_ids, summaries, matrix)}
+        assert rows == {ids[1]: ("Summary 1", [1.0, 2.0]), ids[3]: ("Summary 3", [3.0, 4.0])}
+
+    def test_rows_added_after_the_count(self, sample_article_data):
+        """Test that rows committed between the count and the stream are loaded, not written past the end."""
+        first = add_article(**{**sample_article_data, "url": "https://example.com/first"})
+        update_article_processing(first, "Summary first", [1.0, 2.0])
+        added = []
+
+        def add_articles_after_count(conn, cursor, statement, parameters, context, executemany):
+            if "count(" in statement.lower() and not added:
+                for i in range(3):
+                    added.append(add_article(**{**sample_article_data, "url": f"https://example.com/late{i}"}))
+                    update_article_processing(added[-1], f"Summary {i}", [float(i), 0.0])
+
+        event.listen(engine, "after_cursor_execute", add_articles_after_count)
+        try:
+            article_ids, summaries, matrix = get_embedding_matrix_for_briefing(
+                1, sample_article_data["feed_profile"], stream_chunk_size=1
+            )
+        finally:
+            event.remove(engine, "after_cursor_execute", add_articles_after_count)
+
+        assert sorted(article_ids) == sorted([first] + added)
+        assert matrix.shape == (4, 2)
+        rows = dict(zip(article_ids, matrix.tolist()))
+        assert rows[first] == [1.0, 2.0]
+        assert [rows[article_id] for article_id in added] == [[0.0, 0.0], [1.0, 0.0], [2.0, 0.0]]
+
+    def test_empty_profile(self):
+        """Test the result for a profile without embedded articles."""
+        article_ids, summaries, matrix = get_embedding_matrix_for_briefing(1, "nothing-here")
+        assert article_ids == summaries == []
+        assert matrix.shape == (0, 0)
@@ -0,0 +1,91 @@
+"""
+Tests for near-duplicate detection.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from meridiano.dedup import MinHasher, MinHashLSH, find_duplicates, shingles, similarity, unpack_signature
+
+STORY = (
+    "The central bank raised interest rates by a quarter point on Wednesday, citing persistent inflation "
+    "in services and a labour market that remains tight despite slowing growth. Officials signalled that "
+    "further increases were possible if price pressures failed to ease over the coming months, while "
+    "several members of the committee argued for a pause to assess the effect of earlier hikes."
+)
+REPRINT = "WASHINGTON (Wire) - " + STORY + " Reporting by Staff; editing by Desk."
+OTHER = (
+    "The football club confirmed the signing of a young striker from abroad on a five year contract, "
+    "ending weeks of speculation. The manager praised the player's pace and finishing and said he "
+    "expected him to compete for a starting place immediately after the international break."
+)
+
+
+class TestMinHasher:
+    """Tests for shingling and MinHash signatures."""
+
+    def test_shingles_ignore_case_and_punctuation(self):
+        """Test that formatting differences don't change the shingles."""
+        assert shingles("Rates rose, sharply!", size=2) == shingles("rates ROSE sharply", size=2)
+        assert shingles("") == set()
+        assert len(shingles("too short", size=5)) == 1
+
+    def test_signatures_estimate_similarity(self):
+        """Test that reprints score high and unrelated stories low."""
+        hasher = MinHasher(num_perm=128)
+        story, reprint, other = (hasher.signature(text) for text in (STORY, REPRINT, OTHER))
+
+        assert similarity(story, reprint) > 0.8
+        assert similarity(story, other) < 0.2
+
+    def test_signatures_are_stable_across_instances(self):
+        """Test that stored signatures stay comparable between runs."""
+        assert (MinHasher().signature(STORY) == MinHasher().signature(STORY)).all()
+
+    def test_empty_text_has_no_signature(self):
+        """Test text without words."""
+        assert MinHasher().signature("  ...  ") is None
+        assert unpack_signature(b"") is None
+
+
+class TestMinHashLSH:
+    """Tests for the LSH index."""
+
+    def test_query_finds_near_duplicate(self):
+        """Test that a reprint is found and an unrelated story is not."""
+        hasher = MinHasher()
+        index = MinHashLSH(threshold=0.8)
+        index.insert(1, hasher.signature(STORY))
+
+        key, score = index.query(hasher.signature(REPRINT))
+        assert key == 1
+        assert score >= 0.8
+        assert index.query(hasher.signature(OTHER)) is None
+
+    def test_bands_must_divide_num_perm(self):
+        """Test the band configuration check."""
+        with pytest.raises(ValueError, match="multiple of bands"):
+            MinHashLSH(num_perm=128, bands=10)
+
+
+class TestFindDuplicates:
+    """Tests for find_duplicates."""
+
+    def test_links_to_earliest_copy_within_batch(self):
+        """Test that later copies in a batch link to the first one."""
+        articles = [
+            {"id": 1, "raw_content": STORY},
+            {"id": 2, "raw_content": OTHER},
+            {"id": 3, "raw_content": REPRINT},
+            {"id": 4, "raw_content": ""},
+        ]
+        results = find_duplicates(articles, MinHashLSH(), MinHasher())
+
+        assert [r["duplicate_of"] for r in results] == [None, None, 1, None]
+        assert results[3]["minhash"] == b""
+        assert len(unpack_signature(results[0]["minhash"])) == 128
@@ -0,0 +1,90 @@
+"""
+Tests for the on-disk HTML cache.
+"""
+
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from meridiano.html_cache import HtmlCache
+from meridiano.utils import extract_article
+
+
+def _age(cache, url, seconds):
+    """Backdates the fetch time of a cached URL."""
+    ref = cache._url_ref(url)
+    mtime = time.time() - seconds
+    os.utime(ref, (mtime, mtime))
+
+
+class TestHtmlCache:
+    """Tests for HtmlCache."""
+
+    def test_put_and_get(self, tmp_path):
+        """Test storing and reading back a page."""
+        cache = HtmlCache(tmp_path, max_bytes=10**6, max_age_seconds=3600)
+        cache.put("https://example.com/a", "<html>á</html>")
+
+        assert cache.get("https://example.com/a") == "<html>á</html>"
+        assert cache.get("https://example.com/missing") is None
+
+    def test_identical_bodies_are_stored_once(self, tmp_path):
+        """Test that two URLs serving the same HTML share one compressed body."""
+        cache = HtmlCache(tmp_path, max_bytes=10**6, max_age_seconds=3600)
+        hash_a = cache.put("https://example.com/a", "<html>same</html>")
+        hash_b = cache.put("https://example.com/a?utm_source=rss", "<html>same</html>")
+
+        assert hash_a == hash_b
+        assert len(list((tmp_path / "objects").glob("*/*"))) == 1
+
+    def test_expired_pages_are_missing_and_evicted(self, tmp_path):
+        """Test age-based expiry."""
+        cache = HtmlCache(tmp_path, max_bytes=10**6, max_age_seconds=60)
+        cache.put("https://example.com/old", "<html>old</html>")
+        _age(cache, "https://example.com/old", 120)
+
+        assert cache.get("https://example.com/old") is None
+        stats = cache.evict()
+        assert stats["urls_removed"] == 1
+        assert stats["objects_removed"] == 1
+
+    def test_size_eviction_drops_oldest_first(self, tmp_path):
+        """Test that size-based eviction keeps the most recently fetched pages."""
+        cache = HtmlCache(tmp_path, max_bytes=10**6, max_age_seconds=0)
+        for i in range(3):
+            cache.put(f"https://example.com/{i}", os.urandom(2000).hex())
+            _age(cache, f"https://example.com/{i}", 100 - i)
+
+        body_size = max(path.stat().st_size for path in (tmp_path / "objects").glob("*/*"))
+        cache.max_bytes = body_size * 2
+        cache.evict()
+
+        assert cache.get("https://example.com/0") is None
+        assert cache.get("https://example.com/1") is not None
+        assert cache.get("https://example.com/2") is not None
+
+
+class TestExtractArticleCache:
+    """Tests for the cache lookup in extract_article."""
+
+    def test_cached_page_skips_network(self, tmp_path):
+        """Test that a cached page is extracted without an HTTP request."""
+        cache = HtmlCache(tmp_path, max_bytes=10**6, max_age_seconds=3600)
+        html = "<html><head><title>Cached</title></head><body><p>" + "Cached body text. " * 30 + "</p></body></html>"
+        session = MagicMock()
+        session.get.return_value = MagicMock(text=html)
+
+        with (
+            patch("meridiano.utils.get_html_cache", return_value=cache),
+            patch("meridiano.utils.get_http_session", return_value=session),
+        ):
+            first = extract_article("https://example.com/cached")
+            second = extract_article("https://example.com/cached")
+
+        assert session.get.call_count == 1
+        assert first.title == second.title == "Cached"
+        assert "Cached body text." in second.content
@@ -0,0 +1,35 @@
+"""
+Tests for the shared HTTP client.
+"""
+
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from meridiano.http_client import close_http_session, create_http_session, get_http_session
+
+
+class TestHttpSession:
+    """Tests for the pooled HTTP session."""
+
+    def test_create_http_session_pool_sizes(self):
+        """Test that both schemes share an adapter with the configured pool sizes."""
+        session = create_http_session(pool_connections=4, pool_maxsize=3, max_retries=1)
+
+        adapter = session.get_adapter("https://example.com/")
+        assert adapter is session.get_adapter("http://example.com/")
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total == 1
+        assert "gzip" in session.headers["Accept-Encoding"]
+
+    def test_get_http_session_is_shared(self):
+        """Test that callers share one session until it is closed."""
+        first = get_http_session()
+        assert get_http_session() is first
+
+        close_http_session()
+        assert get_http_session() is not first
+        close_http_session()
@@ -0,0 +1,173 @@
+"""
+Tests for the LLM completion cache.
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from meridiano import run_briefing
+from meridiano.llm_cache import (
+    NullCompletionCache,
+    NullEmbeddingCache,
+    SqliteCompletionCache,
+    SqliteEmbeddingCache,
+    completion_cache_key,
+    embedding_cache_key,
+    set_completion_cache,
+    set_embedding_cache,
+)
+
+
+class TestCompletionCacheKey:
+    """Tests for completion_cache_key."""
+
+    def test_key_covers_all_params(self):
+        """Test that any parameter change produces a different key, regardless of order."""
+        messages = [{"role": "user", "content": "Summarize"}]
+        key = completion_cache_key(model="m", messages=messages, temperature=0.7)
+
+        assert key == completion_cache_key(temperature=0.7, messages=messages, model="m")
+        assert key != completion_cache_key(model="m", messages=messages, temperature=0.2)
+        assert key != completion_cache_key(model="other", messages=messages, temperature=0.7)
+
+
+class TestSqliteCompletionCache:
+    """Tests for SqliteCompletionCache."""
+
+    def test_put_and_get(self, tmp_path):
+        """Test storing and reading back a completion across instances."""
+        cache = SqliteCompletionCache(tmp_path / "cache.db")
+        cache.put("k", "m", "answer")
+        cache.close()
+
+        assert SqliteCompletionCache(tmp_path / "cache.db").get("k") == "answer"
+
+    def test_expired_entries_are_missing(self, tmp_path):
+        """Test TTL expiry."""
+        cache = SqliteCompletionCache(tmp_path / "cache.db", ttl_seconds=60)
+        with patch("meridiano.llm_cache.time.time", return_value=1000.0):
+            cache.put("k", "m", "answer")
+        with patch("meridiano.llm_cache.time.time", return_value=1100.0):
+            assert cache.get("k") is None
+
+    def test_least_recently_used_are_evicted(self, tmp_path):
+        """Test that eviction keeps recently read entries."""
+        cache = SqliteCompletionCache(tmp_path / "cache.db", max_entries=10)
+        for i in range(10):
+            with patch("meridiano.llm_cache.time.time", return_value=float(i)):
+                cache.put(f"k{i}", "m", str(i))
+        with patch("meridiano.llm_cache.time.time", return_value=100.0):
+            cache.get("k0")
+            cache.put("k10", "m", "10")
+
+        assert cache.get("k0") == "0"
+        assert cache.get("k1") is None
+        assert cache.get("k10") == "10"
+
+
+class TestCallDeepseekChatCache:
+    """Tests for the cache lookup in call_deepseek_chat."""
+
+    def test_identical_prompts_call_the_api_once(self, tmp_path):
+        """Test that a repeated prompt is answered from the cache."""
+        set_completion_cache(SqliteCompletionCache(tmp_path / "cache.db"))
+        try:
+            with patch("meridiano.run_briefing.litellm.completion") as mock_completion:
+                mock_completion.return_value = {"choices": [{"message": {"content": " cached answer "}}]}
+                first = run_briefing.call_deepseek_chat("Same prompt", model="test-model")
+                second = run_briefing.call_deepseek_chat("Same prompt", model="test-model")
+                run_briefing.call_deepseek_chat("Other prompt", model="test-model")
+        finally:
+            set_completion_cache(NullCompletionCache())
+
+        assert first == second == "cached answer"
+        assert mock_completion.call_count == 2
+
+    def test_rejected_ratings_are_not_cached(self, tmp_path):
+        """Test that a rating answer without a score is requested again, and a later valid one cached."""
+        set_completion_cache(SqliteCompletionCache(tmp_path / "cache.db"))
+        article = {"id": 1, "processed_content": "Summary"}
+        try:
+            with patch("meridiano.run_briefing.litellm.completion") as mock_completion:
+                mock_completion.side_effect = [
+                    {"choices": [{"message": {"content": "I cannot rate this."}}]},
+                    {"choices": [{"message": {"content": "Impact: 7"}}]},
+                ]
+                scores = [run_briefing._rate_article(article, "Rate: {summary}", "test-model") for _ in range(3)]
+        finally:
+            set_completion_cache(NullCompletionCache())
+
+        assert scores == [None, 7, 7]
+        assert mock_completion.call_count == 2
+
+    def test_invalid_combined_analysis_is_not_cached(self, tmp_path):
+        """Test that combined answers failing validation are not replayed from the cache."""
+        set_completion_cache(SqliteCompletionCache(tmp_path / "cache.db"))
+        invalid = {"choices": [{"message": {"content": '{"summary": "S", "impact_score": 42}'}}]}
+        try:
+            with patch("meridiano.run_briefing.litellm.completion") as mock_completion:
+                mock_completion.return_value = invalid
+                for _ in range(2):
+                    answer = run_briefing.call_deepseek_chat(
+                        "Analyze", model="test-model", validate=run_briefing._is_article_analysis
+                    )
+        finally:
+            set_completion_cache(NullCompletionCache())
+
+        assert answer == invalid["choices"][0]["message"]["content"]
+        assert mock_completion.call_count == 2
+
+
+class TestSqliteEmbeddingCache:
+    """Tests for SqliteEmbeddingCache."""
+
+    def test_key_normalizes_text_and_includes_model(self):
+        """Test that whitespace differences share a key but models do not."""
+        assert embedding_cache_key("m", "Same  story\n") == embedding_cache_key("m", "Same story")
+        assert embedding_cache_key("m", "Same story") != embedding_cache_key("other", "Same story")
+
+    def test_get_many_counts_hits_and_misses(self, tmp_path):
+        """Test lookups by index and the hit/miss counters."""
+        cache = SqliteEmbeddingCache(tmp_path / "cache.db")
+        cache.put_many("m", [("a", [0.1, 0.2])])
+
+        assert cache.get_many("m", ["b", "a ", "c"]) == {1: [0.1, 0.2]}
+        assert cache.stats() == {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
+
+    def test_least_recently_used_are_evicted(self, tmp_path):
+        """Test that eviction keeps recently read embeddings."""
+        cache = SqliteEmbeddingCache(tmp_path / "cache.db", max_entries=10)
+        for i in range(10):
+            with patch("meridiano.llm_cache.time.time", return_value=float(i)):
+                cache.put_many("m", [(f"t{i}", [float(i)])])
+        with patch("meridiano.llm_cache.time.time", return_value=100.0):
+            cache.get_many("m", ["t0"])
+            cache.put_many("m", [("t10", [10.0])])
+
+        assert cache.get_many("m", ["t0", "t1", "t10"]) == {0: [0.0], 2: [10.0]}
+
+
+class TestGetEmbeddingsCache:
+    """Tests for the cache lookup in get_deepseek_embeddings."""
+
+    def test_cached_texts_are_not_sent(self, tmp_path):
+        """Test that only uncached texts reach the provider, and results are cached."""
+        cache = SqliteEmbeddingCache(tmp_path / "cache.db")
+        cache.put_many("test-embedding", [("known", [1.0])])
+        set_embedding_cache(cache)
+        try:
+            with patch("meridiano.run_briefing.litellm.embedding") as mock_embedding:
+                mock_embedding.return_value = {"data": [{"index": 0, "embedding": [2.0]}]}
+                first = run_briefing.get_deepseek_embeddings(["known", "new"], model="test-embedding")
+                second = run_briefing.get_deepseek_embeddings(["new", "known"], model="test-embedding")
+        finally:
+            set_embedding_cache(NullEmbeddingCache())
+
+        assert first == [[1.0], [2.0]]
+        assert second == [[2.0], [1.0]]
+        mock_embedding.assert_called_once()
+        assert mock_embedding.call_args.kwargs["input"] == ["new"]
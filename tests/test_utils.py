@@ -5,11 +5,37 @@ Tests for utility functions.
 import os
 import sys
 from datetime import datetime
+from unittest.mock import MagicMock, patch
 
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
-from meridiano.utils import format_datetime
+from trafilatura.utils import load_html
+
+from meridiano.utils import (
+    extract_article_from_html,
+    extract_head_metadata,
+    format_datetime,
+    scrape_single_article_details,
+)
+
+ARTICLE_HTML = """
+<html lang="pt-BR">
+<head>
+    <title> Example headline </title>
+    <meta property="og:title" content="OG headline">
+    <meta property="og:type" content="article">
+    <meta name="twitter:card" content="summary_large_image">
+    <meta property="og:image" content="/images/lead.jpg">
+    <meta property="article:published_time" content="2024-01-15T10:30:00Z">
+    <link rel="canonical" href="https://example.com/news/example-headline">
+</head>
+<body>
+    <nav>Home | World | Sports</nav>
+    <article><p>{body}</p></article>
+</body>
+</html>
+""".format(body="The council approved the new budget after a long debate. " * 20)
 
 
 class TestFormatDatetime:
@@ -48,3 +74,66 @@ class TestFormatDatetime:
         """Test formatting empty string."""
         result = format_datetime("")
         assert result == ""
+
+
+class TestExtractArticleFromHtml:
+    """Tests for single-parse article extraction."""
+
+    def test_extracts_content_and_metadata(self):
+        """Test that content and all metadata come from one parse."""
+        result = extract_article_from_html(ARTICLE_HTML, "https://example.com/news/example-headline?utm=rss")
+
+        assert "council approved the new budget" in result.content
+        assert "Home | World" not in result.content
+        assert result.title == "Example headline"
+        assert result.og_image == "https://example.com/images/lead.jpg"
+        assert result.canonical_url == "https://example.com/news/example-headline"
+        assert result.published_date == datetime(2024, 1, 15, 10, 30)
+        assert result.language == "pt-BR"
+        assert result.metadata["og:type"] == "article"
+        assert result.metadata["twitter:card"] == "summary_large_image"
+        assert result.error is None
+
+    def test_falls_back_to_og_title(self):
+        """Test that og:title is used when <title> is missing."""
+        html = ARTICLE_HTML.replace("<title> Example headline </title>", "")
+        result = extract_article_from_html(html, "https://example.com/")
+        assert result.title == "OG headline"
+
+
+class TestExtractHeadMetadata:
+    """Tests for head-only metadata extraction."""
+
+    def test_reads_only_head(self):
+        """Test that metadata comes from <head>, not tags inside <body>."""
+        html = ARTICLE_HTML.replace("<body>", "<body><meta property='og:late' content='ignored'>")
+        metadata = extract_head_metadata(load_html(html))
+
+        assert "og:late" not in metadata["meta"]
+
+        assert metadata["title"] == "Example headline"
+        assert metadata["language"] == "pt-BR"
+        assert metadata["canonical_url"] == "https://example.com/news/example-headline"
+        assert metadata["meta"]["og:title"] == "OG headline"
+        assert metadata["meta"]["twitter:card"] == "summary_large_image"
+        assert metadata["meta"]["og:image"] == "/images/lead.jpg"
+
+
+class TestScrapeSingleArticleDetails:
+    """Tests for scraping manually added articles."""
+
+    def test_downloads_page_once(self):
+        """Test that title, content and image come from a single request."""
+        response = MagicMock(text=ARTICLE_HTML)
+        session = MagicMock()
+        session.get.return_value = response
+
+        with patch("meridiano.utils.get_http_session", return_value=session):
+            details = scrape_single_article_details("https://example.com/news/example-headline")
+
+        assert session.get.call_count == 1
+        assert details["title"] == "Example headline"
+        assert "council approved" in details["raw_content"]
+        assert details["image_url"] == "https://example.com/images/lead.jpg"
+        assert details["published_date"] == datetime(2024, 1, 15, 10, 30)
+        assert details["error"] is None